@@ -0,0 +1,10 @@
+"""Benchmarks of predeq.
+
+Run all benchmarks from the repository root with::
+
+    python -m benchmarks --output results.json
+
+Each ``bench_*.py`` module registers its benchmarks with :func:`benchmarks._runner.benchmark`.
+Results are written as JSON (see :func:`benchmarks._runner.run`), so that they can be compared across
+commits and Python versions. Use ``-k`` to select benchmarks by a substring of their names.
+"""
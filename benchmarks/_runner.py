@@ -0,0 +1,137 @@
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, *, unit: str = 'call', metric: str = 'time'):
+    """Register a benchmark.
+
+    The decorated function prepares the benchmark and returns a callable without arguments, which is measured.
+    *unit* describes what a single call of it does, for the results to be read correctly (e.g. "10000 items").
+
+    With *metric* ``'time'``, the duration of a call is measured. With ``'memory'``, the memory allocated
+    by a call and still held by the object it returns is measured.
+    """
+
+    def decorator(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f'duplicate benchmark name: {name}')
+        if metric not in _MEASURE:
+            raise ValueError(f'unknown metric: {metric}')
+        BENCHMARKS[name] = (setup, unit, metric)
+        return setup
+
+    return decorator
+
+
+def load_all() -> None:
+    """Import all ``bench_*`` modules of this package, which registers their benchmarks."""
+    package_path = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package_path)]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'{__package__}.{module.name}')
+
+
+def measure_time(func, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(func)
+    # find the number of loops taking at least `min_time`, like `timeit` command line does
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10
+    times = [time / number for time in timer.repeat(repeat, number)]
+    return {
+        'loops': number,
+        'repeat': repeat,
+        'min_ns': min(times) * 1e9,
+        'median_ns': statistics.median(times) * 1e9,
+    }
+
+
+def measure_memory(func, repeat: int, min_time: float) -> dict:
+    sizes = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        try:
+            result = func()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+        finally:
+            tracemalloc.stop()
+        del result
+    return {'repeat': repeat, 'bytes': min(sizes)}
+
+
+_MEASURE = {'time': measure_time, 'memory': measure_memory}
+
+
+def run(selected=None, repeat: int = 5, min_time: float = 0.05, quick: bool = False) -> dict:
+    """Run benchmarks whose names contain any of the *selected* substrings (all by default), and return results.
+
+    With *quick*, each benchmark is called only once, which is only useful to check that it works.
+    """
+
+    results = []
+    for name, (setup, unit, metric) in sorted(BENCHMARKS.items()):
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        func = setup()
+        if quick:
+            func()
+            measurement = {}
+        else:
+            measurement = _MEASURE[metric](func, repeat, min_time)
+        results.append({'name': name, 'metric': metric, 'unit': unit, **measurement})
+        print(_format(results[-1]), file=sys.stderr)
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        # e.g. free-threaded build of CPython 3.13
+        'gil_enabled': getattr(sys, '_is_gil_enabled', lambda: True)(),
+        'platform': platform.platform(),
+        'predeq': _predeq_version(),
+        'benchmarks': results,
+    }
+
+
+def _predeq_version() -> 'str | None':
+    try:
+        from importlib.metadata import version
+        return version('predeq')
+    except Exception:
+        return None
+
+
+def _format(result: dict) -> str:
+    if 'bytes' in result:
+        return f'{result["name"]}: {result["bytes"]} bytes per {result["unit"]}'
+    if 'min_ns' not in result:
+        return f'{result["name"]}: ok'
+    return f'{result["name"]}: {result["min_ns"]:.0f} ns per {result["unit"]} (median {result["median_ns"]:.0f} ns)'
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run predeq benchmarks.')
+    parser.add_argument('-k', dest='selected', action='append', help='run benchmarks with names containing this')
+    parser.add_argument('-o', '--output', help='write JSON results to this file (default: stdout)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measurements of each benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05, help='minimal duration of a measurement, seconds')
+    parser.add_argument('--quick', action='store_true', help='call each benchmark once without measuring')
+    args = parser.parse_args(argv)
+
+    load_all()
+    results = run(args.selected, repeat=args.repeat, min_time=args.min_time, quick=args.quick)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
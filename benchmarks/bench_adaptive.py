@@ -0,0 +1,46 @@
+"""Conjunctions of checks with skewed costs and rejection rates, in a poor order given by hand: all_of() evaluates
+them as given, adaptive_all_of() learns a better order."""
+
+import json
+
+from predeq import adaptive_all_of, all_of, instanceof, predeq
+
+from ._runner import benchmark
+
+
+def has_valid_payload(obj):
+    # an expensive check, which rarely rejects objects
+    return isinstance(json.loads(obj['payload']), dict)
+
+
+MATCHERS = [
+    instanceof(dict),
+    predeq(has_valid_payload),
+    predeq(lambda obj: obj['status'] == 'ok'),
+]
+
+# most records are rejected by the cheap status check, a few by the type check
+RECORDS = [
+    {'status': 'ok' if i % 10 == 0 else 'error', 'payload': json.dumps({'id': i, 'items': list(range(20))})}
+    for i in range(1000)
+]
+RECORDS[::50] = ['not a dict'] * len(RECORDS[::50])
+
+
+@benchmark('adaptive/all_of', unit='1000 records')
+def given_order():
+    matcher = all_of(*MATCHERS)
+    return lambda: RECORDS.count(matcher)
+
+
+@benchmark('adaptive/adaptive_all_of', unit='1000 records')
+def adaptive():
+    matcher = adaptive_all_of(*MATCHERS, pure=True, seed=0)
+    RECORDS.count(matcher)  # learns the order
+    return lambda: RECORDS.count(matcher)
+
+
+@benchmark('adaptive/best-order', unit='1000 records')
+def best_order():
+    matcher = all_of(MATCHERS[0], MATCHERS[2], MATCHERS[1])
+    return lambda: RECORDS.count(matcher)
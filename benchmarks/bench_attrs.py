@@ -0,0 +1,48 @@
+"""Checking ORM-like row objects field by field: has_attrs() and fields_of(), compared to a predicate checking
+the attributes by hand."""
+
+import re
+from dataclasses import dataclass
+
+from predeq import fields_of, has_attrs, instanceof, matches_re, predeq
+
+from ._runner import benchmark
+
+ROWS = 10_000
+
+
+@dataclass
+class Row:
+    __slots__ = ('id', 'status', 'name', 'score')
+
+    id: int
+    status: str
+    name: str
+    score: float
+
+
+MATCHING = [Row(i, 'ok', f'user{i}', i / 3) for i in range(ROWS)]
+# mismatching in the last field checked
+MISMATCHING = [Row(i, 'ok', f'user{i}', i / 3) for i in range(ROWS)]
+for row in MISMATCHING:
+    row.name = None
+
+
+def _register(name, matcher):
+    benchmark(f'attrs/{name}/match', unit=f'{ROWS} rows')(lambda: lambda: MATCHING.count(matcher))
+    benchmark(f'attrs/{name}/mismatch', unit=f'{ROWS} rows')(lambda: lambda: MISMATCHING.count(matcher))
+
+
+NAME = re.compile('[a-z]')
+
+_register('lambda', predeq(
+    lambda row: isinstance(row, Row) and row.status == 'ok' and isinstance(row.id, int)
+    and isinstance(row.name, str) and NAME.match(row.name) is not None and isinstance(row.score, float)
+))
+_register('has_attrs', has_attrs(status='ok', id=instanceof(int), name=matches_re('[a-z]'), score=instanceof(float)))
+_register('fields_of', fields_of(Row, instanceof(int), 'ok', matches_re('[a-z]'), instanceof(float)))
+
+
+@benchmark('attrs/fields_of/create')
+def create_fields_of():
+    return lambda: fields_of(Row, instanceof(int), 'ok', matches_re('[a-z]'), instanceof(float))
@@ -0,0 +1,99 @@
+"""Comparisons of large nested containers with templates containing predeq objects."""
+
+from predeq import ANY, NOT_NONE, compile_template, each, instanceof, matches_re, predeq, template, unordered
+
+from ._runner import benchmark
+
+RECORDS = 10_000
+
+
+def _payload():
+    return [
+        {'id': i, 'name': f'user{i}', 'tags': ['a', i], 'score': i / 7, 'parent': {'id': i // 2, 'kind': 'group'}}
+        for i in range(RECORDS)
+    ]
+
+
+def _template():
+    return {
+        'id': instanceof(int),
+        'name': matches_re(r'user\d+$'),
+        'tags': [ANY, NOT_NONE],
+        'score': predeq(lambda score: 0 <= score),
+        'parent': {'id': instanceof(int), 'kind': 'group'},
+    }
+
+
+@benchmark('containers/list-of-dicts/match', unit=f'{RECORDS} records')
+def list_of_dicts_match():
+    payload = _payload()
+    expected = [_template()] * RECORDS
+    return lambda: payload == expected
+
+
+@benchmark('containers/list-of-dicts/mismatch-last', unit=f'{RECORDS} records')
+def list_of_dicts_mismatch_last():
+    payload = _payload()
+    payload[-1]['parent']['id'] = None
+    expected = [_template()] * RECORDS
+    return lambda: payload == expected
+
+
+@benchmark('containers/list-of-dicts/baseline', unit=f'{RECORDS} records')
+def list_of_dicts_baseline():
+    # the same comparison with plain values, to tell the overhead of predeq objects
+    payload = _payload()
+    expected = _payload()
+    return lambda: payload == expected
+
+
+@benchmark('containers/list-of-dicts/template/match', unit=f'{RECORDS} records')
+def list_of_dicts_template_match():
+    payload = _payload()
+    validate = compile_template([_template()] * RECORDS)
+    return lambda: validate(payload)
+
+
+@benchmark('containers/list-of-dicts/template/mismatch-last', unit=f'{RECORDS} records')
+def list_of_dicts_template_mismatch_last():
+    payload = _payload()
+    payload[-1]['parent']['id'] = None
+    validate = compile_template([_template()] * RECORDS)
+    return lambda: validate(payload)
+
+
+@benchmark('containers/list-of-dicts/template/compile', unit=f'{RECORDS} records')
+def list_of_dicts_template_compile():
+    expected = [_template()] * RECORDS
+    return lambda: compile_template(expected)
+
+
+@benchmark('containers/unordered/by-id', unit=f'{RECORDS} records')
+def unordered_by_id():
+    # e.g. rows returned in any order, with ids known in advance
+    payload = _payload()[::-1]
+    expected = unordered({**_template(), 'id': i} for i in range(RECORDS))
+    return lambda: payload == expected
+
+
+@benchmark('containers/unordered/by-predicates', unit=f'{RECORDS} items')
+def unordered_by_predicates():
+    # greedy assignment of items to the first matcher would fail
+    items = list(range(RECORDS))
+    expected = unordered([instanceof(int)] * (RECORDS // 2) + [predeq(lambda x: x % 2 == 0)] * (RECORDS // 2))
+    return lambda: items == expected
+
+
+@benchmark('containers/each/generator', unit=f'{RECORDS} records')
+def each_generator():
+    payload = _payload()
+    expected = each(template(_template()))
+    return lambda: (record for record in payload) == expected
+
+
+@benchmark('containers/each/generator-baseline', unit=f'{RECORDS} records')
+def each_generator_baseline():
+    # what each() replaces, holding all records in memory
+    payload = _payload()
+    expected = [_template()] * RECORDS
+    return lambda: list(record for record in payload) == expected
@@ -0,0 +1,59 @@
+"""Overhead of comparing with predeq object, compared to calling the predicate directly."""
+
+from predeq import predeq
+
+from ._runner import benchmark
+
+
+def is_even(obj):
+    return obj % 2 == 0
+
+
+@benchmark('eq/plain-call')
+def plain_call():
+    return lambda: is_even(42)
+
+
+@benchmark('eq/predeq-right')
+def predeq_right():
+    even = predeq(is_even)
+    return lambda: 42 == even
+
+
+@benchmark('eq/predeq-left')
+def predeq_left():
+    even = predeq(is_even)
+    return lambda: even == 42
+
+
+@benchmark('eq/predeq-lambda')
+def predeq_lambda():
+    even = predeq(lambda obj: obj % 2 == 0)
+    return lambda: 42 == even
+
+
+def is_prime(obj):
+    # deliberately expensive, like predicates parsing or validating their argument
+    return obj > 1 and all(obj % divisor for divisor in range(2, obj))
+
+
+# a list with few distinct values, each checked many times
+NUMBERS = [1009, 1013, 1019, 1021, 1024] * 200
+
+
+@benchmark('eq/expensive/uncached', unit='list')
+def expensive_uncached():
+    prime = predeq(is_prime)
+    return lambda: NUMBERS.count(prime)
+
+
+@benchmark('eq/expensive/cached', unit='list')
+def expensive_cached():
+    prime = predeq(is_prime, cache=100)
+    return lambda: NUMBERS.count(prime)
+
+
+@benchmark('eq/predeq-right-cached')
+def predeq_right_cached():
+    even = predeq(is_even, cache=100)
+    return lambda: 42 == even
@@ -0,0 +1,20 @@
+"""Duration of a new interpreter process importing predeq, compared to the one not importing anything."""
+
+import subprocess
+import sys
+
+from ._runner import benchmark
+
+
+def _run_python(statement):
+    return lambda: subprocess.run([sys.executable, '-c', statement], check=True)
+
+
+@benchmark('import/baseline', unit='process')
+def baseline():
+    return _run_python('pass')
+
+
+@benchmark('import/predeq', unit='process')
+def import_predeq():
+    return _run_python('import predeq')
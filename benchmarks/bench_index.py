@@ -0,0 +1,37 @@
+"""Finding matchers equal to objects with PredicateIndex, compared with a linear scan."""
+
+from predeq import PredicateIndex, exception, instanceof, matches_re
+
+from ._runner import benchmark
+
+ROUTES = 30  # of each kind
+
+CLASSES = [type(f'Class{i}', (), {}) for i in range(ROUTES)]
+EXCEPTIONS = [type(f'Error{i}', (Exception,), {}) for i in range(ROUTES)]
+
+MATCHERS = [
+    *(instanceof(cls) for cls in CLASSES),
+    *(exception(cls('failed')) for cls in EXCEPTIONS),
+    *(matches_re(rf'/api/v{i}/\w+$') for i in range(ROUTES)),
+]
+
+# matching the last matcher of each kind, and nothing
+OBJECTS = [CLASSES[-1](), EXCEPTIONS[-1]('failed'), f'/api/v{ROUTES - 1}/users', 1.5]
+
+
+def _linear_find(obj):
+    for position, matcher in enumerate(MATCHERS):
+        if matcher == obj:
+            return position
+    return None
+
+
+@benchmark('index/find', unit=f'{len(OBJECTS)} objects, {len(MATCHERS)} matchers')
+def find():
+    index = PredicateIndex((matcher, position) for position, matcher in enumerate(MATCHERS))
+    return lambda: list(map(index.find, OBJECTS))
+
+
+@benchmark('index/find-baseline', unit=f'{len(OBJECTS)} objects, {len(MATCHERS)} matchers')
+def find_baseline():
+    return lambda: list(map(_linear_find, OBJECTS))
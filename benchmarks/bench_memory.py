@@ -0,0 +1,47 @@
+"""Memory held by predeq objects, compared to the layout with instance __dict__ (used before predeq had __slots__)."""
+
+from functools import cached_property
+
+from predeq import predeq
+
+from ._runner import benchmark
+
+INSTANCES = 100_000
+
+
+class DictPredeq:
+    """predeq layout with __dict__ and cached_property for the default representation."""
+
+    def __init__(self, predicate, repr=None) -> None:
+        self.pred = predicate
+        self.repr = repr
+
+    @cached_property
+    def _default_repr(self):
+        return f'<predeq to meet {self.pred.__name__}>'
+
+    def __repr__(self) -> str:
+        return self.repr if self.repr is not None else self._default_repr
+
+
+def is_even(obj):
+    return obj % 2 == 0
+
+
+def _instances(cls, with_repr):
+    def create():
+        instances = [cls(is_even) for _ in range(INSTANCES)]
+        if with_repr:
+            for instance in instances:
+                repr(instance)
+        return instances
+    return create
+
+
+for _name, _cls in [('predeq', predeq), ('dict-baseline', DictPredeq)]:
+    benchmark(f'memory/{_name}', unit=f'{INSTANCES} instances', metric='memory')(
+        lambda cls=_cls: _instances(cls, with_repr=False)
+    )
+    benchmark(f'memory/{_name}/with-repr', unit=f'{INSTANCES} instances', metric='memory')(
+        lambda cls=_cls: _instances(cls, with_repr=True)
+    )
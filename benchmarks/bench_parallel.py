@@ -0,0 +1,40 @@
+"""Checking many objects with an expensive predicate in a process pool, compared with the current process."""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from predeq import predeq
+
+from ._runner import benchmark
+
+ITEMS = 2_000
+WORKERS = min(os.cpu_count() or 1, 4)
+
+
+def _is_proof_of_work(data: bytes) -> bool:
+    # module-level, so that it is pickled by reference
+    digest = data
+    for _ in range(200):
+        digest = hashlib.sha256(digest).digest()
+    return digest[0] != 255
+
+
+def _items():
+    return [str(i).encode() for i in range(ITEMS)]
+
+
+@benchmark('parallel/match-many/processes', unit=f'{ITEMS} items, {WORKERS} workers')
+def match_many_processes():
+    matcher = predeq(_is_proof_of_work)
+    items = _items()
+    # shut down by concurrent.futures when the interpreter exits
+    executor = ProcessPoolExecutor(max_workers=WORKERS)
+    return lambda: matcher.match_many(items, executor=executor)
+
+
+@benchmark('parallel/match-many/baseline', unit=f'{ITEMS} items')
+def match_many_baseline():
+    matcher = predeq(_is_proof_of_work)
+    items = _items()
+    return lambda: matcher.match_many(items)
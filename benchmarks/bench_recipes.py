@@ -0,0 +1,117 @@
+"""Comparisons with recipes, both matching and not, and creation of recipes."""
+
+from array import array
+
+from predeq import ANY, NOT_NONE, close_to, exception, instanceof, matches_any_re, matches_re, predeq
+from predeq.recipes import _compile_matches_re, _Exception, _InstanceOf
+
+from ._runner import benchmark
+
+
+def _register_comparison(name, matcher, match, mismatch):
+    benchmark(f'recipes/{name}/match')(lambda: lambda: match == matcher)
+    benchmark(f'recipes/{name}/mismatch')(lambda: lambda: mismatch == matcher)
+
+
+_register_comparison('ANY', ANY, 42, None)  # nothing mismatches ANY, but the timing should be the same
+_register_comparison('NOT_NONE', NOT_NONE, 42, None)
+_register_comparison('instanceof', instanceof(int), 42, 'abc')
+_register_comparison('instanceof-many', instanceof(bytes, float, str, int), 42, None)
+_register_comparison('matches_re', matches_re(r'[a-z]+\d+$'), 'abc123', 'abc123!')
+_register_comparison('matches_re-non-str', matches_re(r'[a-z]+\d+$'), 'abc123', 123)
+_register_comparison('exception', exception(KeyError('key')), KeyError('key'), KeyError('other'))
+
+
+@benchmark('recipes/instanceof/create')
+def create_instanceof():
+    return lambda: instanceof(int)
+
+
+@benchmark('recipes/matches_re/create')
+def create_matches_re():
+    return lambda: matches_re(r'[a-z]+\d+$')
+
+
+@benchmark('recipes/exception/create')
+def create_exception():
+    exc = KeyError('key')
+    return lambda: exception(exc)
+
+
+# creation without the recipe cache (e.g. with different arguments each time)
+
+@benchmark('recipes/instanceof/create-uncached')
+def create_instanceof_uncached():
+    return lambda: _InstanceOf((int,))
+
+
+@benchmark('recipes/matches_re/create-uncached')
+def create_matches_re_uncached():
+    return lambda: _compile_matches_re(r'[a-z]+\d+$')
+
+
+@benchmark('recipes/exception/create-uncached')
+def create_exception_uncached():
+    exc = KeyError('key')
+    return lambda: _Exception(exc)
+
+
+ITEMS = 100_000
+
+
+def _register_match_many(name, matcher, items):
+    benchmark(f'recipes/{name}/match_many', unit=f'{ITEMS} items')(lambda: lambda: matcher.match_many(items))
+    # what match_many replaces
+    benchmark(f'recipes/{name}/match_many-baseline', unit=f'{ITEMS} items')(
+        lambda: lambda: [item == matcher for item in items]
+    )
+
+
+_register_match_many('instanceof', instanceof(int), list(range(ITEMS)))
+_register_match_many('instanceof-mixed', instanceof(int, str), [1, 'a', 2.5, None, b'b'] * (ITEMS // 5))
+_register_match_many('matches_re', matches_re(r'[a-z]+\d+$'), [f'abc{i}' for i in range(ITEMS)])
+_register_match_many('matches_re-repeated', matches_re(r'[a-z]+\d+$'), ['ok1', 'failed', 'ok2', 'ok1'] * (ITEMS // 4))
+
+
+# validating log lines against many patterns, most lines match one of the last ones
+PATTERNS = [rf'svc{i}\[\d+\]: (?:ERROR|WARN) code=\d+$' for i in range(100)]
+LINES = [f'svc{99 - i % 20}[{i}]: ERROR code={i}' for i in range(900)] + [f'svc{i}[1]: INFO' for i in range(100)]
+
+
+@benchmark('recipes/matches_any_re/match', unit=f'{len(LINES)} lines, {len(PATTERNS)} patterns')
+def matches_any_re_match():
+    matcher = matches_any_re(*PATTERNS)
+    return lambda: [line == matcher for line in LINES]
+
+
+@benchmark('recipes/matches_any_re/match-baseline', unit=f'{len(LINES)} lines, {len(PATTERNS)} patterns')
+def matches_any_re_baseline():
+    matchers = [matches_re(pattern) for pattern in PATTERNS]
+    return lambda: [any(line == matcher for matcher in matchers) for line in LINES]
+
+
+# comparing a computed series of floats with the expected one, the last item deviates
+FLOATS = 100_000
+EXPECTED = [(i + 1) / 7 for i in range(FLOATS)]
+ACTUAL = [value + 1e-12 for value in EXPECTED]
+ACTUAL[-1] += 1.0
+
+
+@benchmark('recipes/close_to/list', unit=f'{FLOATS} floats')
+def close_to_list():
+    matcher = close_to(EXPECTED, rel=1e-6)
+    return lambda: ACTUAL == matcher
+
+
+@benchmark('recipes/close_to/array', unit=f'{FLOATS} floats')
+def close_to_array():
+    matcher = close_to(array('d', EXPECTED), rel=1e-6)
+    actual = array('d', ACTUAL)
+    return lambda: actual == matcher
+
+
+@benchmark('recipes/close_to/list-baseline', unit=f'{FLOATS} floats')
+def close_to_baseline():
+    # what close_to replaces
+    matchers = [predeq(lambda x, value=value: abs(x - value) <= 1e-6 * abs(value)) for value in EXPECTED]
+    return lambda: ACTUAL == matchers
@@ -0,0 +1,88 @@
+"""Finding sources of lambdas shown in representations of predeq objects.
+
+"cold" benchmarks start with no source files indexed (i.e. the first lambda from the file),
+"warm" ones have the file already indexed. "positions" use co_positions (Python 3.11+),
+"bytecode" find the lambda by compiling the source (used when positions are not available or not reliable).
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from predeq import _source
+
+from ._runner import benchmark
+
+_TEMP_DIR = tempfile.TemporaryDirectory(prefix='predeq-bench-')
+
+SINGLE = '''
+f = lambda obj: obj % 2 == 0
+'''
+
+# like a `pytest.mark.parametrize` list, many lambdas with a few of them on one line
+MULTI = 'LAMBDAS = [\n{}]\nf = LAMBDAS[-1]\n'.format(''.join(
+    f'    lambda x: x + {i}, lambda x: x - {i},\n' for i in range(100)
+))
+
+FREEVARS = '''
+def make(captured):
+    return [lambda obj: obj + captured, lambda obj: obj - captured]
+f = make(1)[-1]
+'''
+
+
+def _load(name, source):
+    path = Path(_TEMP_DIR.name, f'{name}.py')
+    path.write_text(source, encoding='utf-8')
+    namespace = {'__name__': name}
+    exec(compile(source, str(path), 'exec'), namespace)
+    return namespace['f']
+
+
+def _get_lambda_repr(func, cold):
+    def run():
+        if cold:
+            _source._SOURCE_INDEXES.clear()
+        # resolved once per code object otherwise
+        _source._LAMBDA_REPRS.clear()
+        return _source._get_lambda_repr(func)
+    return run
+
+
+def _find_by_positions(func):
+    code = func.__code__
+    index = _source._get_source_index(code.co_filename)
+    return lambda: index._find_by_positions(code)
+
+
+def _find_by_code(func, cold):
+    code = func.__code__
+    index = _source._get_source_index(code.co_filename)
+
+    def run():
+        if cold:
+            index.__dict__.pop('_code_map', None)  # reset cached_property
+        # the short path would skip the bytecode comparison for lambdas alone on their lines
+        _source._ENABLE_ONE_NODE_SHORT_PATH = False
+        try:
+            return index._find_by_code(code)
+        finally:
+            _source._ENABLE_ONE_NODE_SHORT_PATH = True
+    return run
+
+
+def _register(name, source):
+    def load():
+        return _load(name, source)
+
+    benchmark(f'repr/{name}/cold')(lambda: _get_lambda_repr(load(), cold=True))
+    benchmark(f'repr/{name}/warm')(lambda: _get_lambda_repr(load(), cold=False))
+    if sys.version_info >= (3, 11):
+        benchmark(f'repr/{name}/positions')(lambda: _find_by_positions(load()))
+    benchmark(f'repr/{name}/bytecode/cold')(lambda: _find_by_code(load(), cold=True))
+    benchmark(f'repr/{name}/bytecode/warm')(lambda: _find_by_code(load(), cold=False))
+
+
+_register('single', SINGLE)
+_register('multi', MULTI)
+_register('freevars', FREEVARS)
@@ -0,0 +1,70 @@
+"""Shared caches used by several threads at once, to compare with a single thread.
+
+With the GIL, N threads take about N times longer than one thread doing the same work (plus the overhead of locks),
+in free-threaded builds they should take about as long as one thread (see "gil_enabled" in the results).
+"""
+
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from predeq import _source, instanceof, predeq
+
+from ._runner import benchmark
+
+THREADS = 4
+CALLS = 1000
+LAMBDAS = 50
+
+_TEMP_DIR = tempfile.TemporaryDirectory(prefix='predeq-bench-')
+
+_CLASSES = [type(f'Class{i}', (), {}) for i in range(CALLS // 10)]
+
+
+def _create_recipes():
+    for _ in range(10):
+        for cls in _CLASSES:
+            instanceof(cls)
+
+
+def _lambdas(name):
+    """Return lambdas defined in a module of their own."""
+    source = 'LAMBDAS = [\n' + ''.join(f'    lambda x: x + {i},\n' for i in range(LAMBDAS)) + ']\n'
+    path = Path(_TEMP_DIR.name, f'{name}.py')
+    path.write_text(source, encoding='utf-8')
+    namespace = {'__name__': name}
+    exec(compile(source, str(path), 'exec'), namespace)
+    return namespace['LAMBDAS']
+
+
+def _resolve_reprs(lambdas):
+    for func in lambdas:
+        repr(predeq(func))
+
+
+def _in_threads(threads, func, args_list):
+    executor = ThreadPoolExecutor(threads)  # shut down by concurrent.futures when the interpreter exits
+
+    def run():
+        for future in [executor.submit(func, *args) for args in args_list]:
+            future.result()
+    return run
+
+
+for threads in (1, THREADS):
+    @benchmark(f'threads/recipe-cache/{threads}', unit=f'{threads} threads x {CALLS} instanceof() calls')
+    def recipe_cache(threads=threads):
+        _create_recipes()  # cached
+        return _in_threads(threads, _create_recipes, [()] * threads)
+
+    @benchmark(f'threads/repr/{threads}', unit=f'{threads} threads x {LAMBDAS} lambdas')
+    def lambda_repr(threads=threads):
+        # a file for each thread, since the lambdas of a file are resolved by one thread at a time
+        lambdas = [_lambdas(f'threads{threads}_{i}') for i in range(threads)]
+        run_threads = _in_threads(threads, _resolve_reprs, [(funcs,) for funcs in lambdas])
+
+        def run():
+            # the files stay indexed
+            _source._LAMBDA_REPRS.clear()
+            run_threads()
+        return run
@@ -0,0 +1,57 @@
+"""Validation of a JSON lines file, compared with decoding and comparing it line by line."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from predeq.validate import validate_file
+
+from ._runner import benchmark
+
+RECORDS = 100_000
+WORKERS = min(os.cpu_count() or 1, 4)
+
+_TEMP_DIR = tempfile.TemporaryDirectory(prefix='predeq-bench-')
+
+CHECKS = '''\
+from predeq import instanceof, matches_re, template
+
+RECORD = template({'id': instanceof(int), 'name': matches_re(r'[a-z]+$'), 'tags': [instanceof(str)] * 2})
+'''
+
+
+def _files():
+    checks = Path(_TEMP_DIR.name, 'validate_checks.py')
+    checks.write_text(CHECKS, encoding='utf-8')
+    records = Path(_TEMP_DIR.name, 'records.jsonl')
+    if not records.exists():
+        with records.open('w', encoding='utf-8') as file:
+            for i in range(RECORDS):
+                file.write(json.dumps({'id': i, 'name': 'abc', 'tags': ['x', 'y']}) + '\n')
+    return f'{checks}:RECORD', str(records)
+
+
+@benchmark('validate/jsonl/in-process', unit=f'{RECORDS} records')
+def validate_in_process():
+    matcher, path = _files()
+    return lambda: validate_file(path, matcher, workers=1)
+
+
+@benchmark('validate/jsonl/processes', unit=f'{RECORDS} records, {WORKERS} workers')
+def validate_in_processes():
+    matcher, path = _files()
+    return lambda: validate_file(path, matcher, workers=WORKERS, shard_size=1024 * 1024)
+
+
+@benchmark('validate/jsonl/baseline', unit=f'{RECORDS} records')
+def validate_baseline():
+    from predeq.validate import _load_matcher
+
+    matcher, path = _files()
+    matcher = _load_matcher(matcher)
+
+    def run():
+        with open(path, encoding='utf-8') as file:
+            return [number for number, line in enumerate(file, 1) if json.loads(line) != matcher]
+    return run
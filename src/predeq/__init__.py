@@ -1,2 +1,11 @@
 from ._predeq import predeq
 from .recipes import *
+from ._attrs import *
+from ._close_to import *
+from ._combinators import *
+from ._adaptive import *
+from ._each import *
+from ._index import *
+from ._template import *
+from ._unordered import *
+from ._async import *
@@ -0,0 +1,25 @@
+"""Command line interface, see ``python -m predeq --help``."""
+
+import argparse
+import sys
+
+from . import validate
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m predeq', description='Predicate-based equivalence testing.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    validate.add_arguments(commands.add_parser(
+        'validate', help='compare records of JSON lines or CSV files with a matcher',
+        description=validate.__doc__.split('\n\n')[0].rstrip(':') + '.',
+    ))
+
+    args = parser.parse_args(argv)
+    try:
+        return validate.main(args)
+    except (OSError, ValueError, ImportError, AttributeError) as error:
+        parser.exit(2, f'{parser.prog}: error: {error}\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+from _thread import allocate_lock
+from math import log2
+from time import perf_counter_ns
+
+from ._combinators import _AllOf, _AnyOf, _Not, all_of
+from ._predeq import predeq
+from .recipes import ANY, NOT_NONE, _Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe
+
+__all__ = (
+    'adaptive_all_of',
+)
+
+# comparisons sampled before the operands are reordered for the first time, and between reorderings
+_SAMPLES_PER_REORDER = 16
+
+
+def adaptive_all_of(*matchers: predeq, pure: bool = False, sample_every: int = 64, seed=None) -> predeq:
+    """Create an object which compares equal to objects equal to all of the *matchers*, like :func:`all_of`,
+    but evaluates them in the order which rejects objects the soonest on average, learnt from the objects
+    compared: cheap matchers which often reject come first, and expensive ones which rarely reject come last.
+
+        >>> from predeq import instanceof, matches_re, predeq
+        >>> def is_valid_order(obj):
+        ...     return sum(ord(char) for char in obj) % 7 != 0  # a costly check
+        >>> order_id = adaptive_all_of(predeq(is_valid_order), matches_re(r'ORD-\\d+$'), pure=True, seed=0)
+        >>> orders = [f'ORD-{i}' for i in range(100)] + ['x' * 1000] * 900  # mostly invalid ids
+        >>> sum(order == order_id for order in orders)
+        85
+        >>> order_id.order
+        (matches_re('ORD-\\\\d+$'), <predeq to meet is_valid_order>)
+
+    Objects are sampled once in about *sample_every* comparisons, then the matchers are evaluated one by one,
+    measuring how long each one takes, and whether it rejects the object. The matchers are reordered by
+    the expected cost per rejection, which is optimal for independent matchers. The costs are rounded to powers
+    of two, so that the order does not change with the noise of measurements. With *seed*, the order is
+    reproducible, since it only depends on the objects compared: the objects sampled are the same each time
+    (see :class:`random.Random`), and the costs are not measured, but estimated from the kinds of the matchers
+    (type checks such as :func:`instanceof` are the cheapest, then the other recipes, then the other matchers).
+
+    Only the matchers free of side effects are reordered, which are the recipes (such as :func:`instanceof`
+    or :func:`matches_re`) and combinations of them, unless *pure* is true, which tells that all of the
+    *matchers* are (their predicates are only called more often, or in another order). The others stay where
+    they are, and matchers are only reordered between them. If a matcher raises an exception after reordering,
+    the matchers since the last one staying in place before it are evaluated again in the given order, for the result
+    to be the same as with :func:`all_of` (e.g. if the matchers before it reject objects it does not expect).
+
+    ``order`` attribute of the object is the current order of the matchers.
+    """
+    if isinstance(sample_every, bool) or not isinstance(sample_every, int) or sample_every < 1:
+        raise ValueError(f'sample_every must be a positive number, got {sample_every!r}')
+    combined = all_of(*matchers)
+    if type(combined) is not _AllOf:
+        # there is nothing to reorder
+        return combined
+    return _AdaptiveAllOf(combined.operands, pure, sample_every, seed)
+
+
+class _AdaptiveAllOf(_AllOf):
+    __slots__ = ('pure', 'sample_every', 'seed')
+
+    def __init__(self, operands: 'list[predeq]', pure: bool, sample_every: int, seed) -> None:
+        self.pure = pure
+        self.sample_every = sample_every
+        self.seed = seed
+        self.operands = tuple(operands)  # needed by _make_predicate(), before it is assigned by super().__init__()
+        super().__init__(operands)
+
+    def __reduce__(self):
+        # what was learnt is not pickled
+        return _AdaptiveAllOf, (self.operands, self.pure, self.sample_every, self.seed)
+
+    def _make_predicate(self, predicates):
+        reorderable = [self.pure or _is_pure(operand) for operand in self.operands]
+        # measured costs depend on the machine and its load, estimated ones make the order reproducible
+        costs = None if self.seed is None else list(map(_estimated_cost, self.operands))
+        return _Reordering(predicates, reorderable, costs, self.sample_every, self.seed)
+
+    @property
+    def order(self) -> 'tuple[predeq, ...]':
+        return tuple(self.operands[index] for index in self.pred.indices)
+
+    def _get_default_repr(self) -> str:
+        return f'{adaptive_all_of.__name__}({", ".join(map(repr, self.operands))})'
+
+
+class _Reordering:
+    """Predicate of :func:`adaptive_all_of`, calling *predicates* in the learnt order."""
+
+    __slots__ = (
+        'predicates', 'reorderable', 'estimated_costs', 'indices', 'sample_every', 'reorders', '_order', '_countdown',
+        '_random', '_samples', '_since_reorder', '_costs', '_rejections', '_lock',
+    )
+
+    def __init__(self, predicates: tuple, reorderable: 'list[bool]', estimated_costs: 'list[int] | None',
+                 sample_every: int, seed) -> None:
+        from random import Random  # not imported at module level, since it takes a while
+
+        self.predicates = predicates
+        self.reorderable = reorderable
+        self.estimated_costs = estimated_costs  # used instead of the measured costs, if given
+        self.indices = tuple(range(len(predicates)))  # of predicates in the current order
+        self.sample_every = sample_every
+        self.reorders = 0
+        self._order = predicates
+        # comparisons left until the next sampled one, the first ones are all sampled to learn quickly
+        self._countdown = 0
+        self._random = Random(seed)
+        # statistics of the reorderable predicates since the last reordering (halved then, to adapt to changes)
+        self._samples = 0.0
+        self._since_reorder = 0
+        self._costs = [0.0] * len(predicates)
+        self._rejections = [0.0] * len(predicates)
+        self._lock = allocate_lock()
+
+    def __call__(self, obj) -> bool:
+        # not locked, so a sample might be skipped or taken twice when called in several threads, which is fine
+        self._countdown -= 1
+        if self._countdown < 0:
+            result = self._sample(obj)
+            if result is not None:
+                return result
+        order = self._order
+        try:
+            for predicate in order:
+                if not predicate(obj):
+                    return False
+            return True
+        except Exception:
+            position = next(position for position, called in enumerate(order) if called is predicate)
+            if order is self.predicates or not self.reorderable[position]:
+                raise
+        # the result (or exception) is the one of the given order: the operands which are not reorderable keep
+        # their positions, so those before the run of reorderable ones holding the raising one have been called
+        # already, and are not called again, since they might have side effects
+        start = position
+        while start and self.reorderable[start - 1]:
+            start -= 1
+        return self._call_in_given_order(obj, start)
+
+    def _call_in_given_order(self, obj, start: int) -> bool:
+        for predicate in self.predicates[start:]:
+            if not predicate(obj):
+                return False
+        return True
+
+    def _sample(self, obj) -> 'bool | None':
+        """Record the costs and results of reorderable predicates for *obj*, and return whether it is equal
+        to all of them, or None if the result is to be determined as usual."""
+        # each reorderable predicate is evaluated, even after one rejects the object, to learn how often they do
+        results = []
+        failed = False
+        for predicate, reorderable in zip(self.predicates, self.reorderable):
+            if not reorderable:
+                results.append(None)
+                continue
+            start = perf_counter_ns()
+            try:
+                result = not not predicate(obj)
+            except Exception:
+                result = False
+                failed = True
+            results.append((result, perf_counter_ns() - start))
+
+        with self._lock:
+            self._record(results)
+            self._countdown = self._next_countdown()
+
+        if failed or not all(self.reorderable):
+            # exceptions are raised as by all_of(), and side effects happen as many times as without sampling
+            return None
+        return all(result for result, _ in results)
+
+    def _next_countdown(self) -> int:
+        if not self.reorders:
+            return 0
+        # intervals between samples are random, so that periodic inputs do not skew the statistics
+        return int(self._random.expovariate(1 / self.sample_every))
+
+    def _record(self, results) -> None:
+        self._samples += 1
+        self._since_reorder += 1
+        for index, measured in enumerate(results):
+            if measured is not None:
+                result, cost = measured
+                self._costs[index] += cost
+                self._rejections[index] += not result
+        if self._since_reorder >= _SAMPLES_PER_REORDER:
+            self._reorder()
+
+    def _reorder(self) -> None:
+        def rank(index):
+            if self.estimated_costs is not None:
+                cost = self.estimated_costs[index]
+            else:
+                # rounded to a power of two
+                cost = self._costs[index] / self._samples
+                cost = 2.0 ** round(log2(cost)) if cost >= 1 else 1.0
+            # smoothed for predicates which never rejected
+            rejection_rate = (self._rejections[index] + 1) / (self._samples + 2)
+            return cost / rejection_rate, index
+
+        # predicates which are not reorderable split the others into runs, which are reordered separately
+        indices = []
+        run = []
+        for index, reorderable in enumerate(self.reorderable):
+            if reorderable:
+                run.append(index)
+            else:
+                indices.extend(sorted(run, key=rank))
+                indices.append(index)
+                run = []
+        indices.extend(sorted(run, key=rank))
+
+        self.indices = tuple(indices)
+        self._order = self.predicates if self.indices == tuple(range(len(indices))) else tuple(
+            self.predicates[index] for index in indices
+        )
+        self.reorders += 1
+        self._since_reorder = 0
+        self._samples /= 2
+        self._costs = [cost / 2 for cost in self._costs]
+        self._rejections = [rejections / 2 for rejections in self._rejections]
+
+
+def _estimated_cost(matcher: predeq) -> int:
+    """Return a rough cost of evaluating *matcher*, which does not depend on measurements."""
+    if matcher is ANY or matcher is NOT_NONE or isinstance(matcher, _InstanceOf):
+        return 1
+    if isinstance(matcher, (_Exception, _MatchesAnyRe, _MatchesRe)):
+        return 2
+    if isinstance(matcher, (_AllOf, _AnyOf)):
+        return sum(map(_estimated_cost, matcher.operands))
+    if isinstance(matcher, _Not):
+        return _estimated_cost(matcher.operand)
+    # predicates, which are called from Python
+    return 4
+
+
+def _is_pure(matcher: predeq) -> bool:
+    """Return whether *matcher* is known to be free of side effects."""
+    if matcher is ANY or matcher is NOT_NONE:
+        return True
+    if isinstance(matcher, (_Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe)):
+        return True
+    if isinstance(matcher, (_AllOf, _AnyOf)):
+        return all(map(_is_pure, matcher.operands))
+    if isinstance(matcher, _Not):
+        return _is_pure(matcher.operand)
+    return False
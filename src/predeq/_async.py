@@ -0,0 +1,133 @@
+from ._predeq import _InstanceDoc, predeq
+
+__all__ = (
+    'amatch_all',
+    'amatch_many',
+    'apredeq',
+)
+
+
+class apredeq(predeq):
+    """apredeq(predicate) -> apredeq object
+
+    Return an object like :class:`predeq`, but with an async *predicate* (a function returning an awaitable).
+    Since comparisons cannot await, it is checked with ``await matcher.amatch(obj)``:
+
+        >>> import asyncio
+        >>> async def exists(user_id):
+        ...     await asyncio.sleep(0)  # e.g. a request to a stub server
+        ...     return user_id in {1, 2}
+        >>> asyncio.run(apredeq(exists).amatch(1))
+        True
+
+    It can be combined with other objects, e.g. sync recipes, which are checked first then:
+
+        >>> from predeq import instanceof
+        >>> asyncio.run((instanceof(int) & apredeq(exists)).amatch('1'))
+        False
+
+    Comparing it with ``==`` (directly, or e.g. in :func:`template` or :func:`each`) raises TypeError.
+    See :func:`amatch_many` and :func:`amatch_all` for checking many objects concurrently.
+    """
+
+    __slots__ = ()
+
+    def _get_default_repr(self) -> str:
+        return f'<apredeq to meet {self._repr_predicate()}>'
+
+    def __eq__(self, other) -> bool:
+        raise TypeError(f'{self!r} has an async predicate, use `await matcher.amatch(obj)` instead of comparing it')
+
+    # the default implementations call the predicate directly
+    _match_many = _first_mismatch = __eq__
+
+    async def amatch(self, obj) -> bool:
+        return not not await self.pred(obj)
+
+
+# allow documenting instances, like predeq
+apredeq.__doc__ = _InstanceDoc(apredeq.__doc__, predeq._doc)
+
+
+async def amatch_many(matcher, iterable, limit: 'int | None' = None) -> 'list[bool]':
+    """Return a list telling for each object of *iterable* whether it is equal to *matcher*
+    (see :meth:`predeq.amatch`), checking the objects concurrently, at most *limit* at a time.
+
+        >>> import asyncio
+        >>> async def exists(user_id):
+        ...     await asyncio.sleep(0)
+        ...     return user_id in {1, 2}
+        >>> asyncio.run(amatch_many(apredeq(exists), [1, 3, 2], limit=2))
+        [True, False, True]
+
+    If checking an object raises, the checks still running are cancelled, and the exception is propagated.
+    """
+    items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+    return await _check_concurrently([(obj, matcher) for obj in items], limit, stop_on_mismatch=False)
+
+
+async def amatch_all(pairs, limit: 'int | None' = None) -> bool:
+    """Return whether each object is equal to the expected one, for *pairs* of ``(obj, expected)``,
+    checking the pairs concurrently, at most *limit* at a time. *expected* might be any object,
+    e.g. :class:`apredeq` or a recipe.
+
+        >>> import asyncio
+        >>> from predeq import instanceof
+        >>> async def exists(user_id):
+        ...     await asyncio.sleep(0)
+        ...     return user_id in {1, 2}
+        >>> response = {'user': 1, 'group': 3, 'name': 'admin'}
+        >>> asyncio.run(amatch_all([
+        ...     (response['user'], apredeq(exists)),
+        ...     (response['group'], apredeq(exists)),
+        ...     (response['name'], instanceof(str)),
+        ... ]))
+        False
+
+    Once a pair is not equal (or checking it raises), the checks still running are cancelled.
+    """
+    return await _check_concurrently(pairs, limit, stop_on_mismatch=True) is not None
+
+
+class _Mismatch(Exception):
+    """Raised by a worker of _check_concurrently() to stop the others."""
+
+
+async def _check_concurrently(pairs, limit: 'int | None', stop_on_mismatch: bool) -> 'list[bool] | None':
+    """Return whether each object of *pairs* is equal to the expected one, or None if *stop_on_mismatch*
+    and some is not."""
+    import asyncio  # heavy to import, and only needed by async code
+
+    if limit is not None and limit < 1:
+        raise ValueError(f'limit must be positive, got {limit!r}')
+    pairs = pairs if isinstance(pairs, (list, tuple)) else list(pairs)
+    results = [False] * len(pairs)
+    # the workers take the next pair when free, which limits the number of pairs checked at a time
+    positions = iter(range(len(pairs)))
+
+    async def worker():
+        for position in positions:
+            obj, expected = pairs[position]
+            results[position] = matches = await _amatch(obj, expected)
+            if stop_on_mismatch and not matches:
+                raise _Mismatch
+
+    count = len(pairs) if limit is None else min(limit, len(pairs))
+    workers = [asyncio.ensure_future(worker()) for _ in range(count)]
+    try:
+        await asyncio.gather(*workers)
+    except _Mismatch:
+        return None
+    finally:
+        for task in workers:
+            task.cancel()
+        # let the cancelled checks clean up before returning
+        await asyncio.gather(*workers, return_exceptions=True)
+    return results
+
+
+async def _amatch(obj, expected) -> bool:
+    if isinstance(expected, predeq):
+        return await expected.amatch(obj)
+    # identity implies equality in containers comparison too (e.g. for NaN)
+    return obj is expected or obj == expected
@@ -0,0 +1,212 @@
+from keyword import iskeyword
+import reprlib
+
+from ._predeq import predeq
+from ._template import _rank, _TemplateCompiler
+
+__all__ = (
+    'fields_of',
+    'has_attrs',
+)
+
+def has_attrs(**matchers) -> predeq:
+    """Create an object which compares equal to objects whose attributes are equal to the *matchers*
+    (:class:`predeq` objects, or other values, compared like in :func:`template`).
+
+        >>> from types import SimpleNamespace
+        >>> from predeq import instanceof
+        >>> ok_row = has_attrs(status='ok', id=instanceof(int))
+        >>> SimpleNamespace(id=1, status='ok', name='alice') == ok_row
+        True
+        >>> SimpleNamespace(id='1', status='ok') == ok_row
+        False
+
+    A checker is generated for the attributes once, which is about as fast as checking them by hand:
+    it checks the cheapest matchers (such as :func:`instanceof`) first, inlining the recipes like
+    :func:`compile_template`. The representation tells which attribute did not match after a mismatch
+    (unless another object has been compared since):
+
+        >>> ok_row
+        has_attrs(status='ok', id=instanceof(int)) (mismatch at attribute 'id': '1')
+        >>> object() == ok_row
+        False
+        >>> ok_row
+        has_attrs(status='ok', id=instanceof(int)) (no attribute 'status')
+
+    """
+    return _HasAttrs(None, matchers)
+
+
+def fields_of(cls: type, *matchers, **field_matchers) -> predeq:
+    """Create an object which compares equal to instances of *cls* (or its subclasses) whose fields are equal
+    to the matchers, like :func:`has_attrs`. The matchers are given for the fields by name, or in the order
+    of the fields (like the arguments of the constructor), and the other fields are not checked.
+
+        >>> from dataclasses import dataclass
+        >>> from predeq import matches_re
+        >>> @dataclass
+        ... class User:
+        ...     id: int
+        ...     name: str
+        ...     admin: bool = False
+        >>> User(1, 'alice') == fields_of(User, 1, matches_re(r'[a-z]+$'))
+        True
+        >>> User(1, 'alice', admin=True) == fields_of(User, admin=False)
+        False
+
+    The fields are those of :mod:`dataclasses`, `attrs <https://www.attrs.org>`_ classes, named tuples
+    (see :func:`collections.namedtuple`), or ``__slots__``, which are looked up once. A :exc:`TypeError`
+    is raised for fields which *cls* does not have:
+
+        >>> fields_of(User, email=None)
+        Traceback (most recent call last):
+            ...
+        TypeError: User has no field 'email'
+
+    """
+    fields = _fields(cls)
+    if len(matchers) > len(fields):
+        raise TypeError(f'{cls.__name__} has {len(fields)} fields, got {len(matchers)} matchers')
+    by_name = dict(zip(fields, matchers))
+    for name, matcher in field_matchers.items():
+        if name not in fields:
+            raise TypeError(f'{cls.__name__} has no field {name!r}')
+        if name in by_name:
+            raise TypeError(f'got multiple matchers for field {name!r}')
+        by_name[name] = matcher
+    return _HasAttrs(cls, by_name)
+
+
+class _HasAttrs(predeq):
+    __slots__ = ('cls', 'matchers', '_names', '_failure')
+
+    def __init__(self, cls: 'type | None', matchers: dict) -> None:
+        self.cls = cls  # None for has_attrs()
+        self.matchers = matchers
+        # the attributes in the order they are checked, the cheapest first
+        self._names = sorted(matchers, key=lambda name: _rank(matchers[name]))
+        checker, failure = self._compile()
+        super().__init__(checker)
+        # description of the failure of the last comparison if it failed, a closure variable of the checker
+        # assigned by it (which is faster than assigning an attribute); not the object, which might be big
+        self._failure = failure
+
+    def __reduce__(self):
+        # the generated checker cannot be pickled, it is generated again
+        return _HasAttrs, (self.cls, self.matchers)
+
+    def _compile(self):
+        compiler = _TemplateCompiler()
+        failure = compiler.constant(None)
+        # the failures are described when they happen, since the objects might change afterwards
+        short_repr = compiler.constant(_short_repr)
+        lines = [f'nonlocal {failure}']
+        if self.cls is not None:
+            lines.append(f'if not isinstance(v0, {compiler.constant(self.cls)}):')
+            lines.append(f'    {failure} = {compiler.constant(f"not an instance of {self.cls.__name__}: ")} '
+                         f'+ {short_repr}(v0)')
+            lines.append('    return False')
+
+        if self._names:
+            variables = [compiler.variable() for _ in self._names]
+            # all attributes are got before checking any, so that an AttributeError raised by a predicate
+            # is not taken for a missing attribute
+            lines += [
+                'try:',
+                *(f'    {var} = {self._getter(compiler, name)}' for var, name in zip(variables, self._names)),
+                'except AttributeError:',
+                f'    {failure} = {compiler.constant(_describe_missing)}(v0, {compiler.constant(tuple(self._names))})',
+                '    return False',
+            ]
+            for name, var in zip(self._names, variables):
+                node = self.matchers[name]
+                if isinstance(node, (dict, list, tuple)):
+                    expression = f'{compiler.function(node)}({var})'
+                else:
+                    expression = compiler.expression(node, var)  # None if it always matches
+                if expression is not None:
+                    lines.append(f'if not ({expression}):')
+                    lines.append(f'    {failure} = {compiler.constant(f"mismatch at attribute {name!r}: ")} '
+                                 f'+ {short_repr}({var})')
+                    lines.append('    return False')
+
+        name = f'_attrs{len(compiler.functions)}'
+        compiler.sources.append('\n'.join([
+            f'def {name}(v0):',
+            *(f'    {line}' for line in lines),
+            f'    {failure} = None',
+            '    return True',
+        ]))
+        checker = compiler.build(name)
+        return checker, checker.__closure__[checker.__code__.co_freevars.index(failure)]
+
+    @staticmethod
+    def _getter(compiler: _TemplateCompiler, name: str) -> str:
+        # attribute access is specialized by the interpreter for the class of the object (e.g. for slots),
+        # which makes it faster than operator.attrgetter()
+        if _is_name(name):
+            return f'v0.{name}'
+        return f'getattr(v0, {compiler.constant(name)})'
+
+    @property
+    def mismatch(self) -> 'str | None':
+        """Description of the last mismatch, if the last comparison failed."""
+        return self._failure.cell_contents
+
+    def _get_default_repr(self) -> str:
+        arguments = [f'{name}={matcher!r}' for name, matcher in self.matchers.items() if _is_name(name)]
+        if others := {name: matcher for name, matcher in self.matchers.items() if not _is_name(name)}:
+            arguments.append(f'**{others!r}')
+        if self.cls is None:
+            return f'{has_attrs.__name__}({", ".join(arguments)})'
+        return f'{fields_of.__name__}({", ".join([self.cls.__name__, *arguments])})'
+
+    def __repr__(self) -> str:
+        base = super().__repr__()
+        mismatch = self.mismatch
+        return base if mismatch is None else f'{base} ({mismatch})'
+
+
+# types whose short representations are shown as they are by reprlib.repr()
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _short_repr(value) -> str:
+    """Return ``reprlib.repr(value)``, faster for short scalars, which are the usual attribute values."""
+    if type(value) in _SCALAR_TYPES and len(short := repr(value)) <= 30:
+        return short
+    return reprlib.repr(value)
+
+
+def _describe_missing(obj, names: 'tuple[str, ...]') -> str:
+    missing = next((name for name in names if not hasattr(obj, name)), None)
+    return f'no attribute {missing!r}'
+
+
+def _is_name(name: str) -> bool:
+    """Return whether *name* can be written as an attribute or a keyword argument in the code."""
+    return name.isidentifier() and not iskeyword(name)
+
+
+def _fields(cls: type) -> 'tuple[str, ...]':
+    """Return the names of the fields of *cls*."""
+    if not isinstance(cls, type):
+        raise TypeError(f'expected a class, got {cls!r}')
+    if hasattr(cls, '__dataclass_fields__'):
+        import dataclasses  # not imported at module level, since it imports inspect, which takes a while
+
+        return tuple(field.name for field in dataclasses.fields(cls))
+    if (attributes := getattr(cls, '__attrs_attrs__', None)) is not None:
+        return tuple(attribute.name for attribute in attributes)
+    if issubclass(cls, tuple) and (fields := getattr(cls, '_fields', None)) is not None:
+        return tuple(fields)
+
+    slots = []
+    for base in reversed(cls.__mro__):
+        base_slots = vars(base).get('__slots__', ())
+        slots += [base_slots] if isinstance(base_slots, str) else base_slots
+    slots = [name for name in slots if name not in ('__dict__', '__weakref__')]
+    if not slots:
+        raise TypeError(f'cannot tell the fields of {cls.__name__}, which is not a dataclass, an attrs class, '
+                        f'a named tuple, nor has __slots__')
+    return tuple(dict.fromkeys(slots))
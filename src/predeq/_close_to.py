@@ -0,0 +1,244 @@
+import sys
+from array import array
+from math import isclose
+
+from ._predeq import predeq
+
+__all__ = (
+    'close_to',
+)
+
+# sequences shorter than this are compared in Python, unless numpy has been imported already,
+# since importing it takes longer than comparing a few hundred numbers
+_NUMPY_MIN_LEN = 1000
+
+
+def close_to(expected, rel: float = 1e-09, abs: float = 0.0) -> predeq:
+    """Create an object which compares equal to a number close to *expected*, as determined by
+    :func:`math.isclose` with *rel* and *abs* tolerances.
+
+        >>> 0.1 + 0.2 == close_to(0.3)
+        True
+        >>> 0.31 == close_to(0.3, abs=0.05)
+        True
+        >>> 0.31 == close_to(0.3, rel=0.01)
+        False
+        >>> '0.3' == close_to(0.3)
+        False
+
+    If *expected* is a sequence of numbers (e.g. a list, an :class:`array.array`, or a numpy array,
+    of any shape), the object compares equal to a sequence of the same length (or shape) whose numbers
+    are close to the expected ones, one by one. Then the representation tells the worst one after a mismatch:
+
+        >>> matcher = close_to([1.0, 2.0, 3.0], rel=1e-3)
+        >>> [1.0001, 2.01, 2.9999] == matcher
+        False
+        >>> matcher
+        close_to([1.0, 2.0, 3.0], rel=0.001) (worst deviation at index 1: 2.01 != 2.0)
+
+    Large sequences, buffers (such as :class:`array.array`) and numpy arrays are compared with numpy,
+    if it is installed, without copying them where possible.
+    """
+    return _CloseTo(expected, rel, abs)
+
+
+class _CloseTo(predeq):
+    __slots__ = ('expected', 'rel', 'abs', 'mismatch', '_values', '_array')
+
+    # makes numpy arrays defer comparisons to this object, rather than compare each of their items with it
+    __array_ufunc__ = None
+
+    def __init__(self, expected, rel: float, abs: float) -> None:
+        if rel < 0 or abs < 0:
+            raise ValueError('tolerances must be non-negative')
+        self.expected = expected
+        self.rel = rel
+        self.abs = abs
+        self.mismatch = None  # description of the last mismatch of a sequence, if the last comparison failed
+        self._array = None  # expected values as a numpy array, when first needed
+
+        if _is_sequence(expected):
+            if getattr(expected, 'ndim', 1) != 1:
+                # multidimensional arrays are only compared with numpy
+                self._values = None
+                self._array = _to_array(_numpy(), expected)
+                if self._array is None:
+                    raise TypeError(f'expected an array of real numbers, got {expected!r}')
+            else:
+                self._values = _real_numbers(expected)
+            super().__init__(self._compare_sequence)
+        else:
+            if not _is_real(expected):
+                raise TypeError(f'expected a real number or a sequence of them, got {expected!r}')
+            self._values = None
+            super().__init__(self._compare_number)
+
+    def _compare_number(self, obj) -> bool:
+        try:
+            return isclose(obj, self.expected, rel_tol=self.rel, abs_tol=self.abs)
+        except TypeError:
+            return False
+
+    def _compare_sequence(self, obj) -> bool:
+        self.mismatch = None
+        if not _is_sequence(obj):
+            return False
+        if self._values is None or not isinstance(obj, (list, tuple)) or len(obj) >= _NUMPY_MIN_LEN:
+            # arrays are compared with numpy, if it is available
+            numpy = _numpy(import_=self._values is None or len(self._values) >= _NUMPY_MIN_LEN)
+            if numpy is not None:
+                return self._compare_arrays(numpy, obj)
+
+        items = obj if isinstance(obj, (list, tuple)) else _to_list(obj)
+        if items is None:
+            return False
+        if len(items) != len(self._values):
+            return self._fail(f'length {len(items)}, expected {len(self._values)}')
+        rel, abs = self.rel, self.abs
+        try:
+            if all([isclose(item, value, rel_tol=rel, abs_tol=abs) for item, value in zip(items, self._values)]):
+                return True
+        except TypeError:
+            index = next(index for index, item in enumerate(items) if not _is_real(item))
+            return self._fail(f'item at index {index} is not a real number: {items[index]!r}')
+
+        deviations = [_deviation(item, value, rel, abs) for item, value in zip(items, self._values)]
+        index = deviations.index(max(deviations))
+        return self._fail_at(index, items[index], self._values[index])
+
+    def _compare_arrays(self, numpy, obj) -> bool:
+        if self._array is None:
+            self._array = numpy.array(self._values, dtype=float)
+        expected = self._array
+        actual = _to_array(numpy, obj)
+        if actual is None:
+            return self._fail('not an array of real numbers')
+        if actual.shape != expected.shape:
+            if actual.ndim == expected.ndim == 1:
+                return self._fail(f'length {len(actual)}, expected {len(expected)}')
+            return self._fail(f'shape {actual.shape}, expected {expected.shape}')
+
+        # math.isclose() semantics, rather than numpy.isclose(), which is not symmetric
+        with numpy.errstate(invalid='ignore', over='ignore', divide='ignore'):
+            difference = numpy.abs(actual - expected)
+            tolerance = numpy.maximum(self.rel * numpy.maximum(numpy.abs(actual), numpy.abs(expected)), self.abs)
+            close = (actual == expected) | (numpy.isfinite(difference) & (difference <= tolerance))
+            if close.all():
+                return True
+            deviation = numpy.where(close, 0, difference / tolerance)
+        deviation[numpy.isnan(deviation)] = numpy.inf
+        index = int(numpy.argmax(deviation))
+        if expected.ndim > 1:
+            index = tuple(map(int, numpy.unravel_index(index, expected.shape)))
+        return self._fail_at(index, actual[index].item(), expected[index].item())
+
+    def _fail_at(self, index, actual, expected) -> bool:
+        return self._fail(f'worst deviation at index {index}: {actual!r} != {expected!r}')
+
+    def _fail(self, description: str) -> bool:
+        self.mismatch = description
+        return False
+
+    def _match_many(self, iterable) -> 'list[bool]':
+        if self._values is not None or self._array is not None:
+            return super()._match_many(iterable)
+
+        # numbers compared with a single expected number, e.g. a column of a table
+        items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+        rel, abs, expected = self.rel, self.abs, self.expected
+        try:
+            return [isclose(item, expected, rel_tol=rel, abs_tol=abs) for item in items]
+        except TypeError:
+            return super()._match_many(items)
+
+    def _get_default_repr(self) -> str:
+        import reprlib
+
+        # expected sequences might be long, only their first numbers are shown
+        arguments = [reprlib.repr(self.expected)]
+        if self.rel != 1e-09:
+            arguments.append(f'rel={self.rel!r}')
+        if self.abs:
+            arguments.append(f'abs={self.abs!r}')
+        return f'{close_to.__name__}({", ".join(arguments)})'
+
+    def __repr__(self) -> str:
+        base = super().__repr__()
+        return base if self.mismatch is None else f'{base} ({self.mismatch})'
+
+
+def _is_real(obj) -> bool:
+    try:
+        isclose(obj, 0)
+    except TypeError:
+        return False
+    return True
+
+
+def _is_sequence(obj) -> bool:
+    """Return True if *obj* is a sequence of numbers, rather than a number (or a string)."""
+    if isinstance(obj, (list, tuple, array, memoryview)):
+        return True
+    if isinstance(obj, (str, bytes, bytearray)):
+        return False
+    # numpy arrays (and other libraries following its interface), but not numpy scalars, which have ndim 0
+    return getattr(obj, 'ndim', 0) > 0 and hasattr(obj, '__len__')
+
+
+def _real_numbers(sequence) -> 'list':
+    values = _to_list(sequence)
+    if values is None or not all(map(_is_real, values)):
+        raise TypeError(f'expected a sequence of real numbers, got {sequence!r}')
+    return values
+
+
+def _to_list(sequence) -> 'list | None':
+    if isinstance(sequence, memoryview):
+        return sequence.tolist() if sequence.ndim == 1 else None
+    tolist = getattr(sequence, 'tolist', None)  # e.g. array.array, numpy arrays
+    items = tolist() if tolist is not None else list(sequence)
+    return items if isinstance(items, list) else None
+
+
+def _numpy(import_: bool = True):
+    """Return numpy module, if it has been imported already, or if *import_* is true and it is installed."""
+    if (numpy := sys.modules.get('numpy')) is not None or not import_:
+        return numpy
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _to_array(numpy, sequence):
+    """Return *sequence* as a numpy array of real numbers (not copied if possible), or None if it is not one."""
+    if numpy is None:
+        return None
+    try:
+        # buffers (array.array, memoryview) and numpy arrays are not copied
+        values = numpy.asarray(sequence)
+    except (TypeError, ValueError):
+        return None
+    if values.dtype.kind == 'O':
+        if not all(map(_is_real, values.flat)):
+            return None
+        values = values.astype(float)
+    elif values.dtype.kind not in 'biuf':
+        # e.g. strings, complex numbers, dates, which math.isclose() does not accept
+        return None
+    if values.dtype.kind != 'f':
+        values = values.astype(float)
+    return values
+
+
+def _deviation(actual, expected, rel_tol: float, abs_tol: float) -> float:
+    """Return how many times the difference of the numbers exceeds their tolerance (0 if they are close)."""
+    if isclose(actual, expected, rel_tol=rel_tol, abs_tol=abs_tol):
+        return 0.0
+    difference = abs(float(actual) - float(expected))
+    tolerance = max(rel_tol * max(abs(actual), abs(expected)), abs_tol)
+    # NaN and infinities are not close to anything (except equal infinities), so they are the worst
+    if difference != difference or not tolerance:
+        return float('inf')
+    return difference / tolerance
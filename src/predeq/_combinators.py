@@ -0,0 +1,283 @@
+from ._predeq import predeq
+from .recipes import ANY, NOT_NONE, _assign, _Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe, instanceof
+
+__all__ = (
+    'all_of',
+    'any_of',
+)
+
+
+def all_of(*matchers: predeq) -> predeq:
+    """Create an object which compares equal to objects equal to all of the *matchers*.
+    Same as ``matcher1 & matcher2 & ...``.
+
+        >>> from predeq import instanceof, predeq
+        >>> positive_int = instanceof(int) & predeq(lambda x: x > 0)
+        >>> 1 == positive_int
+        True
+        >>> -1 == positive_int
+        False
+
+    The matchers are evaluated in the given order, until the first one is not equal to the object.
+
+    Redundant matchers are removed, such as :data:`ANY`, or :data:`NOT_NONE` if another matcher rejects None:
+
+        >>> from predeq import NOT_NONE
+        >>> NOT_NONE & instanceof(int)
+        instanceof(int)
+
+    """
+    operands = []
+    for matcher in _flatten(_AllOf, matchers):
+        if matcher is not ANY and not any(matcher is operand for operand in operands):
+            operands.append(matcher)
+
+    if any(matcher is NOT_NONE for matcher in operands) and any(
+        _equals_none(operand) is False for operand in operands if operand is not NOT_NONE
+    ):
+        operands = [operand for operand in operands if operand is not NOT_NONE]
+
+    if not operands:
+        return ANY
+    if len(operands) == 1:
+        return operands[0]
+    return _AllOf(operands)
+
+
+def any_of(*matchers: predeq) -> predeq:
+    """Create an object which compares equal to objects equal to any of the *matchers*.
+    Same as ``matcher1 | matcher2 | ...``.
+
+        >>> from predeq import instanceof, matches_re
+        >>> int_or_numeric_str = instanceof(int) | matches_re(r'\\d+$')
+        >>> 1 == int_or_numeric_str
+        True
+        >>> '1' == int_or_numeric_str
+        True
+        >>> 'a' == int_or_numeric_str
+        False
+
+    The matchers are evaluated in the given order, until the first one is equal to the object.
+
+    Matchers are simplified when possible, e.g. :func:`instanceof` matchers are merged into a single one
+    (as well as :func:`matches_re` matchers without groups), and :data:`ANY` makes the others redundant:
+
+        >>> instanceof(int) | instanceof(str)
+        instanceof(int, str)
+        >>> from predeq import ANY
+        >>> ANY | int_or_numeric_str
+        <ANY>
+
+    """
+    operands = []
+    for matcher in _flatten(_AnyOf, matchers):
+        if matcher is ANY:
+            return ANY
+        if not any(matcher is operand for operand in operands):
+            operands.append(matcher)
+
+    operands = _merge_instanceof(operands)
+    operands = _merge_matches_re(operands)
+
+    if any(matcher is NOT_NONE for matcher in operands):
+        # None is the only object not equal to NOT_NONE, so the other matchers only matter for None
+        others = [operand for operand in operands if operand is not NOT_NONE]
+        if any(_equals_none(operand) is True for operand in others):
+            return ANY
+        operands = [operand for operand in operands if operand is NOT_NONE or _equals_none(operand) is not False]
+
+    if not operands:
+        return _NEVER
+    if len(operands) == 1:
+        return operands[0]
+    return _AnyOf(operands)
+
+
+class _Combination(predeq):
+    __slots__ = ('operands',)
+
+    _operator: str
+
+    def __init__(self, operands: 'list[predeq]') -> None:
+        super().__init__(self._make_predicate(tuple(map(_predicate_of, operands))))
+        self.operands = tuple(operands)
+
+    def __reduce__(self):
+        return type(self), (self.operands,)
+
+    def _get_default_repr(self) -> str:
+        return f' {self._operator} '.join(
+            # merged matches_re() is an alternation already
+            repr(operand) if isinstance(self, _AnyOf) and isinstance(operand, _MergedMatchesRe)
+            else _repr_operand(operand)
+            for operand in self.operands
+        )
+
+
+class _AllOf(_Combination):
+    __slots__ = ()
+
+    _operator = '&'
+
+    @staticmethod
+    def _make_predicate(predicates):
+        def all_of(obj):
+            for predicate in predicates:
+                if not predicate(obj):
+                    return False
+            return True
+        return all_of
+
+    async def amatch(self, obj) -> bool:
+        for operand in self.operands:
+            if not await operand.amatch(obj):
+                return False
+        return True
+
+
+class _AnyOf(_Combination):
+    __slots__ = ()
+
+    _operator = '|'
+
+    @staticmethod
+    def _make_predicate(predicates):
+        def any_of(obj):
+            for predicate in predicates:
+                if predicate(obj):
+                    return True
+            return False
+        return any_of
+
+    async def amatch(self, obj) -> bool:
+        for operand in self.operands:
+            if await operand.amatch(obj):
+                return True
+        return False
+
+
+class _Not(predeq):
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: predeq) -> None:
+        predicate = _predicate_of(operand)
+        super().__init__(lambda obj: not predicate(obj))
+        self.operand = operand
+
+    def __reduce__(self):
+        return _Not, (self.operand,)
+
+    async def amatch(self, obj) -> bool:
+        return not await self.operand.amatch(obj)
+
+    def _get_default_repr(self) -> str:
+        return f'~{_repr_operand(self.operand)}'
+
+
+def invert(matcher: predeq) -> predeq:
+    """Implementation of ``~matcher``."""
+    if isinstance(matcher, _Not):
+        return matcher.operand
+    return _Not(matcher)
+
+
+_NEVER = predeq(lambda _: False, repr=f'{any_of.__name__}()')
+
+
+def _predicate_of(matcher: predeq):
+    # calling the predicate directly saves a call, unless the class overrides how it's evaluated
+    return matcher.pred if type(matcher).__eq__ is predeq.__eq__ else matcher.__eq__
+
+
+def _repr_operand(matcher: predeq) -> str:
+    return f'({matcher!r})' if isinstance(matcher, (_Combination, _MergedMatchesRe)) else repr(matcher)
+
+
+def _flatten(cls, matchers):
+    for matcher in matchers:
+        if not isinstance(matcher, predeq):
+            raise TypeError(f'expected predeq object, got {type(matcher).__name__}')
+        if type(matcher) is cls:
+            yield from _flatten(cls, matcher.operands)
+        elif cls is _AnyOf and type(matcher) is _MergedMatchesRe:
+            # to be merged again along with other operands
+            yield from matcher.parts
+        else:
+            yield matcher
+
+
+def _equals_none(matcher: predeq) -> 'bool | None':
+    """Return whether *matcher* is equal to None, or None if it's unknown (without calling arbitrary code)."""
+    recipes = (_Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe)
+    if matcher is ANY or matcher is NOT_NONE or isinstance(matcher, recipes):
+        try:
+            return not not matcher.pred(None)
+        except TypeError:
+            # e.g. instanceof() with non-class argument
+            return None
+    return None
+
+
+def _merge_instanceof(operands):
+    """Merge instanceof() operands into the first of them."""
+    merged = [operand for operand in operands if type(operand) is _InstanceOf]
+    if len(merged) < 2:
+        return operands
+    classes = tuple(dict.fromkeys(klass for operand in merged for klass in operand.classes))
+    return [
+        instanceof(*classes) if operand is merged[0] else operand
+        for operand in operands
+        if operand is merged[0] or type(operand) is not _InstanceOf
+    ]
+
+
+def _merge_matches_re(operands):
+    """Merge matches_re() operands with the same flags into the first of them, as an alternation."""
+    import re
+    import warnings
+
+    by_flags = {}
+    for operand in operands:
+        if type(operand) is _MatchesRe and _can_merge_pattern(operand.pattern):
+            by_flags.setdefault(operand.pattern.flags, []).append(operand)
+
+    replacements = {}  # id of operand -> merged operand or None to remove
+    for flags, merged in by_flags.items():
+        if len(merged) < 2:
+            continue
+        alternation = '|'.join(f'(?:{operand.pattern.pattern})' for operand in merged)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')  # e.g. global inline flags not at the start
+                pattern = re.compile(alternation, flags)
+        except (re.error, Warning):
+            continue
+        merged_matcher = _MergedMatchesRe(pattern, merged)
+        replacements.update({id(operand): None for operand in merged})
+        replacements[id(merged[0])] = merged_matcher
+
+    return [
+        replacements.get(id(operand), operand)
+        for operand in operands
+        if replacements.get(id(operand), operand) is not None
+    ]
+
+
+class _MergedMatchesRe(_MatchesRe):
+    __slots__ = ('parts',)
+
+    def __init__(self, pattern: 're.Pattern', parts: 'list[_MatchesRe]') -> None:
+        # show the parts rather than the alternation
+        super().__init__(pattern, repr=' | '.join(map(repr, parts)))
+        _assign(self, 'parts', tuple(parts))
+
+    def __reduce__(self):
+        return _MergedMatchesRe, (self.pattern, self.parts)
+
+
+def _can_merge_pattern(pattern) -> bool:
+    import re  # already imported if there are patterns
+
+    # groups would be renumbered in the alternation, changing the meaning of backreferences;
+    # comments of verbose patterns would comment out the end of the group (like in recipes._can_combine())
+    return isinstance(pattern.pattern, str) and pattern.groups == 0 and not pattern.flags & re.VERBOSE
@@ -0,0 +1,156 @@
+"""Explanation of failed comparisons with structures holding :class:`predeq` objects, for pytest assertions.
+
+The default explanation of pytest shows representations of both structures, and a diff of them, so the
+representation of each predeq object is computed, which might need to find the sources of lambdas. Instead,
+the structures are walked once, and only the mismatching paths are shown, with representations of the
+mismatching predeq objects only.
+"""
+
+from reprlib import Repr
+
+from ._predeq import predeq
+from ._template import _Template, template
+
+# mismatching paths shown unless pytest is run with -vv
+MAX_MISMATCHES = 10
+
+
+class _ShortRepr(Repr):
+    """Representation of (parts of) structures, which does not show the predeq objects they hold."""
+
+    def repr1(self, x, level) -> str:
+        if isinstance(x, predeq):
+            return '...'
+        return super().repr1(x, level)
+
+
+_repr = _ShortRepr()
+_repr.maxstring = _repr.maxother = 80
+
+
+def explain(left, right, verbose: bool = False) -> 'list[str] | None':
+    """Return lines explaining why ``left == right`` is false, or None if neither of them holds predeq objects
+    (or no mismatch is found, e.g. because of a custom ``__eq__``), so that pytest explains it as usual."""
+    # checked first, since the explanation is asked for every failed assertion, and comparing the items
+    # might be expensive
+    if not _holds_predeq(left) and not _holds_predeq(right):
+        return None
+    if isinstance(left, predeq) and not isinstance(right, predeq):
+        # `matcher == actual`, the paths are the same, but the values are shown in the order of the assertion
+        walker = _Walker(swapped=True)
+        walker.walk(right, left, '')
+    else:
+        walker = _Walker(swapped=False)
+        walker.walk(left, right, '')
+    if not walker.mismatches:
+        return None
+
+    mismatches = walker.mismatches
+    lines = [f'{_describe(left)} == {_describe(right)}']
+    if len(mismatches) == 1 and not mismatches[0][0]:
+        # the objects themselves, as told by the first line
+        return lines
+    if verbose or len(mismatches) <= MAX_MISMATCHES:
+        lines.append(f'Mismatching paths ({len(mismatches)}):')
+    else:
+        lines.append(f'Mismatching paths (first {MAX_MISMATCHES} of {len(mismatches)}, use -vv to show all):')
+        mismatches = mismatches[:MAX_MISMATCHES]
+    lines.extend(f'  {path}: {description}' for path, description in mismatches)
+    return lines
+
+
+class _Walker:
+    def __init__(self, swapped: bool) -> None:
+        self.swapped = swapped
+        self.mismatches = []  # (path, description)
+        self.walking = set()  # ids of the pairs of containers being walked, to stop at cycles
+
+    def walk(self, actual, expected, path: str) -> None:
+        """Record the paths where *actual* is not equal to *expected* (the side which predeq objects are on)."""
+        if isinstance(expected, _Template):
+            # a compiled template compares the same as its structure (but requires the same container types)
+            expected = expected.expected
+        if type(expected) is dict and isinstance(actual, dict):
+            walk = self.walk_dict
+        elif type(expected) in (list, tuple) and isinstance(actual, type(expected)):
+            walk = self.walk_sequence
+        else:
+            self.compare(actual, expected, path)
+            return
+
+        key = (id(actual), id(expected))
+        if key in self.walking:
+            # a recursive structure, whose items are being compared already
+            return
+        self.walking.add(key)
+        try:
+            walk(actual, expected, path)
+        finally:
+            self.walking.discard(key)
+
+    def walk_dict(self, actual: dict, expected: dict, path: str) -> None:
+        missing, unexpected = ('only on the right', 'only on the left') if not self.swapped else \
+            ('only on the left', 'only on the right')
+        common = 0
+        for key, value in expected.items():
+            if key in actual:
+                common += 1
+                self.walk(actual[key], value, f'{path}[{key!r}]')
+            else:
+                self.mismatches.append((f'{path}[{key!r}]', missing))
+        if len(actual) > common:
+            self.mismatches.extend((f'{path}[{key!r}]', unexpected) for key in actual if key not in expected)
+
+    def walk_sequence(self, actual, expected, path: str) -> None:
+        if len(actual) != len(expected):
+            lengths = (len(actual), len(expected))
+            self.mismatches.append((path, 'length {} != {}'.format(*(lengths[::-1] if self.swapped else lengths))))
+            # the common items are still compared, to show e.g. which one is missing
+        for index, (item, expected_item) in enumerate(zip(actual, expected)):
+            self.walk(item, expected_item, f'{path}[{index}]')
+
+    def compare(self, actual, expected, path: str) -> None:
+        # the comparisons which == did not reach (after the first mismatch of a container) are made too,
+        # and e.g. predicates might raise for the objects which they do not expect
+        try:
+            equal = self.equal(actual, expected)
+        except Exception as exc:
+            left, right = (expected, actual) if self.swapped else (actual, expected)
+            self.mismatches.append((path, f'{_describe(left)} == {_describe(right)} raised {exc!r}'))
+            return
+        if not equal:
+            self.mismatch(path, actual, expected)
+
+    def equal(self, actual, expected) -> bool:
+        # identity implies equality in containers comparison too (e.g. for NaN)
+        if actual is expected:
+            return True
+        return bool(expected == actual if self.swapped else actual == expected)
+
+    def mismatch(self, path: str, actual, expected) -> None:
+        left, right = (expected, actual) if self.swapped else (actual, expected)
+        self.mismatches.append((path, f'{_describe(left)} != {_describe(right)}'))
+
+
+def _holds_predeq(obj) -> bool:
+    """Return whether *obj* is a predeq object, or a dict, list or tuple holding one (at any depth)."""
+    # iterative, and each container is visited once, so that recursive structures are fine
+    stack = [obj]
+    seen = set()
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, predeq):
+            return True
+        if isinstance(obj, (dict, list, tuple)) and id(obj) not in seen:
+            seen.add(id(obj))
+            stack.extend(obj.values() if isinstance(obj, dict) else obj)
+    return False
+
+
+def _describe(obj) -> str:
+    """Return a short representation of *obj*, which only shows the predeq object it is."""
+    if isinstance(obj, _Template):
+        return f'{template.__name__}({_repr.repr(obj.expected)})'
+    if isinstance(obj, predeq):
+        return repr(obj)
+    return _repr.repr(obj)
@@ -0,0 +1,107 @@
+from collections import deque
+from collections.abc import Iterable
+
+from ._predeq import predeq
+
+__all__ = (
+    'each',
+)
+
+
+def each(matcher, min_len: int = 0, max_len: 'int | None' = None, window: int = 5) -> predeq:
+    """Create an object which compares equal to an iterable (e.g. a generator) of items equal to *matcher*,
+    with at least *min_len* and at most *max_len* items.
+
+        >>> from predeq import instanceof
+        >>> (x * x for x in range(10**6)) == each(instanceof(int))
+        True
+        >>> iter([1, 2]) == each(instanceof(int), min_len=3)
+        False
+
+    The items are consumed one at a time, until the first one not equal to *matcher* (or the first one
+    beyond *max_len*), and are not kept in memory, except for *window* most recent ones, which are shown
+    in the representation after a mismatch:
+
+        >>> matcher = each(instanceof(int))
+        >>> (x if x < 100 else str(x) for x in range(10**6)) == matcher
+        False
+        >>> matcher
+        each(instanceof(int)) (mismatch at index 100, recent items: [96, 97, 98, 99, '100'])
+
+    """
+    return _Each(matcher, min_len, max_len, window)
+
+
+class _Each(predeq):
+    __slots__ = ('matcher', 'min_len', 'max_len', 'window', 'mismatch')
+
+    def __init__(self, matcher, min_len: int, max_len: 'int | None', window: int) -> None:
+        if isinstance(matcher, predeq) and type(matcher).__eq__ is predeq.__eq__:
+            # calling the predicate directly saves a call
+            matches = matcher.pred
+        else:
+            def matches(item):
+                # identity implies equality in containers comparison too (e.g. for NaN)
+                return item is matcher or item == matcher
+        super().__init__(lambda obj: self._compare(obj, matches))
+        self.matcher = matcher
+        self.min_len = min_len
+        self.max_len = max_len
+        self.window = window
+        self.mismatch = None  # description of the last mismatch, if the last comparison failed
+
+    def _compare(self, obj, matches) -> bool:
+        self.mismatch = None
+        if not isinstance(obj, Iterable) or isinstance(obj, (str, bytes, bytearray)):
+            return False
+        if isinstance(obj, (list, tuple)):
+            return self._compare_sequence(obj, matches)
+
+        max_len = self.max_len
+        recent = deque(maxlen=self.window)
+        count = 0
+        for item in obj:
+            recent.append(item)
+            if max_len is not None and count >= max_len:
+                return self._fail(f'more than {max_len} items', recent)
+            if not matches(item):
+                return self._fail(f'mismatch at index {count}', recent)
+            count += 1
+        if count < self.min_len:
+            return self._fail(f'only {count} items', recent)
+        return True
+
+    def _compare_sequence(self, items, matches) -> bool:
+        # all items are in memory already, so they can be checked in bulk
+        if self.max_len is not None and len(items) > self.max_len:
+            return self._fail(f'more than {self.max_len} items', self._recent(items, self.max_len))
+        if len(items) < self.min_len:
+            return self._fail(f'only {len(items)} items', self._recent(items, len(items) - 1))
+
+        if isinstance(self.matcher, predeq) and matches is self.matcher.pred:
+            index = self.matcher.first_mismatch(items)
+        else:
+            index = next((index for index, item in enumerate(items) if not matches(item)), None)
+        if index is not None:
+            return self._fail(f'mismatch at index {index}', self._recent(items, index))
+        return True
+
+    def _recent(self, items, last: int):
+        """Return the items of the window ending with ``items[last]``, like in the streaming comparison."""
+        return items[max(last - self.window + 1, 0):last + 1]
+
+    def _fail(self, description: str, recent) -> bool:
+        self.mismatch = f'{description}, recent items: {list(recent)!r}' if self.window else description
+        return False
+
+    def _get_default_repr(self) -> str:
+        arguments = [repr(self.matcher)]
+        if self.min_len:
+            arguments.append(f'min_len={self.min_len!r}')
+        if self.max_len is not None:
+            arguments.append(f'max_len={self.max_len!r}')
+        return f'{each.__name__}({", ".join(arguments)})'
+
+    def __repr__(self) -> str:
+        base = super().__repr__()
+        return base if self.mismatch is None else f'{base} ({self.mismatch})'
@@ -0,0 +1,168 @@
+from ._combinators import _AllOf
+from ._predeq import predeq
+from .recipes import ANY, NOT_NONE, _Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe
+
+__all__ = (
+    'PredicateIndex',
+)
+
+_MATCHER = object()  # default value of added matchers, see PredicateIndex.add()
+
+
+class PredicateIndex:
+    """Collection of :class:`predeq` objects (matchers), which finds the ones equal to an object
+    without comparing it with each of them.
+
+    Each matcher is added with a value, which is the matcher itself by default. It might be e.g. a handler
+    of the objects equal to the matcher:
+
+        >>> from predeq import instanceof, matches_re
+        >>> index = PredicateIndex([
+        ...     (instanceof(bool), 'flag'),
+        ...     (instanceof(int, float), 'number'),
+        ...     (matches_re(r'\\d+$'), 'numeric string'),
+        ... ])
+        >>> index.find(True)
+        'flag'
+        >>> index.find_all(True)
+        ['flag', 'number']
+        >>> index.find('123')
+        'numeric string'
+        >>> index.find('abc') is None
+        True
+
+    The recipes are indexed by what they check: :func:`instanceof` and :func:`exception` by their classes
+    (an object is only compared with the matchers of classes in its MRO), :func:`matches_re` by the literal
+    prefix of the pattern, and :func:`matches_any_re` by the class of strings. Objects are compared with
+    the other matchers (e.g. custom predicates) one by one.
+    """
+
+    def __init__(self, items=()) -> None:
+        self._matchers = []
+        self._values = []
+        self._unindexed = []  # positions of matchers compared with every object
+        self._not_none = []
+        self._by_class = {}  # class -> positions of matchers which might equal its instances
+        self._by_prefix = {}  # prefix length -> {prefix: positions of matchers of strings starting with it}
+        for matcher, value in items:
+            self.add(matcher, value)
+
+    def add(self, matcher: predeq, value=_MATCHER) -> None:
+        """Add *matcher*, with *value* to be returned by :meth:`find` and :meth:`find_all`
+        (*matcher* itself, if not given)."""
+        if not isinstance(matcher, predeq):
+            raise TypeError(f'expected predeq object, got {type(matcher).__name__}')
+        position = len(self._matchers)
+        self._matchers.append(matcher)
+        self._values.append(matcher if value is _MATCHER else value)
+
+        kind, keys = _index_keys(matcher)
+        if kind == 'classes':
+            for klass in keys:
+                self._by_class.setdefault(klass, []).append(position)
+        elif kind == 'prefix':
+            self._by_prefix.setdefault(len(keys), {}).setdefault(keys, []).append(position)
+        elif kind == 'not_none':
+            self._not_none.append(position)
+        else:
+            self._unindexed.append(position)
+
+    def __len__(self) -> int:
+        return len(self._matchers)
+
+    def __iter__(self) -> 'Iterator[predeq]':
+        return iter(self._matchers)
+
+    def find(self, obj, default=None):
+        """Return the value of the first matcher (in the order they were added) equal to *obj*,
+        or *default* if there is none."""
+        matchers = self._matchers
+        for position in self._candidates(obj):
+            if matchers[position] == obj:
+                return self._values[position]
+        return default
+
+    def find_all(self, obj) -> list:
+        """Return the values of all matchers equal to *obj*, in the order they were added."""
+        matchers, values = self._matchers, self._values
+        return [values[position] for position in self._candidates(obj) if matchers[position] == obj]
+
+    def _candidates(self, obj) -> 'list[int]':
+        """Return sorted positions of matchers which might be equal to *obj*."""
+        candidates = self._unindexed.copy()
+        if obj is not None:
+            candidates += self._not_none
+
+        by_class = self._by_class
+        if by_class:
+            cls = type(obj)
+            for klass in cls.__mro__:
+                candidates += by_class.get(klass, ())
+            # isinstance() also checks __class__, which might differ (e.g. for mocks with spec)
+            spoofed = getattr(obj, '__class__', cls)
+            if spoofed is not cls and isinstance(spoofed, type):
+                for klass in spoofed.__mro__:
+                    candidates += by_class.get(klass, ())
+
+        if self._by_prefix and isinstance(obj, str):
+            for length, by_prefix in self._by_prefix.items():
+                candidates += by_prefix.get(obj[:length], ())
+
+        # a matcher might be listed under several classes of the MRO
+        return sorted(set(candidates))
+
+
+def _index_keys(matcher) -> 'tuple[str, object]':
+    """Return how objects which might be equal to *matcher* are found: by their classes, by prefix (of strings),
+    by not being None, or not at all (``'unindexed'``)."""
+    if matcher is NOT_NONE:
+        return 'not_none', None
+    if type(matcher).__eq__ is not predeq.__eq__:
+        # evaluated in a custom way, which might not depend on the arguments
+        return 'unindexed', None
+    if isinstance(matcher, _InstanceOf) and all(map(_has_mro_based_instancecheck, matcher.classes)):
+        return 'classes', matcher.classes
+    if isinstance(matcher, _Exception) and _has_mro_based_instancecheck(type(matcher.exc)):
+        return 'classes', (type(matcher.exc),)
+    if isinstance(matcher, _MatchesRe):
+        prefix = _literal_prefix(matcher.pattern)
+        return ('prefix', prefix) if prefix else ('classes', (str,))
+    if isinstance(matcher, _MatchesAnyRe):
+        return 'classes', (str,)
+    if isinstance(matcher, _AllOf):
+        # objects equal to all of the operands are equal to any of them, so any indexed one will do
+        for operand in matcher.operands:
+            if (keys := _index_keys(operand))[0] != 'unindexed':
+                return keys
+    # ANY and custom predicates
+    return 'unindexed', None
+
+
+def _has_mro_based_instancecheck(klass) -> bool:
+    """Return True if isinstance(obj, klass) is True only if klass is in MRO of type(obj) or obj.__class__
+    (unlike e.g. for ABCs with virtual subclasses)."""
+    return isinstance(klass, type) and type(klass).__instancecheck__ is type.__instancecheck__
+
+
+# characters of regular expressions which are not literals themselves, or change the meaning of the previous one
+_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]()\\|')
+_OPTIONAL_QUANTIFIERS = frozenset('*?{')
+
+
+def _literal_prefix(pattern: 're.Pattern') -> str:
+    """Return the literal string which matched strings start with, possibly empty."""
+    import re  # already imported if there are patterns
+
+    source = pattern.pattern
+    if not isinstance(source, str) or pattern.flags & (re.IGNORECASE | re.VERBOSE) or '|' in source:
+        # other cases of the characters, ignored whitespace, or alternatives (even if escaped, to be safe)
+        return ''
+
+    # matching starts at the beginning of string anyway
+    start = end = 1 if source.startswith('^') else 0
+    while end < len(source) and source[end] not in _SPECIAL_CHARACTERS:
+        end += 1
+    if end < len(source) and source[end] in _OPTIONAL_QUANTIFIERS:
+        # the last literal might be absent
+        end -= 1
+    return source[start:max(end, start)]
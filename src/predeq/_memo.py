@@ -0,0 +1,116 @@
+from _thread import allocate_lock
+from collections import OrderedDict
+from struct import Struct
+
+
+class _Memoized:
+    """Predicate remembering its results for *maxsize* most recently checked objects (see ``cache`` of predeq).
+
+    Numbers, strings, bytes and None are keyed by their type and value, so equal objects share the result
+    (floats by their bits, since e.g. 0.0 == -0.0, but predicates might tell them apart).
+    Other objects (e.g. tuples, lists and dicts) are keyed by identity: a weak reference to the object is kept
+    if it supports them (the entry is removed when it is garbage collected), or the object itself otherwise,
+    so that its id is not reused by another object while the entry exists.
+    """
+
+    __slots__ = ('__wrapped__', 'maxsize', 'hits', 'misses', '_entries', '_lock')
+
+    def __init__(self, predicate, maxsize: int) -> None:
+        if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError(f'cache must be a positive number of results, got {maxsize!r}')
+        self.__wrapped__ = predicate
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        # key -> (result, referent, weak), referent is the object (or a weak reference to it) keyed by identity
+        self._entries = OrderedDict()
+        self._lock = allocate_lock()
+
+    def __reduce__(self):
+        # the results are not pickled (nor the lock, which cannot be), e.g. when sent to another process
+        return _Memoized, (self.__wrapped__, self.maxsize)
+
+    def __call__(self, obj) -> bool:
+        key, by_identity = _key(obj)
+        entries = self._entries
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and (not by_identity or (entry[1]() if entry[2] else entry[1]) is obj):
+                self.hits += 1
+                entries.move_to_end(key)
+                return entry[0]
+            self.misses += 1
+
+        # called without the lock held, since it might take long, or check other objects with this predicate
+        result = not not self.__wrapped__(obj)
+        referent = weak = None
+        if by_identity:
+            referent = _weakref(obj, self._remover(key))
+            weak = referent is not None
+            if not weak:
+                referent = obj
+        with self._lock:
+            entries[key] = (result, referent, weak)
+            entries.move_to_end(key)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return result
+
+    def _remover(self, key):
+        def remove(weak_ref, entries=self._entries):
+            # not locked, like in RecipeCache (the garbage collector might run while the lock is held)
+            entry = entries.get(key)
+            if entry is not None and entry[1] is weak_ref:
+                entries.pop(key, None)
+        return remove
+
+    def info(self) -> dict:
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'maxsize': self.maxsize,
+                'currsize': len(self._entries),
+                'hit_rate': self.hits / calls if calls else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_IDENTITY = object()  # marks keys of objects keyed by identity, which no value key can be equal to
+
+# types whose equal instances cannot be told apart by predicates (except by identity); instances of other types,
+# even hashable ones, might be equal but hold items of different types (e.g. (1,) == (True,)), or be mutable
+_VALUE_TYPES = frozenset({int, str, bytes, bool, type(None)})
+
+# floats (and parts of complex numbers) are keyed by their bits, since equal ones might still be told apart
+# (0.0 and -0.0, e.g. by math.copysign()), and unequal ones might be the same (NaNs with different payloads)
+_pack_float = Struct('d').pack
+_pack_complex = Struct('dd').pack
+
+
+def _key(obj):
+    """Return the key of *obj*, and whether it is keyed by identity."""
+    cls = type(obj)
+    if cls in _VALUE_TYPES:
+        # types are a part of the key, since e.g. 1 == 1.0 == True, but predicates might tell them apart
+        return (cls, obj), False
+    if cls is float:
+        return (float, _pack_float(obj)), False
+    if cls is complex:
+        return (complex, _pack_complex(obj.real, obj.imag)), False
+    return (_IDENTITY, id(obj)), True
+
+
+def _weakref(obj, callback):
+    from weakref import ref  # not imported at module level, since most objects are keyed by value
+
+    try:
+        return ref(obj, callback)
+    except TypeError:
+        # e.g. lists and dicts
+        return None
+
@@ -0,0 +1,109 @@
+"""Evaluation of :class:`predeq` objects over many objects in an executor, see :meth:`predeq.match_many`."""
+
+import os
+import pickle
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, as_completed, wait
+from itertools import chain
+
+# chunks per worker, so that the workers finishing early take over the remaining chunks
+_CHUNKS_PER_WORKER = 4
+
+
+def match_many(matcher, iterable, executor, chunksize: 'int | None') -> 'list[bool]':
+    items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+    if not _can_submit(matcher, executor):
+        return matcher._match_many(items)
+
+    futures = [executor.submit(_match_chunk, matcher, chunk) for _, chunk in _chunks(items, executor, chunksize)]
+    try:
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in done:
+            # without waiting for the other chunks, which are cancelled below
+            if future.exception() is not None:
+                raise future.exception()
+        return list(chain.from_iterable(future.result() for future in futures))
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def first_mismatch(matcher, iterable, executor, chunksize: 'int | None') -> 'int | None':
+    items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+    if not _can_submit(matcher, executor):
+        return matcher._first_mismatch(items)
+
+    starts = {}  # future -> index of the first item of its chunk
+    for start, chunk in _chunks(items, executor, chunksize):
+        starts[executor.submit(_first_mismatch_in_chunk, matcher, chunk)] = start
+    futures = list(starts)
+
+    mismatch = None
+    failure = None  # (index of the first item of the chunk, exception) of the first chunk which raised
+    end = None  # the chunks starting before it are to be checked
+    unchecked = set(futures)
+    try:
+        for future in as_completed(futures):
+            unchecked.discard(future)
+            if future.cancelled():
+                continue
+            start = starts[future]
+            if (exc := future.exception()) is not None:
+                # raised only if there is no mismatch before, as when the items are checked one by one
+                if failure is None or start < failure[0]:
+                    failure = start, exc
+                    end = start if end is None else min(end, start)
+                    _cancel_after(futures, starts, start)
+            elif (index := future.result()) is not None:
+                index += start
+                if mismatch is None or index < mismatch:
+                    mismatch = index
+                    end = index if end is None else min(end, index)
+                    # the chunks after the mismatch do not matter anymore
+                    _cancel_after(futures, starts, index)
+            if end is not None and not any(starts[other] < end for other in unchecked):
+                # the chunks before are all checked
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    if failure is not None and (mismatch is None or failure[0] < mismatch):
+        raise failure[1]
+    return mismatch
+
+
+def _cancel_after(futures, starts: dict, index: int) -> None:
+    for future in futures:
+        if starts[future] > index:
+            future.cancel()
+
+
+def _match_chunk(matcher, chunk: list) -> 'list[bool]':
+    return matcher._match_many(chunk)
+
+
+def _first_mismatch_in_chunk(matcher, chunk: list) -> 'int | None':
+    return matcher._first_mismatch(chunk)
+
+
+def _can_submit(matcher, executor) -> bool:
+    """Return True if *matcher* can be sent to the workers of *executor*."""
+    if isinstance(executor, ThreadPoolExecutor):
+        # the workers share the objects
+        return True
+    try:
+        pickle.dumps(matcher)
+    except Exception:
+        # e.g. a lambda predicate, or unpicklable arguments of a recipe
+        return False
+    return True
+
+
+def _chunks(items, executor, chunksize: 'int | None'):
+    """Yield the index of the first item and the items of each chunk."""
+    if chunksize is None:
+        workers = getattr(executor, '_max_workers', None) or os.cpu_count() or 1
+        chunksize = -(-len(items) // (workers * _CHUNKS_PER_WORKER)) or 1
+    elif chunksize < 1:
+        raise ValueError(f'chunksize must be positive, got {chunksize!r}')
+    for start in range(0, len(items), chunksize):
+        yield start, items[start:start + chunksize]
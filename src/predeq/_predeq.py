@@ -1,11 +1,25 @@
-import ast
-import dis
-import re
+import os
 import sys
-from collections import deque
-from functools import cached_property, partial
-from inspect import getsourcelines, iscode, isfunction
-from itertools import accumulate, chain
+from types import FunctionType
+
+
+class _InstanceDoc:
+    """Descriptor of ``__doc__`` which allows assigning it to instances of a class with ``__slots__``."""
+
+    def __init__(self, class_doc, slot) -> None:
+        self.class_doc = class_doc
+        self.slot = slot
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.class_doc
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            return self.class_doc
+
+    def __set__(self, instance, value) -> None:
+        self.slot.__set__(instance, value)
 
 
 class predeq:
@@ -27,185 +41,169 @@ class predeq:
             ...
         TypeError: unsupported operand type(s) for %: 'NoneType' and 'int'
 
+    If *cache* is given, the results for that many most recently compared objects are remembered, which pays off
+    for expensive predicates (e.g. parsing) when the same objects are compared again and again, as by ``in``,
+    ``list.count()`` or ``list.index()``:
+
+        >>> checked = []
+        >>> def is_number(string):
+        ...     checked.append(string)
+        ...     return string.isdigit()
+        >>> number = predeq(is_number, cache=100)
+        >>> ['1', 'a', '1', '1'].count(number)
+        3
+        >>> checked
+        ['1', 'a']
+        >>> number.cache_info()
+        {'hits': 2, 'misses': 2, 'maxsize': 100, 'currsize': 2, 'hit_rate': 0.5}
+
+    Numbers, strings, bytes and None are remembered by their type and value, and other objects by identity
+    (only while they exist, if they support weak references), so they must not change while they are compared.
     """
 
-    def __init__(self, predicate, repr: 'str | None' = None) -> None:
+    # predeq objects are often created in large numbers (e.g. a template for each item of a large collection),
+    # so they have no __dict__, and the default representation is computed into a slot when first needed
+    __slots__ = ('pred', 'repr', '_default_repr', '_doc', '__weakref__')
+
+    def __init__(self, predicate, repr: 'str | None' = None, cache: 'int | None' = None) -> None:
+        if cache is not None:
+            from ._memo import _Memoized
+            predicate = _Memoized(predicate, cache)
         self.pred = predicate
         self.repr = repr
 
-    @cached_property
-    def _default_repr(self):
-        predicate = (
+    def _get_default_repr(self) -> str:
+        return f'<predeq to meet {self._repr_predicate()}>'
+
+    def _repr_predicate(self) -> str:
+        # finding the source of lambda requires heavy imports (ast, inspect, etc.) which are deferred until
+        # the representation is actually needed, typically when a test fails
+        from ._source import _get_lambda_repr
+
+        predicate = self._predicate()
+        return (
             # show source for lambdas, but __name__ for functions (function body might be too long)
-            (_get_lambda_repr(self.pred) if _islambda(self.pred) else getattr(self.pred, '__name__', None))
+            (_get_lambda_repr(predicate) if _islambda(predicate) else getattr(predicate, '__name__', None))
             # if not available, fallback to repr
-            or repr(self.pred)
+            or repr(predicate)
         )
-        return f'<predeq to meet {predicate}>'
+
+    def _predicate(self):
+        """Return the predicate given to the constructor (which is wrapped if the results are cached)."""
+        return self.pred.__wrapped__ if _is_memoized(self.pred) else self.pred
 
     def __repr__(self) -> str:
         if self.repr is not None:
             return self.repr
-        return self._default_repr
+        try:
+            return self._default_repr
+        except AttributeError:
+            self._default_repr = self._get_default_repr()
+            return self._default_repr
 
     def __eq__(self, other) -> bool:
         return not not self.pred(other)
 
-
-def _get_lambda_repr(lambda_func) -> 'str | None':
-    try:
-        lines, lnum = getsourcelines(lambda_func)
-    except OSError:
-        return None
-
-    # Problem: the source code returned by inspect.getsourcelines() has unwanted additional context, such as:
-    #   1. The statement where lambda is defined (e.g. "x = lambda: None" or "print(getsource(lambda: None))")
-    #   2. Lambdas that are defined in assertions rewritten by pytest have source offsets
-    #      cover the whole assert statement (which could also contain other lambda definitions)
-    #
-    # There are two solutions for this problem, each adressing it only partially:
-    #   1. Use __code__.co_positions
-    #      Pros: solves problem #1
-    #      Cons: available in Python 3.11+ only, does not work with rewritten assertions where offsets are incorrect
-    #   2. Parse the found source into AST, and find the lambda node corresponding to the searched lambda
-    #      by compiling the node and comparing bytecode
-    #      Pros: solves problem #2, and #1 given that the source is a valid Python code
-    #      Cons: the source might not be a valid code if lambda is a part of multiline expression
-    #
-    # In case no solution is able to precisely locate the lambda definition, return None.
-
-    source = (
-        (_get_lambda_source_co_positions(lines, lnum, lambda_func) if sys.version_info >= (3, 11) else None)
-        or _get_lambda_source_ast(''.join(lines), lambda_func)
-    )
-    if not source:
-        return None
-    if (newline_pos := source.find('\n')) >= 0:
-        # multiline lambda is rather rarely used, but the \n in the middle makes repr ugly
-        source = source[:newline_pos] + '...'
-    return source
-
-
-_LAMBDA_PATTERN = re.compile(br'(?<!\w)(lambda)\W', re.ASCII)
-
-
-def _get_lambda_source_co_positions(lines, lnum, lambda_func) -> 'str | None':
-    # according to python data model, "column information is 0-indexed utf-8 byte offsets", so work on encoded source
-    lines = list(map(str.encode, lines))
-
-    # prepare the `source` and `offsets` of line starts in it
-    source = b''.join(lines)
-    offsets = dict(enumerate(accumulate(map(len, lines[:-1]), initial=0), start=lnum))
-
-    # find lambda body span (code after a colon) from instructions' positions
-    body_start_offsets, body_end_offsets = zip(*(
-        (offsets[pos.lineno] + pos.col_offset, offsets[pos.end_lineno] + pos.end_col_offset)
-        for instr in dis.get_instructions(lambda_func)
-        # some instructions have zeroed both col_offset and end_col_offset, those are filtered out
-        if (pos := instr.positions).col_offset or pos.end_col_offset
-    ))
-
-    # now find the lambda keyword closest to the body
-    matches = deque(_LAMBDA_PATTERN.finditer(source[:min(body_start_offsets)]), maxlen=1)
-    try:
-        lambda_match = matches[-1]
-    except IndexError:
-        # deque is empty because no matches was found
-        return None
-
-    return source[lambda_match.start():max(body_end_offsets)].decode()
-
-
-_DUMMY_POSITION = {'lineno': 1, 'col_offset': 0}
-_ENABLE_ONE_NODE_SHORT_PATH = True  # see _get_lambda_source_ast() below
-
-
-def _get_lambda_source_ast(source, lambda_func) -> 'str | None':
-    source = source.lstrip()  # remove leading whitespace so that it's not interpreted as indent
-
-    try:
-        tree = ast.parse(source)
-    except SyntaxError:
-        # the context available in `source` is not a valid code on its own
+    def __and__(self, other: 'predeq') -> 'predeq':
+        """``self & other`` is equal to objects equal to both, see :func:`all_of`."""
+        if not isinstance(other, predeq):
+            return NotImplemented
+        from ._combinators import all_of
+        return all_of(self, other)
+
+    def __or__(self, other: 'predeq') -> 'predeq':
+        """``self | other`` is equal to objects equal to any of them, see :func:`any_of`."""
+        if not isinstance(other, predeq):
+            return NotImplemented
+        from ._combinators import any_of
+        return any_of(self, other)
+
+    def __invert__(self) -> 'predeq':
+        """``~self`` is equal to objects not equal to *self*."""
+        from ._combinators import invert
+        return invert(self)
+
+    def cache_info(self) -> 'dict | None':
+        """Return the statistics of the results cache (see *cache* above), or None if the results are not cached."""
+        return self.pred.info() if _is_memoized(self.pred) else None
+
+    def cache_clear(self) -> None:
+        """Forget the cached results (if any), and reset the statistics."""
+        if _is_memoized(self.pred):
+            self.pred.clear()
+
+    async def amatch(self, obj) -> bool:
+        """Return whether *obj* compares equal to this object, awaiting the predicates of :class:`apredeq` objects
+        (e.g. operands of :func:`all_of`). For other objects, it is the same as ``obj == self``."""
+        return self.__eq__(obj)
+
+    def match_many(self, iterable, executor: 'Executor | None' = None, chunksize: 'int | None' = None) -> 'list[bool]':
+        """Return a list telling for each object of *iterable* whether it compares equal to this object.
+
+            >>> even = predeq(lambda x: x % 2 == 0)
+            >>> even.match_many([1, 2, 4])
+            [False, True, True]
+
+        The result is the same as of ``[obj == self for obj in iterable]``, but it is faster,
+        especially with the recipes which check objects in bulk (e.g. :func:`instanceof` checks each type once).
+
+        If *executor* (e.g. :class:`~concurrent.futures.ProcessPoolExecutor`) is given, the objects are checked
+        in it, in chunks of *chunksize* objects (by default, split evenly among the workers). It pays off
+        for expensive predicates only. If the objects would be sent to other processes, but this object cannot
+        be pickled (e.g. with a lambda predicate), they are checked in this process instead.
+        """
+        if executor is not None:
+            from ._parallel import match_many
+            return match_many(self, iterable, executor, chunksize)
+        return self._match_many(iterable)
+
+    def _match_many(self, iterable) -> 'list[bool]':
+        # overridden by recipes which check objects in bulk
+        return list(map(bool, map(self.pred, iterable)))
+
+    def first_mismatch(
+        self, iterable, executor: 'Executor | None' = None, chunksize: 'int | None' = None,
+    ) -> 'int | None':
+        """Return the index of the first object of *iterable* which does not compare equal to this object,
+        or None if all of them do.
+
+            >>> even = predeq(lambda x: x % 2 == 0)
+            >>> even.first_mismatch([2, 4, 5, 6])
+            2
+            >>> even.first_mismatch([]) is None
+            True
+
+        Objects after the first mismatch are not checked, unless checking them in bulk is faster.
+        *executor* and *chunksize* are like in :meth:`match_many`, and the chunks after a mismatch are cancelled.
+        """
+        if executor is not None:
+            from ._parallel import first_mismatch
+            return first_mismatch(self, iterable, executor, chunksize)
+        return self._first_mismatch(iterable)
+
+    def _first_mismatch(self, iterable) -> 'int | None':
+        for index, matches in enumerate(map(self.pred, iterable)):
+            if not matches:
+                return index
         return None
 
-    nodes = _filter_instance(ast.Lambda, ast.walk(tree))
-
-    # _ENABLE_ONE_NODE_SHORT_PATH enables "short path": if there is only one function node in AST of the source
-    # returned by `getsource()`, it is assumed that this is the function we are looking source code for.
-    # It is enabled by default, but omitted in tests to verify this assumption and bytecode comparison code.
-    if _ENABLE_ONE_NODE_SHORT_PATH:
-        if (first := next(nodes, None)) is None:
-            # no func/lambda node found in AST, should not happen
-            return None
-
-        if (second := next(nodes, None)) is None:
-            # there is only `first` node, return its source segment
-            return ast.get_source_segment(source, first)
-
-        # there is more than one, restore the iterator and compare by bytecode
-        nodes = chain((first, second), nodes)
-
-    compile_node = _get_node_compiler(lambda_func.__code__)
-    for node in nodes:
-        # lambda node has to be wrapped into Expr to be compiled, see `echo lambda:0 | python -m ast`
-        code = compile_node(ast.Expr(node, **_DUMMY_POSITION))
-        if code.co_code == lambda_func.__code__.co_code:
-            return ast.get_source_segment(source, node)
-
-    return None
-
-
-def _get_node_compiler(code):
-    # When `node` is compiled in module scope, names other than its arguments are loaded from global scope
-    # using LOAD_GLOBAL instruction. However, sometimes the function has variables captured from outer scope,
-    # which should be loaded by LOAD_DEREF. This causes a difference in the bytecode of the recompiled node.
-
-    # If a function's code has non-empty `co_freevars` (names of variables captured from outer scope),
-    # the node is compiled in the scope of an artificial function which has those freevars defined.
-    # The compiler then produces LOAD_DEREF instructions, and the bytecode is equal to original function's one.
-    # Otherwise, module scope compiler is used because it does not do unnecessary work.
-
-    freevars = code.co_freevars
-    return _compile_node if not freevars else partial(_compile_node_with_freevars, freevars)
-
-
-def _find_code(iterable, *default):
-    return next(filter(iscode, iterable), *default)
-
-
-def _compile_node(node):
-    # get node's code object from module's co_consts
-    return _find_code(compile(ast.Module([node], []), '<dummy>', 'exec').co_consts)
-
-
-_NO_ARGS = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
 
+# allow documenting instances (e.g. ANY) for help() and sphinx, slot descriptor is only available after class creation
+predeq.__doc__ = _InstanceDoc(predeq.__doc__, predeq._doc)
 
-def _compile_node_with_freevars(freevars, node):
-    """Compile `node` in the function scope with `freevars` defined."""
 
-    # get inner node's code object from outer node's co_consts
-    return _find_code(_compile_node(ast.FunctionDef(
-        **_DUMMY_POSITION,
-        name='@outer_scope@',  # use a syntactically invalid name to avoid any potential name clashes
-        args=_NO_ARGS,
-        decorator_list=[],
-        body=[
-            ast.Assign(
-                [ast.Name(freevar, ctx=ast.Store(), **_DUMMY_POSITION) for freevar in freevars],
-                ast.Constant(None, **_DUMMY_POSITION),
-                **_DUMMY_POSITION
-            ),
-            node,
-        ],
-    )).co_consts)
+def _is_memoized(predicate) -> bool:
+    # _memo module is only imported if a cache is used
+    memo = sys.modules.get(f'{__package__}._memo')
+    return memo is not None and isinstance(predicate, memo._Memoized)
 
 
 def _islambda(obj):
     # apparently there is no more reliable method than checking __name__
-    return isfunction(obj) and obj.__name__ == '<lambda>'
+    return isinstance(obj, FunctionType) and obj.__name__ == '<lambda>'
 
 
-def _filter_instance(class_or_tuple, iterable):
-    return (obj for obj in iterable if isinstance(obj, class_or_tuple))
+if os.environ.get('PREDEQ_PROFILE'):
+    # opt-in instrumentation, see predeq.profiling
+    from .profiling import _enable_from_environment
+    _enable_from_environment()
@@ -0,0 +1,165 @@
+"""Persistent cache of lambda sources, shared between processes (e.g. pytest-xdist workers) and runs.
+
+For each source file, the cache directory holds a JSON file with the hash of the source file contents,
+and the sources of lambdas found in it keyed by a digest of their code objects. The cache is disabled by default,
+and can be enabled by setting ``PREDEQ_REPR_CACHE`` environment variable to a directory path,
+or with ``--predeq-repr-cache`` pytest option (see :mod:`predeq.pytest_plugin`).
+
+New entries are kept in memory and written in batches, and when the cache is disabled or the process exits,
+rather than rewriting the file for every lambda.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from inspect import iscode
+
+MISSING = object()
+# signature (modification time and size) of a source file which is not known yet
+UNKNOWN = object()
+
+# number of new entries of a file written at once
+_BATCH = 256
+
+_directory = os.environ.get('PREDEQ_REPR_CACHE') or None
+_files = {}
+
+
+def enable(directory) -> None:
+    """Store cached lambda sources in *directory*."""
+    global _directory
+    flush()
+    _directory = os.fspath(directory)
+    _files.clear()
+
+
+def disable() -> None:
+    global _directory
+    flush()
+    _directory = None
+    _files.clear()
+
+
+def flush() -> None:
+    """Write the new entries which have not been written yet."""
+    for file in list(_files.values()):
+        if file.pending:
+            file.save()
+
+
+def is_enabled() -> bool:
+    return _directory is not None
+
+
+def lookup(code, signature=UNKNOWN) -> 'str | None':
+    """Return the cached source of lambda with `code`, which might be None if it could not be found,
+    or MISSING if there is no entry for it. `signature` is the one of the source file, if already known
+    (see _source._file_signature()), which saves checking the file again.
+    """
+    if _directory is None or (file := _get_file(code.co_filename, signature)) is None:
+        return MISSING
+    return file.lambdas.get(_code_digest(code), MISSING)
+
+
+def store(code, source: 'str | None', signature=UNKNOWN) -> None:
+    if _directory is None or (file := _get_file(code.co_filename, signature)) is None:
+        return
+    file.lambdas[_code_digest(code)] = source
+    file.pending += 1
+    if file.pending >= _BATCH:
+        file.save()
+
+
+class _CachedFile:
+    def __init__(self, filename, signature, source_hash) -> None:
+        self.signature = signature
+        self.source_hash = source_hash
+        self.path = os.path.join(_directory, hashlib.sha1(filename.encode()).hexdigest() + '.json')
+        self.lambdas = self._load()
+        # number of entries stored since the file was last written
+        self.pending = 0
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        # entries for other versions of the source file are outdated
+        if not isinstance(content, dict) or content.get('hash') != self.source_hash:
+            return {}
+        return content.get('lambdas', {})
+
+    def save(self) -> None:
+        # other processes might have stored their entries since the file was loaded, so merge them (unless
+        # overwritten concurrently, but losing an entry only means it will be found again), and replace the file
+        # atomically so that readers never see a partially written one
+        lambdas = {**self._load(), **self.lambdas}
+        self.pending = 0
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump({'hash': self.source_hash, 'lambdas': lambdas}, file)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            # the cache is an optimization, failing to write it should not fail the caller
+            return
+        self.lambdas = lambdas
+
+
+def _get_file(filename, signature=UNKNOWN) -> '_CachedFile | None':
+    if signature is UNKNOWN:
+        from ._source import _file_signature
+
+        signature = _file_signature(filename)
+    if signature is None:
+        # pseudo-files (e.g. "<stdin>") have no persistent identity
+        return None
+
+    file = _files.get(filename)
+    if file is None or file.signature != signature:
+        try:
+            with open(filename, 'rb') as source:
+                source_hash = hashlib.sha256(source.read()).hexdigest()
+        except OSError:
+            return None
+        # new entries for the outdated version of the source file are dropped
+        file = _files[filename] = _CachedFile(filename, signature, source_hash)
+    return file
+
+
+atexit.register(flush)
+
+
+def _code_digest(code) -> str:
+    return hashlib.sha1(repr(_stable_key(code)).encode()).hexdigest()
+
+
+def _stable_key(obj):
+    """Return a key of code object which is the same in every process (e.g. not depending on hash randomization)."""
+    if iscode(obj):
+        return (
+            obj.co_firstlineno,
+            # positions in Python 3.10+, line numbers otherwise
+            obj.co_linetable if sys.version_info >= (3, 10) else obj.co_lnotab,
+            obj.co_code,
+            obj.co_names,
+            obj.co_varnames,
+            obj.co_freevars,
+            tuple(map(_stable_key, obj.co_consts)),
+        )
+    if isinstance(obj, tuple):
+        return tuple(map(_stable_key, obj))
+    if isinstance(obj, frozenset):
+        # iteration order of sets of strings changes between processes
+        return ('frozenset', sorted(map(repr, map(_stable_key, obj))))
+    return (type(obj).__name__, obj)
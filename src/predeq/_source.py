@@ -0,0 +1,268 @@
+import ast
+import linecache
+import os
+import sys
+import threading
+from bisect import bisect_left
+from functools import cached_property
+from inspect import iscode
+from itertools import accumulate
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+from . import _repr_cache
+
+
+# filename -> {code: source}, code objects compare equal regardless of the file; they are referenced weakly,
+# so that the sources (or None if not found) are forgotten with the lambdas
+_LAMBDA_REPRS = {}
+
+
+def _get_lambda_repr(lambda_func) -> 'str | None':
+    code = lambda_func.__code__
+    if (reprs := _LAMBDA_REPRS.get(code.co_filename)) is not None:
+        if (source := reprs.get(code, _repr_cache.MISSING)) is not _repr_cache.MISSING:
+            return source
+
+    # the lambdas of a file are resolved by one thread at a time (e.g. when a thread pool fails at once),
+    # so that each of them is resolved, and the file is indexed, at most once
+    with _file_lock(code.co_filename):
+        reprs = _LAMBDA_REPRS.setdefault(code.co_filename, WeakKeyDictionary())
+        if (source := reprs.get(code, _repr_cache.MISSING)) is _repr_cache.MISSING:
+            # the file is checked for changes once, for both the persistent cache and the index
+            signature = _file_signature(code.co_filename)
+            if (source := _repr_cache.lookup(code, signature)) is _repr_cache.MISSING:
+                source = _find_lambda_repr(lambda_func, signature)
+                _repr_cache.store(code, source, signature)
+            reprs[code] = source
+    return source
+
+
+# the lock of a file exists while a thread holds or waits for it
+_FILE_LOCKS = WeakValueDictionary()
+_FILE_LOCKS_LOCK = threading.Lock()
+
+
+def _file_lock(filename) -> threading.Lock:
+    with _FILE_LOCKS_LOCK:
+        if (lock := _FILE_LOCKS.get(filename)) is None:
+            lock = _FILE_LOCKS[filename] = threading.Lock()
+    return lock
+
+
+def _find_lambda_repr(lambda_func, signature=_repr_cache.UNKNOWN) -> 'str | None':
+    code = lambda_func.__code__
+    index = _get_source_index(code.co_filename, lambda_func.__globals__, signature)
+    if index is None:
+        return None
+
+    source = index.get_lambda_source(code)
+    if not source:
+        return None
+    if (newline_pos := source.find('\n')) >= 0:
+        # multiline lambda is rather rarely used, but the \n in the middle makes repr ugly
+        source = source[:newline_pos] + '...'
+    return source
+
+
+_SOURCE_INDEXES = {}
+
+
+def _file_signature(filename) -> 'tuple[int, int] | None':
+    """Return the modification time and the size of `filename`, or None if it is not a regular file
+    (e.g. "<stdin>" or "<doctest ...>")."""
+    try:
+        stat = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_source_index(filename, module_globals=None, signature=_repr_cache.UNKNOWN) -> 'SourceIndex | None':
+    """Return the (cached) index of lambdas defined in `filename`, or None if its source is not available.
+    `signature` is the one of _file_signature(), if already known."""
+    if signature is _repr_cache.UNKNOWN:
+        signature = _file_signature(filename)
+    # the source of a pseudo-file might still be provided by linecache
+    if signature is not None:
+        index = _SOURCE_INDEXES.get(filename)
+        if index is not None and index.signature == signature:
+            return index
+
+    linecache.checkcache(filename)  # make sure linecache does not return outdated source
+    lines = linecache.getlines(filename, module_globals)
+    if not lines:
+        return None
+
+    try:
+        index = SourceIndex(lines, signature)
+    except (SyntaxError, ValueError):
+        # the source linecache has is not a valid code on its own (e.g. it has been edited since)
+        return None
+
+    # there is no way to tell whether the source of a pseudo-file has changed, so only real files are cached
+    if signature is not None:
+        _SOURCE_INDEXES[filename] = index
+    return index
+
+
+class SourceIndex:
+    """Positions of all lambdas in a source file.
+
+    The file is parsed once, and each ``ast.Lambda`` is recorded as a span of utf-8 byte offsets
+    (the unit of column information in both AST and code objects), sorted by its start.
+    Lookups by position are then done by bisection.
+    """
+
+    def __init__(self, lines, signature=None) -> None:
+        self.signature = signature
+        self.source = ''.join(lines)
+        self._source_bytes = self.source.encode()
+        # offsets of line starts, 1-indexed like line numbers (plus one past the last line)
+        self._line_offsets = [0, 0, *accumulate(len(line.encode()) for line in lines)]
+
+        nodes = _sorted_lambdas(ast.parse(self.source))
+        self._linenos = [node.lineno for node in nodes]
+        self._starts = [self._offset(node.lineno, node.col_offset) for node in nodes]
+        self._ends = [self._offset(node.end_lineno, node.end_col_offset) for node in nodes]
+
+        # spans are either nested or disjoint, so the enclosing lambda of each is found with a stack
+        self._parents = []
+        stack = []
+        for start, end in zip(self._starts, self._ends):
+            while stack and self._ends[stack[-1]] < end:
+                stack.pop()
+            self._parents.append(stack[-1] if stack else -1)
+            stack.append(len(self._parents) - 1)
+
+    def _offset(self, lineno, col_offset) -> int:
+        return self._line_offsets[lineno] + col_offset
+
+    def segment(self, i) -> str:
+        """Return the source of the *i*-th lambda."""
+        return self._source_bytes[self._starts[i]:self._ends[i]].decode()
+
+    def on_line(self, lineno) -> range:
+        """Return indices of lambdas starting at line *lineno*."""
+        if not 0 < lineno < len(self._line_offsets) - 1:
+            return range(0)
+        return range(
+            bisect_left(self._starts, self._line_offsets[lineno]),
+            bisect_left(self._starts, self._line_offsets[lineno + 1]),
+        )
+
+    def enclosing(self, start, end) -> 'int | None':
+        """Return index of the innermost lambda which starts before *start* and ends at or after *end*."""
+        i = bisect_left(self._starts, start) - 1
+        while i >= 0 and self._ends[i] < end:
+            i = self._parents[i]
+        return i if i >= 0 else None
+
+    def get_lambda_source(self, code) -> 'str | None':
+        # There are two ways to find the lambda node corresponding to the code object:
+        #   1. Use __code__.co_positions, which point to the lambda body, and take the lambda enclosing it
+        #      Pros: precise and cheap
+        #      Cons: available in Python 3.11+ only, positions of lambdas defined in assertions rewritten by
+        #            (older versions of) pytest cover the whole assert statement
+        #   2. Take lambdas starting at co_firstlineno, and find the one corresponding to the code
+        #      by compiling the whole source and comparing bytecode
+        #      Pros: works everywhere
+        #      Cons: compilation is slow, so it's done once per file, and only if a line has more than one lambda
+        #
+        # In case no solution is able to precisely locate the lambda definition, return None.
+
+        i = self._find_by_positions(code) if sys.version_info >= (3, 11) else None
+        if i is None:
+            i = self._find_by_code(code)
+        return None if i is None else self.segment(i)
+
+    def _find_by_positions(self, code) -> 'int | None':
+        # according to python data model, "column information is 0-indexed utf-8 byte offsets"
+        spans = [
+            (self._offset(lineno, col_offset), self._offset(end_lineno, end_col_offset))
+            for lineno, end_lineno, col_offset, end_col_offset in code.co_positions()
+            # some instructions have zeroed (or no) both col_offset and end_col_offset, those are filtered out
+            if col_offset or end_col_offset
+        ]
+        if not spans:
+            return None
+
+        # body starts after the lambda keyword, so a lambda starting at body start (e.g. a nested one) is not it
+        body_start, _ = min(spans)
+        body_end = max(end for _, end in spans)
+        i = self.enclosing(body_start, body_end)
+        # positions of rewritten assertions might point to the line other than co_firstlineno
+        if i is None or self._linenos[i] != code.co_firstlineno:
+            return None
+        return i
+
+    def _find_by_code(self, code) -> 'int | None':
+        candidates = self.on_line(code.co_firstlineno)
+
+        # _ENABLE_ONE_NODE_SHORT_PATH enables "short path": if there is only one lambda starting on the first line
+        # of the code, it is assumed that this is the function we are looking source code for.
+        # It is enabled by default, but omitted in tests to verify this assumption and bytecode comparison code.
+        if _ENABLE_ONE_NODE_SHORT_PATH and len(candidates) == 1:
+            return candidates[0]
+
+        matches = self._code_map.get(_code_key(code), ())
+        if on_line := [i for i in matches if i in candidates]:
+            # several matches on one line have the same code, so it does not matter which one is taken
+            return on_line[0]
+        # lambdas in assertions rewritten by (older versions of) pytest might have co_firstlineno of the assert
+        return matches[0] if len(matches) == 1 else None
+
+    # not locked by cached_property itself (since Python 3.12), but only computed with the lock of the file held
+    @cached_property
+    def _code_map(self) -> 'dict[tuple, list[int]]':
+        """Map keys of the lambdas' code objects (see :func:`_code_key`) to their indices."""
+
+        # The source is compiled as a whole, so that nested lambdas have the same free variables as at runtime
+        # (captured variables are loaded by LOAD_DEREF instead of LOAD_GLOBAL, so the bytecode would differ).
+        # To tell which node each of the compiled lambdas comes from, the nodes are relabeled: i-th lambda
+        # is moved to a unique line past the end of source, and its co_firstlineno then identifies it.
+        tree = ast.parse(self.source)
+        first_marker = len(self._line_offsets)
+        for i, node in enumerate(_sorted_lambdas(tree)):
+            node.lineno = node.end_lineno = first_marker + i
+            node.end_col_offset = max(node.col_offset, node.end_col_offset)  # keep the position range valid
+
+        code_map = {}
+        for code in _iter_nested_code(compile(tree, '<predeq>', 'exec', dont_inherit=True)):
+            if (i := code.co_firstlineno - first_marker) >= 0 and code.co_name == '<lambda>':
+                code_map.setdefault(_code_key(code), []).append(i)
+        return code_map
+
+
+_ENABLE_ONE_NODE_SHORT_PATH = True  # see SourceIndex._find_by_code() above
+
+
+def _iter_nested_code(code):
+    """Yield all code objects nested in `code` (functions, lambdas, classes, comprehensions), recursively."""
+    stack = [code]
+    while stack:
+        for const in stack.pop().co_consts:
+            if iscode(const):
+                yield const
+                stack.append(const)
+
+
+def _code_key(code):
+    """Return a hashable key identifying the function by its bytecode, names and constants, but not by positions."""
+
+    # co_code alone is not enough: e.g. `lambda x: x.a` and `lambda x: x.b` only differ in co_names,
+    # and constants are compared with their type because 1 == 1.0 == True
+    return (
+        code.co_code,
+        code.co_names,
+        code.co_varnames,
+        code.co_freevars,
+        tuple(_code_key(const) if iscode(const) else (type(const), const) for const in code.co_consts),
+    )
+
+
+def _sorted_lambdas(tree):
+    return sorted(_filter_instance(ast.Lambda, ast.walk(tree)), key=lambda node: (node.lineno, node.col_offset))
+
+
+def _filter_instance(class_or_tuple, iterable):
+    return (obj for obj in iterable if isinstance(obj, class_or_tuple))
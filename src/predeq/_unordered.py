@@ -0,0 +1,231 @@
+from collections.abc import Collection
+from itertools import compress
+
+from ._predeq import predeq
+
+__all__ = (
+    'contains_all',
+    'unordered',
+)
+
+
+def unordered(expected) -> predeq:
+    """Create an object which compares equal to a collection of items equal to the items of *expected*,
+    in any order.
+
+        >>> from predeq import instanceof
+        >>> [3, 'a', 1] == unordered([1, instanceof(str), instanceof(int)])
+        True
+        >>> [3, 'a', 'b'] == unordered([1, instanceof(str), instanceof(int)])
+        False
+
+    Each item of the collection must be equal to a different item of *expected*. Such an assignment is found
+    even if matching the items greedily would fail (above, ``3`` must not be assigned to ``1``),
+    with Hopcroft-Karp algorithm. Each item is compared with each item of *expected* at most once,
+    and plain values (such as numbers and strings), as well as dicts with such values, are looked up by
+    the values rather than compared with each item, so comparing thousands of items is fast.
+    """
+    return _Unordered(expected, complete=True)
+
+
+def contains_all(expected) -> predeq:
+    """Create an object which compares equal to a collection containing items equal to the items of *expected*,
+    and possibly others.
+
+        >>> from predeq import instanceof
+        >>> {'b', 'a', 1} == contains_all(['a', instanceof(str)])
+        True
+        >>> {'a', 1} == contains_all(['a', instanceof(str)])
+        False
+
+    Like :func:`unordered`, each item of *expected* must be equal to a different item of the collection.
+    """
+    return _Unordered(expected, complete=False)
+
+
+class _Unordered(predeq):
+    __slots__ = ('expected', 'complete')
+
+    def __init__(self, expected, complete: bool) -> None:
+        expected = list(expected)
+        super().__init__(lambda obj: _matches(obj, expected, complete))
+        self.expected = expected
+        self.complete = complete
+
+    def _get_default_repr(self) -> str:
+        name = unordered.__name__ if self.complete else contains_all.__name__
+        return f'{name}({self.expected!r})'
+
+
+def _matches(obj, expected: list, complete: bool) -> bool:
+    if not isinstance(obj, Collection) or isinstance(obj, (str, bytes, bytearray)):
+        return False
+    items = list(obj)
+    if len(items) != len(expected) if complete else len(items) < len(expected):
+        return False
+
+    adjacency = _ItemLookup(items).adjacency(expected)
+    return adjacency is not None and _maximum_matching(adjacency, len(items)) == len(expected)
+
+
+# types whose equal instances have equal hashes, and which are only equal to instances of these types
+_SCALAR_TYPES = frozenset({bool, bytes, complex, float, int, str, type(None)})
+# types which are not equal to instances of _SCALAR_TYPES, nor to dicts (except dicts themselves)
+_CONTAINER_TYPES = frozenset({frozenset, list, set, tuple})
+
+_MISSING = object()
+
+
+class _ItemLookup:
+    """Finds the items of a collection which are equal to the items of *expected*."""
+
+    def __init__(self, items: list) -> None:
+        self.items = items
+        self._by_value = None
+        self._by_field = {}
+
+    def adjacency(self, expected) -> 'list[list[int]] | None':
+        """Return the indices of items equal to each item of *expected*, or None if there are none for some."""
+        indices_of = {}  # id(item of expected) -> indices, each distinct object is compared with the items once
+        adjacency = []
+        for element in expected:
+            indices = indices_of.get(id(element))
+            if indices is None:
+                indices = indices_of[id(element)] = self.equal_to(element)
+                if not indices:
+                    return None
+            adjacency.append(indices)
+        return adjacency
+
+    def equal_to(self, element) -> 'list[int]':
+        items = self.items
+        if isinstance(element, predeq) and type(element).__eq__ is predeq.__eq__:
+            return list(compress(range(len(items)), element.match_many(items)))
+
+        if type(element) in _SCALAR_TYPES:
+            by_value, unknown = self._values()
+            # items found by the value are equal to it
+            return by_value.get(element, []) + [index for index in unknown if _equal(items[index], element)]
+
+        if type(element) is dict:
+            for key, value in element.items():
+                if type(value) in _SCALAR_TYPES:
+                    by_value, unknown = self._fields(key)
+                    candidates = by_value.get(value, []) + unknown
+                    return [index for index in candidates if _equal(items[index], element)]
+
+        return [index for index, item in enumerate(items) if _equal(item, element)]
+
+    def _values(self) -> 'tuple[dict, list[int]]':
+        """Return indices of items of _SCALAR_TYPES by their values, and of items which might be equal to them."""
+        if self._by_value is None:
+            by_value, unknown = {}, []
+            for index, item in enumerate(self.items):
+                item_type = type(item)
+                if item_type in _SCALAR_TYPES:
+                    by_value.setdefault(item, []).append(index)
+                elif item_type not in _CONTAINER_TYPES and item_type is not dict:
+                    unknown.append(index)
+            self._by_value = by_value, unknown
+        return self._by_value
+
+    def _fields(self, key) -> 'tuple[dict, list[int]]':
+        """Return indices of dicts by their values of _SCALAR_TYPES for *key*, and of items which might be
+        equal to dicts with the key otherwise."""
+        if (result := self._by_field.get(key)) is None:
+            by_value, unknown = {}, []
+            for index, item in enumerate(self.items):
+                item_type = type(item)
+                if item_type is dict:
+                    if (value := item.get(key, _MISSING)) is _MISSING:
+                        continue
+                    if type(value) in _SCALAR_TYPES:
+                        by_value.setdefault(value, []).append(index)
+                    else:
+                        unknown.append(index)
+                elif item_type not in _SCALAR_TYPES and item_type not in _CONTAINER_TYPES:
+                    unknown.append(index)
+            result = self._by_field[key] = by_value, unknown
+        return result
+
+
+def _equal(item, element) -> bool:
+    # identity implies equality in containers comparison too (e.g. for NaN)
+    return item is element or item == element
+
+
+def _maximum_matching(adjacency: 'list[list[int]]', right_size: int) -> int:
+    """Return the size of maximum matching in bipartite graph, where ``adjacency[left]`` lists the right
+    vertices adjacent to the left vertex (Hopcroft-Karp algorithm)."""
+    left_size = len(adjacency)
+    match_left = [-1] * left_size
+    match_right = [-1] * right_size
+
+    # a greedy matching first, which is often maximum already, matching the most constrained vertices first;
+    # adjacency lists are shared by equal items of expected, then each one continues where the previous stopped
+    next_free = {}
+    size = 0
+    for left in sorted(range(left_size), key=lambda left: len(adjacency[left])):
+        adjacent = adjacency[left]
+        position = next_free.get(id(adjacent), 0)
+        while position < len(adjacent) and match_right[adjacent[position]] != -1:
+            position += 1
+        if position < len(adjacent):
+            match_left[left] = adjacent[position]
+            match_right[adjacent[position]] = left
+            size += 1
+            position += 1
+        next_free[id(adjacent)] = position
+
+    while size < left_size:
+        # breadth-first search from free left vertices, layering the graph by length of alternating paths
+        layer = [-1] * left_size
+        queue = [left for left in range(left_size) if match_left[left] == -1]
+        for left in queue:
+            layer[left] = 0
+        found = False
+        for left in queue:  # extended while iterated
+            for right in adjacency[left]:
+                next_left = match_right[right]
+                if next_left == -1:
+                    found = True
+                elif layer[next_left] == -1:
+                    layer[next_left] = layer[left] + 1
+                    queue.append(next_left)
+        if not found:
+            break
+
+        # depth-first search of vertex-disjoint shortest augmenting paths along the layers (iterative, since
+        # the paths might be longer than the recursion limit)
+        positions = [0] * left_size
+        for root in range(left_size):
+            if match_left[root] != -1:
+                continue
+            path = [root]  # left vertices
+            via = []  # right vertices between them
+            while path:
+                left = path[-1]
+                adjacent = adjacency[left]
+                while positions[left] < len(adjacent):
+                    right = adjacent[positions[left]]
+                    positions[left] += 1
+                    next_left = match_right[right]
+                    if next_left == -1:
+                        via.append(right)
+                        for path_left, path_right in zip(path, via):
+                            match_left[path_left] = path_right
+                            match_right[path_right] = path_left
+                        size += 1
+                        path = []
+                        break
+                    if layer[next_left] == layer[left] + 1:
+                        via.append(right)
+                        path.append(next_left)
+                        break
+                else:
+                    # no augmenting path through this vertex in this phase
+                    layer[left] = -1
+                    path.pop()
+                    if via:
+                        via.pop()
+    return size
@@ -0,0 +1,188 @@
+"""`Hypothesis <https://hypothesis.readthedocs.io>`_ strategies generating objects equal to :class:`~predeq.predeq`
+objects, e.g. to test code which accepts what a matcher describes:
+
+    >>> from hypothesis import given
+    >>> from predeq import instanceof, matches_re, template
+    >>> from predeq.hypothesis import from_matcher
+    >>> USER = template({'id': instanceof(int), 'name': matches_re(r'[a-z]+$')})
+    >>> @given(from_matcher(USER))
+    ... def test_user(user):
+    ...     assert user == USER
+    >>> test_user()
+
+Rather than generating arbitrary objects and filtering out the ones not equal to the matcher (as with
+``.filter()`` or :func:`~hypothesis.assume`), which rejects most of them, the strategies are built from what
+the recipes are made of: :func:`~predeq.instanceof` is mapped to :func:`~hypothesis.strategies.from_type`,
+:func:`~predeq.matches_re` to :func:`~hypothesis.strategies.from_regex`, :func:`~predeq.template` to
+the strategies of its items, and so on. Only the objects which cannot be looked into (such as predeq objects
+with arbitrary predicates, or the other operands of :func:`~predeq.all_of`) are filtered.
+
+This module requires hypothesis, which is not a dependency of predeq.
+"""
+
+import math
+from types import SimpleNamespace
+
+from hypothesis import strategies as st
+
+from ._attrs import _HasAttrs
+from ._close_to import _CloseTo, _numpy
+from ._combinators import _AllOf, _AnyOf, _MergedMatchesRe, _Not, _predicate_of
+from ._each import _Each
+from ._predeq import predeq
+from ._template import _Template
+from ._unordered import _Unordered
+from .recipes import ANY, NOT_NONE, _Exception, _InstanceOf, _MatchesAnyRe, _MatchesRe
+
+__all__ = (
+    'anything',
+    'from_matcher',
+)
+
+
+def anything(none: bool = True) -> st.SearchStrategy:
+    """Return a strategy generating objects of common types: numbers, strings, bytes, and lists and dicts of them
+    (and None if *none* is true). It is used for :data:`~predeq.ANY`, and for filtering by opaque predicates."""
+    scalars = st.booleans() | st.integers() | st.floats() | st.text() | st.binary()
+    if none:
+        scalars = st.none() | scalars
+    return st.recursive(scalars, lambda children: st.lists(children) | st.dictionaries(st.text(), children),
+                        max_leaves=5)
+
+
+def from_matcher(expected) -> st.SearchStrategy:
+    """Return a strategy generating objects equal to *expected*, a :class:`~predeq.predeq` object,
+    or a structure of dicts, lists and tuples with them (like the ones :func:`~predeq.template` takes).
+
+        >>> from hypothesis import find
+        >>> from predeq import instanceof, matches_re
+        >>> order = {'id': instanceof(int), 'code': matches_re(r'[A-Z]{3}-\\d+$')}
+        >>> find(from_matcher(order), lambda obj: obj['id'] > 9)  # the simplest example
+        {'id': 10, 'code': 'AAA-0'}
+
+    """
+    if isinstance(expected, _Template):
+        return from_matcher(expected.expected)
+    if type(expected) is dict:
+        return st.fixed_dictionaries({key: from_matcher(value) for key, value in expected.items()})
+    if type(expected) is list:
+        return st.tuples(*map(from_matcher, expected)).map(list)
+    if type(expected) is tuple:
+        return st.tuples(*map(from_matcher, expected))
+    if not isinstance(expected, predeq):
+        return st.just(expected)
+    return _from_predeq(expected)
+
+
+def _from_predeq(matcher: predeq) -> st.SearchStrategy:
+    if matcher is ANY:
+        return anything()
+    if matcher is NOT_NONE:
+        return anything(none=False)
+    if isinstance(matcher, _AnyOf):
+        return st.one_of(*map(from_matcher, matcher.operands))
+    if isinstance(matcher, _AllOf):
+        # the most specific operand is generated, and the others are checked
+        first = min(matcher.operands, key=_specificity)
+        return _checked(from_matcher(first), matcher)
+    if isinstance(matcher, _Not):
+        return _checked(anything(), matcher)
+    if isinstance(matcher, _Each):
+        return st.lists(from_matcher(matcher.matcher), min_size=matcher.min_len, max_size=matcher.max_len)
+    if isinstance(matcher, _Unordered):
+        return _from_unordered(matcher)
+
+    # the strategies below generate objects which are expected to match, but e.g. from_type() or from_regex()
+    # might generate ones which do not in corner cases, so they are checked too
+    if isinstance(matcher, _InstanceOf):
+        return _checked(st.one_of(*map(st.from_type, _flatten_classes(matcher.classes))), matcher)
+    if isinstance(matcher, _MergedMatchesRe):
+        return st.one_of(*map(from_matcher, matcher.parts))
+    if isinstance(matcher, _MatchesRe):
+        return _checked(_from_pattern(matcher.pattern), matcher)
+    if isinstance(matcher, _MatchesAnyRe):
+        return _checked(st.one_of(*map(_from_pattern, matcher.patterns)), matcher)
+    if isinstance(matcher, _Exception):
+        exc = matcher.exc
+        return _checked(st.builds(type(exc), *map(st.just, exc.args)), matcher)
+    if isinstance(matcher, _CloseTo):
+        return _checked(_from_close_to(matcher), matcher)
+    if isinstance(matcher, _HasAttrs):
+        # fields are arguments of the constructor (and builds() infers the others from the type hints)
+        strategies = {name: from_matcher(attr_matcher) for name, attr_matcher in matcher.matchers.items()}
+        return _checked(st.builds(matcher.cls or SimpleNamespace, **strategies), matcher)
+
+    # the predicate cannot be looked into
+    return _checked(anything(), matcher)
+
+
+def _checked(strategy: st.SearchStrategy, matcher: predeq) -> st.SearchStrategy:
+    return strategy.filter(_predicate_of(matcher))
+
+
+def _specificity(matcher: predeq) -> int:
+    """Return how few objects of all *matcher* might be equal to, roughly, to generate the operand with the least."""
+    if isinstance(matcher, (_Exception, _CloseTo)):
+        return 0
+    if isinstance(matcher, (_MatchesRe, _MatchesAnyRe, _Template, _Each, _Unordered, _HasAttrs)):
+        return 1
+    if isinstance(matcher, (_InstanceOf, _AnyOf)):
+        return 2
+    if matcher is ANY or matcher is NOT_NONE:
+        return 4
+    # arbitrary predicates, negations
+    return 3
+
+
+def _flatten_classes(classes):
+    # isinstance() accepts nested tuples of classes
+    for klass in classes:
+        if isinstance(klass, tuple):
+            yield from _flatten_classes(klass)
+        else:
+            yield klass
+
+
+def _from_pattern(pattern: 're.Pattern') -> st.SearchStrategy:
+    import re
+
+    if not isinstance(pattern.pattern, str):
+        # bytes patterns do not match strings
+        return st.nothing()
+    try:
+        # matches_re() matches at the beginning of the string (re.match), while from_regex() might generate
+        # strings with a match anywhere (re.search)
+        anchored = re.compile(rf'\A(?:{pattern.pattern})', pattern.flags)
+    except re.error:
+        # e.g. global inline flags, which must be at the start, they are checked when filtering then
+        anchored = pattern
+    return st.from_regex(anchored)
+
+
+def _from_unordered(matcher: _Unordered) -> st.SearchStrategy:
+    items = st.tuples(*map(from_matcher, matcher.expected)).map(list)
+    if not matcher.complete:
+        items = st.tuples(items, st.lists(anything(), max_size=3)).map(lambda lists: lists[0] + lists[1])
+    return items.flatmap(st.permutations)
+
+
+def _from_close_to(matcher: _CloseTo) -> st.SearchStrategy:
+    if matcher._values is None and matcher._array is None:
+        return _close_floats(matcher.expected, matcher.rel, matcher.abs)
+    if matcher._values is not None:
+        return st.tuples(*(_close_floats(value, matcher.rel, matcher.abs) for value in matcher._values)).map(list)
+    # a multidimensional numpy array
+    expected = matcher._array
+    numpy = _numpy()
+    values = st.tuples(*(_close_floats(value, matcher.rel, matcher.abs) for value in expected.flat))
+    return values.map(lambda values: numpy.array(values).reshape(expected.shape))
+
+
+def _close_floats(expected, rel: float, abs: float) -> st.SearchStrategy:
+    expected = float(expected)
+    if math.isnan(expected):
+        return st.nothing()
+    if math.isinf(expected):
+        return st.just(expected)
+    tolerance = max(rel * math.fabs(expected), abs)
+    return st.floats(expected - tolerance, expected + tolerance, allow_nan=False)
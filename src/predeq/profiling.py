@@ -0,0 +1,248 @@
+"""Opt-in instrumentation of comparisons with :class:`~predeq.predeq` objects.
+
+While profiling is enabled, each comparison with a predeq object is counted and timed, per object:
+
+    >>> from predeq import instanceof
+    >>> from predeq.profiling import profile
+    >>> with profile() as results:
+    ...     _ = [1, 'a', 2] == [instanceof(int)] * 3
+    >>> [(stats['matcher'], stats['calls'], stats['true'], stats['false']) for stats in results.stats()]
+    [('instanceof(int)', 2, 1, 1)]
+
+Profiling is enabled by :func:`profile` context manager, by :func:`enable`, by ``--predeq-profile`` pytest option
+(see :mod:`predeq.pytest_plugin`), or by setting ``PREDEQ_PROFILE`` environment variable (to ``1``, or to a path
+of JSON file to write the results to when the process exits).
+
+Only the comparisons (``==`` and ``!=``) are instrumented, and the objects evaluated directly by other ones
+(e.g. operands of :func:`~predeq.all_of`, or leaves of :func:`~predeq.template`) are accounted to them.
+While profiling is disabled, there is no overhead at all, since ``predeq.__eq__`` (and ``__eq__`` of the subclasses
+overriding it, e.g. :class:`~predeq.apredeq`, including those defined while profiling is enabled) is replaced only
+when enabled. The comparisons in all threads are recorded.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+from ._predeq import predeq
+
+__all__ = (
+    'Profile',
+    'disable',
+    'enable',
+    'is_enabled',
+    'profile',
+)
+
+_ORIGINAL_EQ = predeq.__eq__
+
+_active = None
+_overridden = {}  # subclass of predeq -> its own __eq__, replaced while profiling
+
+
+class Profile:
+    """Results of profiling."""
+
+    def __init__(self) -> None:
+        self._records = {}  # id(matcher) -> _Record
+        self._lock = threading.Lock()  # held while updating or reading the records
+
+    def stats(self) -> 'list[dict]':
+        """Return statistics of the compared objects, by their representation and definition site (the location
+        of predicate function, unless it is a recipe), ordered by the total time of comparisons."""
+        with self._lock:
+            records = [record.copy() for record in self._records.values()]
+        merged = {}
+        for record in records:
+            key = (repr(record.matcher), _definition_site(record.matcher))
+            if (stats := merged.get(key)) is None:
+                merged[key] = stats = {
+                    'matcher': key[0],
+                    'site': key[1],
+                    'calls': 0,
+                    'true': 0,
+                    'false': 0,
+                    'errors': 0,
+                    'total_ns': 0,
+                    'max_ns': 0,
+                }
+            stats['calls'] += record.true + record.false + record.errors
+            stats['true'] += record.true
+            stats['false'] += record.false
+            stats['errors'] += record.errors
+            stats['total_ns'] += record.total_ns
+            stats['max_ns'] = max(stats['max_ns'], record.max_ns)
+        return sorted(merged.values(), key=lambda stats: stats['total_ns'], reverse=True)
+
+    def to_json(self, **kwargs) -> str:
+        """Return :meth:`stats` as JSON, *kwargs* are passed to :func:`json.dumps`."""
+        return json.dumps({'matchers': self.stats()}, **kwargs)
+
+    def summary(self, limit: 'int | None' = 10) -> str:
+        """Return a table of *limit* objects which took the longest."""
+        stats = self.stats()
+        lines = [f'{"calls":>9} {"true":>9} {"false":>9} {"total ms":>10} {"max us":>10}  matcher']
+        for entry in stats[:limit]:
+            site = f' ({entry["site"]})' if entry['site'] else ''
+            lines.append(
+                f'{entry["calls"]:>9} {entry["true"]:>9} {entry["false"]:>9} '
+                f'{entry["total_ns"] / 1e6:>10.3f} {entry["max_ns"] / 1e3:>10.1f}  {entry["matcher"]}{site}'
+            )
+        if limit is not None and len(stats) > limit:
+            lines.append(f'... and {len(stats) - limit} more')
+        return '\n'.join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def _record(self, matcher) -> '_Record':
+        """Return the record of *matcher*. Called with the lock held."""
+        records = self._records
+        if (record := records.get(id(matcher))) is None:
+            record = records[id(matcher)] = _Record(matcher)
+        return record
+
+
+class _Record:
+    __slots__ = ('matcher', 'true', 'false', 'errors', 'total_ns', 'max_ns')
+
+    def __init__(self, matcher) -> None:
+        self.matcher = matcher  # kept alive, so that its id is not reused
+        self.true = self.false = self.errors = self.total_ns = self.max_ns = 0
+
+    def copy(self) -> '_Record':
+        copy = _Record(self.matcher)
+        copy.true, copy.false, copy.errors, copy.total_ns, copy.max_ns = (
+            self.true, self.false, self.errors, self.total_ns, self.max_ns
+        )
+        return copy
+
+
+def _profiled_eq(self, other) -> bool:
+    return _profiled_call(self, self.pred, other)
+
+
+def _profiled_override(eq):
+    """Return a replacement of *eq*, ``__eq__`` of a subclass, which profiles it like :func:`_profiled_eq`."""
+    def __eq__(self, other) -> bool:
+        return _profiled_call(self, eq.__get__(self), other)
+    return __eq__
+
+
+def _profiled_call(self, func, other) -> bool:
+    results = _active
+    if results is None:
+        # disabled by another thread meanwhile
+        return not not func(other)
+
+    start = perf_counter_ns()
+    try:
+        result = not not func(other)
+    except BaseException:
+        with results._lock:
+            results._record(self).errors += 1
+        raise
+    elapsed = perf_counter_ns() - start
+
+    # the counters are updated by all threads
+    with results._lock:
+        record = results._record(self)
+        if result:
+            record.true += 1
+        else:
+            record.false += 1
+        record.total_ns += elapsed
+        if elapsed > record.max_ns:
+            record.max_ns = elapsed
+    return result
+
+
+def enable(results: 'Profile | None' = None) -> Profile:
+    """Start profiling into *results* (or new :class:`Profile`), and return it."""
+    global _active
+    _active = Profile() if results is None else results
+    # != calls __eq__ too
+    predeq.__eq__ = _profiled_eq
+    for cls in _subclasses(predeq):
+        _patch(cls)
+    # and the subclasses defined later, e.g. when enabled by PREDEQ_PROFILE environment variable
+    predeq.__init_subclass__ = classmethod(_init_subclass)
+    return _active
+
+
+def disable() -> 'Profile | None':
+    """Stop profiling, and return the results."""
+    global _active
+    results, _active = _active, None
+    predeq.__eq__ = _ORIGINAL_EQ
+    if '__init_subclass__' in vars(predeq):
+        del predeq.__init_subclass__
+    for cls, eq in _overridden.items():
+        cls.__eq__ = eq
+    _overridden.clear()
+    return results
+
+
+def is_enabled() -> bool:
+    return _active is not None
+
+
+@contextmanager
+def profile():
+    """Profile comparisons within the ``with`` block, return :class:`Profile` with the results."""
+    previous = _active
+    results = enable()
+    try:
+        yield results
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+
+
+def _patch(cls: type) -> None:
+    """Replace ``__eq__`` of *cls*, a subclass of predeq, with a profiled one if it overrides it."""
+    if '__eq__' in vars(cls) and cls not in _overridden:
+        _overridden[cls] = vars(cls)['__eq__']
+        cls.__eq__ = _profiled_override(_overridden[cls])
+
+
+def _init_subclass(cls, **kwargs) -> None:
+    super(predeq, cls).__init_subclass__(**kwargs)
+    _patch(cls)
+
+
+def _subclasses(cls: type) -> 'list[type]':
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses += [subclass, *_subclasses(subclass)]
+    return subclasses
+
+
+def _definition_site(matcher) -> 'str | None':
+    predicate = matcher._predicate()
+    code = getattr(predicate, '__code__', None)
+    # functions of predeq itself (e.g. closures of recipes) are told apart by the representation
+    if code is None or (getattr(predicate, '__module__', None) or '').partition('.')[0] == 'predeq':
+        return None
+    return f'{code.co_filename}:{code.co_firstlineno}'
+
+
+def _enable_from_environment() -> None:
+    """Enable profiling if requested by ``PREDEQ_PROFILE`` environment variable."""
+    value = os.environ.get('PREDEQ_PROFILE')
+    if not value:
+        return
+    results = enable()
+    if value != '1':
+        import atexit
+
+        def write():
+            with open(value, 'w', encoding='utf-8') as file:
+                file.write(results.to_json(indent=2))
+
+        atexit.register(write)
@@ -0,0 +1,90 @@
+"""Pytest plugin of predeq, registered automatically when predeq is installed.
+
+Options:
+
+``--predeq-repr-cache`` (or ``predeq_repr_cache = true`` in the configuration file)
+    Store the sources of lambdas shown in representations of :class:`~predeq.predeq` objects in pytest cache
+    directory, so that they are not searched for again in subsequent runs and in other pytest-xdist workers.
+    Set ``PREDEQ_REPR_CACHE`` environment variable to use another directory (the option is then not needed).
+
+``--predeq-profile[=PATH]``
+    Profile comparisons with predeq objects (see :mod:`predeq.profiling`), and show the ones which took
+    the longest in the terminal summary. If *PATH* is given, write all results to it as JSON, too.
+
+Failed assertions comparing structures which hold predeq objects (e.g. ``assert payload == template(...)``)
+are explained by the paths which do not match, rather than by a diff of their representations, which would
+show (and find the sources of lambdas of) all predeq objects, including the matching ones.
+Use ``-vv`` to show all mismatching paths, rather than the first ones.
+"""
+
+import pytest
+
+from . import _repr_cache, profiling
+
+_enabled_key = pytest.StashKey[bool]()
+_profile_key = pytest.StashKey[profiling.Profile]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('predeq')
+    group.addoption(
+        '--predeq-repr-cache',
+        action='store_true',
+        default=None,
+        help='cache sources of lambdas shown in predeq representations between runs and workers',
+    )
+    group.addoption(
+        '--predeq-profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='PATH',
+        help='profile comparisons with predeq objects, and optionally write the results to PATH as JSON',
+    )
+    parser.addini(
+        'predeq_repr_cache',
+        type='bool',
+        default=False,
+        help='cache sources of lambdas shown in predeq representations between runs and workers',
+    )
+
+
+def pytest_configure(config):
+    enabled = config.getoption('predeq_repr_cache') or config.getini('predeq_repr_cache')
+    cache = getattr(config, 'cache', None)  # not available with -p no:cacheprovider
+    if enabled and cache is not None and not _repr_cache.is_enabled():
+        _repr_cache.enable(cache.mkdir('predeq-repr'))
+        config.stash[_enabled_key] = True
+
+    if config.getoption('predeq_profile') is not None and not profiling.is_enabled():
+        config.stash[_profile_key] = profiling.enable()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if (results := config.stash.get(_profile_key, None)) is not None:
+        terminalreporter.write_sep('=', 'predeq profile')
+        terminalreporter.write_line(results.summary())
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_assertrepr_compare(config, op, left, right):
+    if op != '==':
+        return None
+    from ._diff import explain  # imported only when an assertion fails
+
+    try:
+        return explain(left, right, verbose=config.getoption('verbose') > 1)
+    except Exception:
+        # e.g. a custom __eq__ raising, the assertion is explained by pytest as usual then
+        return None
+
+
+def pytest_unconfigure(config):
+    if config.stash.get(_enabled_key, False):
+        _repr_cache.disable()
+
+    if (results := config.stash.get(_profile_key, None)) is not None:
+        profiling.disable()
+        if path := config.getoption('predeq_profile'):
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(results.to_json(indent=2))
@@ -1,32 +1,184 @@
-import re
+import sys
+from _thread import allocate_lock  # threading is not imported by `import predeq` otherwise
+from abc import ABCMeta
+from array import array
+from collections import OrderedDict
 
-from ._predeq import predeq
+from ._predeq import _InstanceDoc, predeq
 
 __all__ = (
     'ANY',
     'NOT_NONE',
     'exception',
     'instanceof',
+    'matches_any_re',
     'matches_re',
+    'recipe_cache',
 )
 
+# Recipes taking arguments return instances of predeq subclasses, which keep the arguments for introspection
+# (e.g. to inline the checks into compiled templates). The instances are shared by calls with equal arguments
+# (see RecipeCache), so they are immutable.
+
+
+class _Constant(predeq):
+    """Type of the recipes without arguments, which are pickled by reference, to be the same objects."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, predicate) -> None:
+        super().__init__(predicate, repr=f'<{name}>')
+        self.name = name
+
+    def __reduce__(self) -> str:
+        return self.name
+
+
+_Constant.__doc__ = _InstanceDoc(_Constant.__doc__, predeq._doc)
+
 # Assign to __doc__ of module attributes below for nicer help(),
 # and for sphinx to find the documentation of these imported in __init__.
 # See https://github.com/sphinx-doc/sphinx/issues/6495
 
-
-ANY = predeq(lambda _: True, repr='<ANY>')
+ANY = _Constant('ANY', lambda _: True)
 ANY.__doc__ = \
     """
     An object which compares equal to any object.
     Semantically equivalent to :external:py:data:`unittest.mock.ANY`, but implemented with :func:`predeq`.
     """
 
-NOT_NONE = predeq(lambda obj: obj is not None, repr='<NOT_NONE>')
+NOT_NONE = _Constant('NOT_NONE', lambda obj: obj is not None)
 NOT_NONE.__doc__ = \
     """An object which compares equal to any object except None."""
 
 
+class RecipeCache:
+    """Cache of objects created by recipes taking arguments, so that calls with equal arguments return
+    the same object, rather than creating (and e.g. compiling a regular expression) again.
+
+        >>> from predeq import instanceof, recipe_cache
+        >>> instanceof(int) is instanceof(int)
+        True
+
+    There is a single instance, :data:`recipe_cache`. It keeps *maxsize* most recently used objects
+    (or any number if it is None, or none if it is 0). If *weak* is true, objects are kept in the cache
+    only while they are referenced elsewhere, too.
+
+    The cache is thread-safe (also in free-threaded builds): threads creating an object for the same arguments
+    at once get the same object, and the statistics count each call.
+    """
+
+    def __init__(self, maxsize: 'int | None' = 4096, weak: bool = False) -> None:
+        self._entries = OrderedDict()
+        self._lock = allocate_lock()
+        self.configure(maxsize, weak)
+
+    def configure(self, maxsize: 'int | None' = 4096, weak: bool = False) -> None:
+        """Set the parameters of the cache, and clear it."""
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be non-negative or None')
+        if weak:
+            # not imported at module level to keep `import predeq` fast
+            from weakref import ref
+            self._ref = ref
+        with self._lock:
+            self.maxsize = maxsize
+            self.weak = weak
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """Return the parameters and statistics of the cache.
+
+            >>> recipe_cache.clear()
+            >>> _ = instanceof(int), instanceof(int), instanceof(str)
+            >>> recipe_cache.info()
+            {'hits': 1, 'misses': 2, 'maxsize': 4096, 'currsize': 2, 'weak': False}
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'maxsize': self.maxsize,
+                'currsize': len(self._entries),
+                'weak': self.weak,
+            }
+
+    def clear(self) -> None:
+        """Remove all objects from the cache, and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def _get(self, key, cls, *args):
+        """Return a cached object for *key*, or create it with ``cls(*args)``."""
+        entries = self._entries
+        with self._lock:
+            try:
+                obj = self._lookup(key)
+            except TypeError:
+                # unhashable arguments
+                self.misses += 1
+                cacheable = False
+            else:
+                if obj is not None:
+                    self.hits += 1
+                    entries.move_to_end(key)
+                    return obj
+                self.misses += 1
+                cacheable = self.maxsize != 0
+
+        # created without the lock held, since it might take long (e.g. compiling a regular expression),
+        # or create other objects (e.g. instanceof() of the exception type)
+        obj = cls(*args)
+        if not cacheable:
+            return obj
+        with self._lock:
+            if (existing := self._lookup(key)) is not None:
+                # created by another thread meanwhile, and the objects must be shared
+                return existing
+            entries[key] = self._ref(obj, self._remover(key)) if self.weak else obj
+            if self.maxsize is not None and len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return obj
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        return entry() if entry is not None and self.weak else entry
+
+    def _remover(self, key):
+        def remove(weak_ref, entries=self._entries):
+            # not locked, since it might be called by the garbage collector while the lock is held by the same thread;
+            # the entry might have been replaced by a new object meanwhile
+            if entries.get(key) is weak_ref:
+                entries.pop(key, None)
+        return remove
+
+
+recipe_cache = RecipeCache()
+
+
+class _Recipe(predeq):
+    """Base class of objects created by recipes taking arguments, which are immutable, since they are shared."""
+
+    __slots__ = ()
+
+    def __init__(self, predicate, repr: str) -> None:
+        _assign(self, 'pred', predicate)
+        _assign(self, 'repr', repr)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f'cannot assign {name!r} of {type(self).__name__} object, which is shared')
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError(f'cannot delete {name!r} of {type(self).__name__} object, which is shared')
+
+
+# assigns attributes of _Recipe objects when initializing them
+_assign = object.__setattr__
+
+
 def exception(exc: BaseException) -> predeq:
     """Create an object which compares equal to an exception of the same class (or its subclass) with the same args.
 
@@ -36,10 +188,55 @@ def exception(exc: BaseException) -> predeq:
         True
 
     """
-    return predeq(
-        lambda obj: isinstance(obj, type(exc)) and obj.args == exc.args,
-        repr=f'{exception.__name__}({exc!r})',
-    )
+    # exceptions are hashed by identity, so they are keyed by what is compared (and the representation,
+    # since e.g. ((1,),) == ((1.0,),), but the representations differ)
+    return recipe_cache._get((_Exception, type(exc), exc.args, repr(exc)), _Exception, exc)
+
+
+def _first_mismatch_in_bulk(self, iterable) -> 'int | None':
+    """Implementation of :meth:`predeq.first_mismatch` for recipes whose :meth:`predeq.match_many` is faster
+    for all objects than the default implementation of ``first_mismatch`` is for few."""
+    mask = self._match_many(iterable)
+    try:
+        return mask.index(False)
+    except ValueError:
+        return None
+
+
+class _Exception(_Recipe):
+    __slots__ = ('exc',)
+
+    def __init__(self, exc: BaseException) -> None:
+        # the object might be cached for long
+        exc = _without_traceback(exc)
+        super().__init__(
+            lambda obj: isinstance(obj, type(exc)) and obj.args == exc.args,
+            repr=f'{exception.__name__}({exc!r})',
+        )
+        _assign(self, 'exc', exc)
+
+    def __reduce__(self):
+        return exception, (self.exc,)
+
+
+def _without_traceback(exc: BaseException) -> BaseException:
+    """Return *exc*, or a copy of it with the same class and args if it has a traceback or chained exceptions,
+    which keep the frames (and their locals) alive."""
+    if exc.__traceback__ is None and exc.__context__ is None and exc.__cause__ is None:
+        return exc
+    cls = type(exc)
+    # not copy.copy(), which calls the constructor with the args, and e.g. a message built by it would be built again
+    try:
+        copy = cls.__new__(cls)
+    except TypeError:
+        try:
+            copy = cls.__new__(cls, *exc.args)
+        except TypeError:
+            return exc
+    copy.args = exc.args
+    if (attributes := getattr(exc, '__dict__', None)) is not None:
+        copy.__dict__.update(attributes)
+    return copy
 
 
 def instanceof(*classes) -> predeq:
@@ -57,12 +254,97 @@ def instanceof(*classes) -> predeq:
         False
 
     """
-    return predeq(
-        lambda obj: isinstance(obj, classes),
-        repr=f'{instanceof.__name__}({", ".join(map(_repr_class, classes))})'
+    return recipe_cache._get((_InstanceOf, classes), _InstanceOf, classes)
+
+
+class _InstanceOf(_Recipe):
+    __slots__ = ('classes',)
+
+    def __init__(self, classes: tuple) -> None:
+        super().__init__(
+            lambda obj: isinstance(obj, classes),
+            repr=f'{instanceof.__name__}({", ".join(map(_repr_class, classes))})',
+        )
+        _assign(self, 'classes', classes)
+
+    def __reduce__(self):
+        # the predicate cannot be pickled, and the attributes cannot be assigned when unpickling
+        return instanceof, self.classes
+
+    def _match_many(self, iterable) -> 'list[bool]':
+        classes = self.classes
+        if not all(map(_has_type_based_instancecheck, classes)):
+            # e.g. typing constructs or custom metaclasses, which might check the instance itself
+            return super()._match_many(iterable)
+
+        # all items of arrays (e.g. array.array, bytes, 1-D numpy arrays) are of the same type
+        if (item_type := _array_item_type(iterable)) is not None:
+            return [issubclass(item_type, classes)] * len(iterable)
+
+        # check each distinct type only once
+        items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+        types = list(map(type, items))
+        is_subclass = {item_type: issubclass(item_type, classes) for item_type in set(types)}
+        mask = list(map(is_subclass.__getitem__, types))
+        # isinstance() also checks __class__, which might differ from type() (e.g. for mocks with spec)
+        recheck = {item_type for item_type, matches in is_subclass.items() if not matches and _spoofs_class(item_type)}
+        if recheck:
+            for index, item_type in enumerate(types):
+                if item_type in recheck:
+                    mask[index] = isinstance(items[index], classes)
+        return mask
+
+    _first_mismatch = _first_mismatch_in_bulk
+
+
+def _has_type_based_instancecheck(klass) -> bool:
+    """Return True if isinstance(obj, klass) only depends on type(obj) and obj.__class__."""
+    return isinstance(klass, type) and type(klass).__instancecheck__ in (
+        type.__instancecheck__,
+        ABCMeta.__instancecheck__,
     )
 
 
+def _spoofs_class(klass) -> bool:
+    """Return True if instances of *klass* might have __class__ other than *klass*.
+
+    Errs on the side of True: only built-in types and classes which do not override
+    __class__ nor __getattribute__ are known not to.
+    """
+    for base in klass.__mro__[:-1]:  # except object
+        namespace = vars(base)
+        if '__class__' in namespace or ('__getattribute__' in namespace and base.__module__ != 'builtins'):
+            return True
+    return False
+
+
+# item types of array.array and memoryview formats (struct module syntax), see also _array_item_type()
+_FORMAT_ITEM_TYPES = {
+    **dict.fromkeys('bBhHiIlLqQnN', int),
+    **dict.fromkeys('efd', float),
+    **dict.fromkeys('uw', str),
+    '?': bool,
+}
+
+
+def _array_item_type(iterable) -> 'type | None':
+    """Return the type of all items of *iterable*, if it is an array of primitive types, or None otherwise."""
+    if isinstance(iterable, (bytes, bytearray)):
+        return int
+    if isinstance(iterable, memoryview):
+        return _FORMAT_ITEM_TYPES.get(iterable.format) if iterable.ndim == 1 else None
+    if isinstance(iterable, array):
+        return _FORMAT_ITEM_TYPES.get(iterable.typecode)
+
+    # numpy arrays yield scalars of the dtype's type (unless its dtype is object), but e.g. pandas Series,
+    # which have a dtype too, yield Python objects, and so do subclasses like masked arrays (for masked items);
+    # numpy is not imported to detect them
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and type(iterable) is numpy.ndarray and iterable.ndim == 1 and not iterable.dtype.hasobject:
+        return iterable.dtype.type
+    return None
+
+
 def _repr_class(klass):
     return klass.__name__ if isinstance(klass, type) else repr(klass)
 
@@ -97,8 +379,157 @@ def matches_re(regex: 'str | re.Pattern') -> predeq:
         False
 
     """
-    pattern = re.compile(regex)
-    return predeq(
-        lambda obj: isinstance(obj, str) and pattern.match(obj) is not None,
-        repr=f'{matches_re.__name__}({pattern.pattern!r})',
-    )
+    return recipe_cache._get((_MatchesRe, regex), _compile_matches_re, regex)
+
+
+def _compile_matches_re(regex) -> '_MatchesRe':
+    import re  # not imported at module level to keep `import predeq` fast
+
+    return _MatchesRe(re.compile(regex))
+
+
+_DEDUPLICATION_SAMPLE = 1000
+
+
+class _MatchesRe(_Recipe):
+    __slots__ = ('pattern',)
+
+    def __init__(self, pattern: 're.Pattern', repr: 'str | None' = None) -> None:
+        super().__init__(
+            lambda obj: isinstance(obj, str) and pattern.match(obj) is not None,
+            repr=f'{matches_re.__name__}({pattern.pattern!r})' if repr is None else repr,
+        )
+        _assign(self, 'pattern', pattern)
+
+    def __reduce__(self):
+        return matches_re, (self.pattern,)
+
+    def _match_many(self, iterable) -> 'list[bool]':
+        items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+        if not set(map(type, items)) <= {str}:
+            return super()._match_many(items)
+
+        return _match_strings(self.pattern.match, items)
+
+    _first_mismatch = _first_mismatch_in_bulk
+
+
+def _match_strings(match, items: 'list[str]') -> 'list[bool]':
+    """Return whether *match* returns a truthy value for each of *items*."""
+    # collections of strings often have repeated values (e.g. statuses), then each one is matched once,
+    # but deduplicating unique strings is slower than matching them, so decide by a sample
+    sample = items[:_DEDUPLICATION_SAMPLE]
+    if len(set(sample)) > len(sample) // 2:
+        return list(map(bool, map(match, items)))
+
+    distinct = dict.fromkeys(items)
+    matches = dict(zip(distinct, map(bool, map(match, distinct))))
+    return list(map(matches.__getitem__, items))
+
+
+def matches_any_re(*regexes: 'str | re.Pattern') -> predeq:
+    """Create an object which compares equal to strings matching any of the regular expression patterns,
+    like ``matches_re(regex1) | matches_re(regex2) | ...``, and tells which one matches a string.
+
+        >>> log_line = matches_any_re(r'ERROR \\d+:', r'WARN(?:ING)?:', r'INFO:')
+        >>> 'WARNING: low disk space' == log_line
+        True
+        >>> 'DEBUG: started' == log_line
+        False
+        >>> log_line.which('WARNING: low disk space')
+        1
+        >>> log_line.which('DEBUG: started') is None
+        True
+
+    The patterns are compiled into a single one, so a string is matched in a single pass rather than by each
+    pattern in turn, which is much faster for dozens of patterns. :meth:`which` returns the index of the first
+    pattern matching (see :func:`re.match`) the string, and ``matcher.patterns[index].match(string)``
+    returns its match. Patterns which cannot be combined with the others (e.g. with groups, or different flags)
+    are matched on their own.
+    """
+    return recipe_cache._get((_MatchesAnyRe, regexes), _compile_matches_any_re, regexes)
+
+
+def _compile_matches_any_re(regexes) -> '_MatchesAnyRe':
+    import re
+
+    return _MatchesAnyRe(tuple(map(re.compile, regexes)))
+
+
+class _MatchesAnyRe(_Recipe):
+    __slots__ = ('patterns', '_segments')
+
+    def __init__(self, patterns: 'tuple[re.Pattern, ...]') -> None:
+        segments = _combine_patterns(patterns)
+        if len(segments) == 1:
+            combined_match = segments[0][0].match
+            predicate = lambda obj: isinstance(obj, str) and combined_match(obj) is not None
+        else:
+            predicate = lambda obj: isinstance(obj, str) and self.which(obj) is not None
+        super().__init__(
+            predicate,
+            repr=f'{matches_any_re.__name__}({", ".join(repr(pattern.pattern) for pattern in patterns)})',
+        )
+        _assign(self, 'patterns', patterns)
+        _assign(self, '_segments', segments)
+
+    def __reduce__(self):
+        return matches_any_re, self.patterns
+
+    def which(self, obj) -> 'int | None':
+        """Return the index of the first pattern matching *obj*, or None if there is none (or it is not a string)."""
+        if not isinstance(obj, str):
+            return None
+        for pattern, first, combined in self._segments:
+            if (match := pattern.match(obj)) is not None:
+                # each of the combined patterns is a group, which is the last one closed when it matches
+                return first + match.lastindex - 1 if combined else first
+        return None
+
+    def _match_many(self, iterable) -> 'list[bool]':
+        items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+        if not set(map(type, items)) <= {str}:
+            return super()._match_many(items)
+        if len(self._segments) == 1:
+            return _match_strings(self._segments[0][0].match, items)
+        return _match_strings(lambda string: self.which(string) is not None, items)
+
+    _first_mismatch = _first_mismatch_in_bulk
+
+
+def _combine_patterns(patterns) -> 'list[tuple[re.Pattern, int, bool]]':
+    """Return the segments which *patterns* are matched with, in order: a pattern, the index of its first
+    pattern, and whether it combines several patterns (each as a group) rather than being one of them."""
+    import re
+    import warnings
+
+    segments = []
+    start = 0
+    while start < len(patterns):
+        # consecutive patterns which can be combined, keeping the order in which they are tried
+        end = start
+        flags = patterns[start].flags
+        while end < len(patterns) and _can_combine(patterns[end]) and patterns[end].flags == flags:
+            end += 1
+        if end - start > 1:
+            alternation = '|'.join(f'({pattern.pattern})' for pattern in patterns[start:end])
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error')  # e.g. global inline flags not at the start
+                    segments.append((re.compile(alternation, flags), start, True))
+            except (re.error, Warning):
+                segments.extend((patterns[index], index, False) for index in range(start, end))
+        else:
+            # matched on its own
+            end = start + 1
+            segments.append((patterns[start], start, False))
+        start = end
+    return segments
+
+
+def _can_combine(pattern: 're.Pattern') -> bool:
+    import re  # already imported if there are patterns
+
+    # groups would be renumbered, changing the meaning of backreferences (and the group of the match);
+    # comments of verbose patterns would comment out the end of the group
+    return isinstance(pattern.pattern, str) and pattern.groups == 0 and not pattern.flags & re.VERBOSE
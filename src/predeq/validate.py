@@ -0,0 +1,297 @@
+"""Validation of large files of records (JSON lines or CSV) with a matcher, from the command line::
+
+    python -m predeq validate myproject.checks:RECORD exports/users-*.jsonl
+
+The matcher is an attribute of a module (``module:attribute``, or ``path/to/file.py:attribute``) which
+the records are compared with, such as a :func:`~predeq.template`. The failing records are printed
+as ``file:line: reason``, followed by a summary with the throughput, and the exit status is 1 if any record
+failed. See ``python -m predeq validate --help`` for the options.
+
+Each file is memory-mapped and split into shards of whole lines, which are decoded and compared in worker
+processes (each of them loads the matcher by itself, so it need not be picklable). Lines of a shard are decoded
+in bulk (and compared with :meth:`predeq.match_many`), so that Python does as little work per line as possible.
+
+CSV files must have a header, and each record is a dict of strings. Since the shards are split at line breaks,
+quoted values must not contain line breaks.
+"""
+
+import argparse
+import os
+import sys
+import time
+from heapq import merge
+from itertools import islice
+from mmap import ACCESS_READ, mmap
+
+from ._predeq import predeq
+
+__all__ = (
+    'Result',
+    'validate_file',
+)
+
+DEFAULT_SHARD_SIZE = 16 * 1024 * 1024
+FORMATS = ('jsonl', 'csv')
+
+
+class Result:
+    """Result of validating a file."""
+
+    def __init__(self, path: str, records: int, failed: int, failures: 'list[tuple[int, str]]', seconds: float,
+                 size: int) -> None:
+        self.path = path
+        self.records = records
+        self.failed = failed
+        # line numbers and reasons of the first failed records (at most max_failures)
+        self.failures = failures
+        self.seconds = seconds
+        self.size = size
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else float('inf')
+
+    def summary(self) -> str:
+        megabytes_per_second = self.size / 1e6 / self.seconds if self.seconds else float('inf')
+        return (
+            f'{self.path}: {self.records} records, {self.failed} failed, in {self.seconds:.2f} s '
+            f'({self.records_per_second:,.0f} records/s, {megabytes_per_second:,.1f} MB/s)'
+        )
+
+
+def validate_file(path, matcher: str, format: 'str | None' = None, workers: 'int | None' = None,
+                  shard_size: int = DEFAULT_SHARD_SIZE, max_failures: 'int | None' = 100) -> Result:
+    """Compare the records of file at *path* with *matcher* (``module:attribute``), and return the result.
+
+    *format* is one of :data:`FORMATS`, by default guessed from the file extension. The shards of *shard_size*
+    bytes are checked by *workers* processes (as many as CPUs by default, or in this process if 1).
+    """
+    path = os.fspath(path)
+    format = format or _guess_format(path)
+    if format not in FORMATS:
+        raise ValueError(f'unknown format {format!r}, expected one of {", ".join(FORMATS)}')
+    if shard_size < 1:
+        raise ValueError(f'shard_size must be positive, got {shard_size!r}')
+    _load_matcher(matcher)  # fail early, rather than in each worker
+
+    start_time = time.perf_counter()
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return Result(path, 0, 0, [], time.perf_counter() - start_time, size)
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+            first_line = 1
+            header = None
+            offset = 0
+            if format == 'csv':
+                # the header is parsed here, and the shards start after it
+                offset = _line_end(data, 0)
+                header = _parse_csv(data[:offset].decode(), None, 0)[1][0][1]
+                first_line = 2
+            shards = list(_shards(data, offset, shard_size))
+
+    tasks = [(path, start, end, format, header, matcher, max_failures) for start, end in shards]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, len(tasks))
+    if workers <= 1 or len(tasks) <= 1:
+        results = list(map(_check_shard, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # only needed here
+
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_check_shard, tasks))
+
+    records = failed = 0
+    failures = []
+    for lines, shard_records, shard_failed, shard_failures in results:
+        records += shard_records
+        failed += shard_failed
+        failures.extend((first_line + line, reason) for line, reason in shard_failures)
+        first_line += lines
+    if max_failures is not None:
+        del failures[max_failures:]
+    return Result(path, records, failed, failures, time.perf_counter() - start_time, size)
+
+
+def _guess_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    return 'csv' if extension == '.csv' else 'jsonl'
+
+
+def _line_end(data, start: int) -> int:
+    """Return the offset after the line starting at *start*."""
+    newline = data.find(b'\n', start)
+    return len(data) if newline < 0 else newline + 1
+
+
+def _shards(data, start: int, shard_size: int):
+    """Yield the offsets of shards of *data* from *start*, of at least *shard_size* bytes and whole lines."""
+    while start < len(data):
+        end = len(data) if start + shard_size >= len(data) else _line_end(data, start + shard_size - 1)
+        yield start, end
+        start = end
+
+
+_MATCHERS = {}  # loaded in this process, by specification
+
+
+def _load_matcher(specification: str):
+    """Return the attribute of a module for ``module:attribute`` (or ``path/to/file.py:attribute``)."""
+    if (matcher := _MATCHERS.get(specification)) is not None:
+        return matcher
+
+    import importlib
+    import importlib.util
+
+    module_name, _, attribute = specification.rpartition(':')
+    if not module_name or not attribute:
+        raise ValueError(f'expected module:attribute, got {specification!r}')
+    if module_name.endswith('.py') or os.sep in module_name:
+        name = os.path.splitext(os.path.basename(module_name))[0]
+        spec = importlib.util.spec_from_file_location(name, module_name)
+        if spec is None:
+            raise ValueError(f'cannot load module from {module_name!r}')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+
+    matcher = module
+    for name in attribute.split('.'):
+        matcher = getattr(matcher, name)
+    _MATCHERS[specification] = matcher
+    return matcher
+
+
+def _check_shard(task) -> 'tuple[int, int, int, list[tuple[int, str]]]':
+    """Return the number of lines and records of a shard, the number of failed records, and the line numbers
+    (from 0) and reasons of at most max_failures of them."""
+    path, start, end, format, header, specification, max_failures = task
+    matcher = _load_matcher(specification)
+    with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+        text = data[start:end].decode('utf-8', errors='replace')
+
+    lines = text.count('\n') + (not text.endswith('\n'))
+    if format == 'csv':
+        invalid, records = _parse_csv(text, header, start)
+    else:
+        invalid, records = _parse_json_lines(text)
+
+    try:
+        if isinstance(matcher, predeq):
+            matches = matcher.match_many(record for _, record in records)
+        else:
+            matches = [record == matcher for _, record in records]
+    except Exception:
+        # e.g. a predicate not expecting some record, the records are checked one by one to tell which ones
+        matches = _match_each(matcher, records)
+    mismatches = (
+        (line, matched if isinstance(matched, str) else 'not equal to the matcher')
+        for (line, _), matched in zip(records, matches)
+        if isinstance(matched, str) or not matched
+    )
+    failures = list(islice(merge(invalid, mismatches), max_failures))
+    failed = len(invalid) + sum(isinstance(matched, str) or not matched for matched in matches)
+    return lines, len(records), failed, failures
+
+
+def _match_each(matcher, records) -> 'list[bool | str]':
+    """Return whether each record is equal to *matcher*, or the reason of its failure if the comparison raised."""
+    matches = []
+    for _, record in records:
+        try:
+            matches.append(record == matcher)
+        except Exception as exc:
+            matches.append(f'raised {exc!r}')
+    return matches
+
+
+def _parse_json_lines(text: str) -> 'tuple[list[tuple[int, str]], list[tuple[int, object]]]':
+    """Return the line numbers (from 0) and errors of invalid lines, and the line numbers and values of the others.
+    Empty lines are skipped."""
+    import json
+    from json.scanner import make_scanner
+
+    lines = text.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    numbered = [(number, line) for number, line in enumerate(lines) if line and not line.isspace()]
+
+    # the scanner decodes a value at the position, with less overhead per call than json.loads()
+    scan = make_scanner(json.JSONDecoder())
+    try:
+        values = [scan(line, 0) for _, line in numbered]
+    except (StopIteration, ValueError):
+        values = None
+    if values is not None and all(
+        end == len(line) or line[end:].isspace() for (_, line), (_, end) in zip(numbered, values)
+    ):
+        return [], [(number, value) for (number, _), (value, _) in zip(numbered, values)]
+
+    # some lines are invalid (or start with whitespace), which json.loads() tells
+    invalid, records = [], []
+    for number, line in numbered:
+        try:
+            records.append((number, json.loads(line)))
+        except ValueError as error:
+            invalid.append((number, f'invalid JSON: {error}'))
+    return invalid, records
+
+
+def _parse_csv(text: str, header, start: int) -> 'tuple[list[tuple[int, str]], list[tuple[int, object]]]':
+    """Like _parse_json_lines(), for CSV rows (as lists if *header* is None, as dicts otherwise)."""
+    import csv
+    import io
+
+    reader = csv.reader(io.StringIO(text, newline=''))
+    invalid, records = [], []
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as error:
+            invalid.append((reader.line_num - 1, f'invalid CSV: {error}'))
+            continue
+        if row:
+            records.append((reader.line_num - 1, row if header is None else dict(zip(header, row))))
+        if header is None:
+            break
+    if header is None and not records:
+        raise ValueError(f'CSV file has no header at offset {start}')
+    return invalid, records
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of ``validate`` command to *parser*."""
+    parser.add_argument('matcher', help='module:attribute (or path/to/file.py:attribute) to compare records with')
+    parser.add_argument('files', nargs='+', help='files to validate')
+    parser.add_argument('--format', choices=FORMATS, help='format of the files (default: by extension, or jsonl)')
+    parser.add_argument('-j', '--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument(
+        '--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+        help=f'bytes of a file checked by a worker at a time (default: {DEFAULT_SHARD_SIZE})',
+    )
+    parser.add_argument(
+        '--max-failures', type=int, default=100,
+        help='number of failed records to report of each file (default: 100, all if negative)',
+    )
+
+
+def main(args: argparse.Namespace) -> int:
+    """Run ``validate`` command, and return the exit status."""
+    max_failures = None if args.max_failures < 0 else args.max_failures
+    status = 0
+    for path in args.files:
+        result = validate_file(
+            path, args.matcher, args.format, workers=args.workers, shard_size=args.shard_size,
+            max_failures=max_failures,
+        )
+        for line, reason in result.failures:
+            print(f'{path}:{line}: {reason}')
+        if result.failed > len(result.failures):
+            print(f'{path}: ... and {result.failed - len(result.failures)} more failed records')
+        print(result.summary(), file=sys.stderr)
+        if result.failed:
+            status = 1
+    return status
@@ -1,5 +1,21 @@
+import pytest
 from hypothesis import HealthCheck, settings
 
+pytest_plugins = ['pytester']
 
 # disable HealthCheck.too_slow for GitHub Actions because it often times out randomly
 settings.register_profile('ci', suppress_health_check=[HealthCheck.too_slow])
+
+
+@pytest.fixture
+def make_module(tmp_path):
+    """Write the source to a file and execute it, returning the file path and the namespace."""
+
+    def make_module(source, name='mod.py'):
+        path = tmp_path / name
+        path.write_text(source, encoding='utf-8')
+        namespace = {'__name__': name}
+        exec(compile(source, str(path), 'exec'), namespace)
+        return str(path), namespace
+
+    return make_module
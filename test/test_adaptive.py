@@ -0,0 +1,152 @@
+import asyncio
+import pickle
+import random
+from itertools import accumulate
+
+import pytest
+
+from predeq import ANY, adaptive_all_of, all_of, exception, instanceof, matches_re, predeq
+from predeq import _adaptive
+from predeq._adaptive import _is_pure
+
+
+def slow(predicate, repeat=200):
+    """Return a predicate which is much more expensive than recipes."""
+    def check(obj):
+        for _ in range(repeat):
+            result = predicate(obj)
+        return result
+    return check
+
+
+def learn(matcher, objects, times=20):
+    for _ in range(times):
+        for obj in objects:
+            obj == matcher
+
+
+def test_cheap_rejecting_first():
+    rare = predeq(slow(lambda obj: obj != 'rare'), repr='rare')
+    matcher = adaptive_all_of(rare, instanceof(int), pure=True, sample_every=4, seed=0)
+    assert matcher.order == (rare, instanceof(int))
+    learn(matcher, ['a', 'b', 'c', 1])
+    assert matcher.order == (instanceof(int), rare)
+
+
+def test_same_results_as_all_of():
+    matchers = [
+        instanceof(dict),
+        predeq(lambda obj: obj['id'] > 0),  # raises for non-dicts, but rejects most objects, so it goes first
+        predeq(lambda obj: 'name' in obj),
+    ]
+    objects = [None, 1, 'name', {'id': 1}, {'id': 2, 'name': 'x'}] + [{'id': 0, 'name': 'x'}] * 20
+    plain = all_of(*matchers)
+    adaptive = adaptive_all_of(*matchers, pure=True, sample_every=2, seed=0)
+    for _ in range(20):
+        assert [obj == adaptive for obj in objects] == [obj == plain for obj in objects]
+    assert adaptive.order[0] is matchers[1]
+
+    with pytest.raises(KeyError):
+        {'name': 'x'} == adaptive
+
+
+def test_impure_not_moved():
+    calls = []
+
+    def record(obj):
+        calls.append(obj)
+        return True
+
+    impure = predeq(record)
+    expensive = matches_re(r'(\w+\s?)*x$')
+    matcher = adaptive_all_of(expensive, instanceof(str), impure, instanceof(int), sample_every=1, seed=0)
+    learn(matcher, ['a b c d e f g', 1, 'x'] * 50, times=1)
+    assert matcher.order == (instanceof(str), expensive, impure, instanceof(int))
+    # called once for each object equal to the matchers before it, like with all_of()
+    assert calls == ['x'] * 50
+
+    # a reordered matcher raises after the impure one, so the matchers after the impure one are evaluated again
+    # in the given order, to reject the object first
+    calls.clear()
+    positive = exception(ValueError(predeq(lambda arg: arg > 0)))  # raises for args which are not numbers
+    number = ~exception(ValueError('a'))
+    matcher = adaptive_all_of(instanceof(ValueError), impure, number, positive, sample_every=1, seed=0)
+    objects = [ValueError(-1)] * 8 + [ValueError(1), ValueError('a')]
+    learn(matcher, objects, times=5)
+    assert matcher.order == (instanceof(ValueError), impure, positive, number)
+    assert calls == objects * 5
+
+
+def test_deterministic():
+    def orders(seed):
+        rare = predeq(slow(lambda obj: obj != 0, repeat=500), repr='rare')
+        often = predeq(slow(lambda obj: obj % 2 == 0, repeat=50), repr='often')
+        matcher = adaptive_all_of(rare, often, instanceof(int), pure=True, sample_every=3, seed=seed)
+        result = []
+        for obj in list(range(100)) + [1.0] * 100:
+            obj == matcher
+            result.append(repr(matcher.order))
+        return result
+
+    assert orders(1) == orders(1)
+    assert orders(1)[-1] == '(instanceof(int), often, rare)'
+
+
+
+def test_same_order_with_seed(monkeypatch):
+    def order():
+        # measured costs are random, and do not change the order with a seed
+        timer = accumulate(random.choices(range(1, 10**6), k=10**5))
+        monkeypatch.setattr(_adaptive, 'perf_counter_ns', timer.__next__)
+        second = predeq(lambda obj: obj % 5 != 0, repr='second')
+        first = predeq(lambda obj: obj % 3 != 0, repr='first')
+        matcher = adaptive_all_of(second, first, pure=True, sample_every=2, seed=0)
+        learn(matcher, range(100), times=3)
+        return repr(matcher.order)
+
+    assert [order() for _ in range(5)] == ['(first, second)'] * 5
+
+
+def test_measured_costs():
+    expensive = predeq(slow(lambda obj: obj % 3 != 0), repr='expensive')
+    cheap = predeq(lambda obj: obj % 5 != 0, repr='cheap')
+    matcher = adaptive_all_of(expensive, cheap, pure=True, sample_every=2)
+    learn(matcher, range(100), times=3)
+    assert matcher.order == (cheap, expensive)
+
+
+@pytest.mark.parametrize('matcher, pure', [
+    (instanceof(int), True),
+    (matches_re('a') | ~instanceof(str), True),
+    (predeq(lambda obj: True), False),
+    (instanceof(int) & predeq(lambda obj: True), False),
+])
+def test_is_pure(matcher, pure):
+    assert _is_pure(matcher) is pure
+
+
+def test_simplified():
+    assert adaptive_all_of(ANY, instanceof(int)) == 1
+    assert repr(adaptive_all_of(ANY, instanceof(int))) == 'instanceof(int)'
+    matcher = adaptive_all_of(instanceof(int), matches_re('a'))
+    assert repr(matcher) == "adaptive_all_of(instanceof(int), matches_re('a'))"
+
+
+@pytest.mark.parametrize('sample_every', [0, True, 1.5])
+def test_invalid_sample_every(sample_every):
+    with pytest.raises(ValueError, match='sample_every'):
+        adaptive_all_of(instanceof(int), matches_re('a'), sample_every=sample_every)
+
+
+def test_pickle():
+    matcher = adaptive_all_of(matches_re('a'), instanceof(str), pure=True, sample_every=5, seed=1)
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert repr(copy) == repr(matcher)
+    assert (copy.pure, copy.sample_every, copy.seed) == (True, 5, 1)
+    assert ['a', 'b', 1] == [copy, ~copy, ~copy]
+
+
+def test_amatch():
+    matcher = adaptive_all_of(instanceof(str), matches_re('a'))
+    assert asyncio.run(matcher.amatch('a'))
+    assert not asyncio.run(matcher.amatch(1))
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from predeq import NOT_NONE, amatch_all, amatch_many, apredeq, each, instanceof, matches_re, template
+
+
+async def exists(user_id):
+    await asyncio.sleep(0)
+    return user_id in {1, 2}
+
+
+async def fails(obj):
+    await asyncio.sleep(0)
+    raise LookupError(obj)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.mark.parametrize(('matcher', 'obj', 'expected'), [
+    (apredeq(exists), 1, True),
+    (apredeq(exists), 3, False),
+    (instanceof(int), 1, True),
+    (instanceof(int), '1', False),
+    (instanceof(int) & apredeq(exists), 1, True),
+    (instanceof(int) & apredeq(exists), 3, False),
+    (apredeq(exists) | matches_re('admin'), 'admin', True),
+    (apredeq(exists) | instanceof(str), 3, False),
+    (~apredeq(exists), 3, True),
+    (NOT_NONE & ~apredeq(exists), 1, False),
+])
+def test_amatch(matcher, obj, expected):
+    assert run(matcher.amatch(obj)) is expected
+
+
+def test_combinators_short_circuit():
+    # the async predicate would raise for other objects
+    assert run((instanceof(int) & apredeq(fails)).amatch('a')) is False
+    assert run((instanceof(str) | apredeq(fails)).amatch('a')) is True
+
+
+@pytest.mark.parametrize('compare', [
+    lambda matcher: 1 == matcher,
+    lambda matcher: 1 != matcher,
+    lambda matcher: 1 == instanceof(int) & matcher,
+    lambda matcher: {'id': 1} == template({'id': matcher}),
+    lambda matcher: [1] == each(matcher),
+    lambda matcher: matcher.match_many([1]),
+    lambda matcher: matcher.first_mismatch([1]),
+])
+def test_comparison_raises(compare):
+    with pytest.raises(TypeError, match='amatch'):
+        compare(apredeq(exists))
+
+
+def test_repr():
+    assert repr(apredeq(exists)) == '<apredeq to meet exists>'
+    assert repr(apredeq(exists, repr='<existing user>')) == '<existing user>'
+
+
+def test_amatch_many():
+    assert run(amatch_many(apredeq(exists), [1, 3, 2])) == [True, False, True]
+    assert run(amatch_many(apredeq(exists), iter([2]), limit=5)) == [True]
+    assert run(amatch_many(instanceof(int), [1, 'a'])) == [True, False]
+    assert run(amatch_many(apredeq(exists), [])) == []
+
+
+@pytest.mark.parametrize('limit', [None, 1, 3])
+def test_limit(limit):
+    running = 0
+    peak = 0
+
+    async def slow(obj):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return True
+
+    assert run(amatch_many(apredeq(slow), range(10), limit=limit)) == [True] * 10
+    assert peak == (limit or 10)
+
+
+def test_invalid_limit():
+    with pytest.raises(ValueError):
+        run(amatch_many(apredeq(exists), [1], limit=0))
+
+
+def test_amatch_all():
+    assert run(amatch_all([(1, apredeq(exists)), (2, apredeq(exists)), ('a', instanceof(str)), (3, 3)]))
+    assert not run(amatch_all([(1, apredeq(exists)), (3, apredeq(exists))]))
+    assert not run(amatch_all([(1, 2)]))
+    assert run(amatch_all([]))
+
+
+def test_amatch_all_cancels_on_mismatch():
+    finished = []
+
+    async def check(delay):
+        await asyncio.sleep(delay)
+        finished.append(delay)
+        return delay < 0.01
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await amatch_all((delay, apredeq(check)) for delay in [0.01, 0, 10, 10])
+        return result, loop.time() - start
+
+    result, elapsed = run(main())
+    assert result is False
+    assert elapsed < 5
+    assert finished == [0, 0.01]
+
+
+def test_exception_cancels_others():
+    cancelled = []
+
+    async def check(obj):
+        if obj == 0:
+            return await fails(obj)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(obj)
+            raise
+        return True
+
+    with pytest.raises(LookupError):
+        run(amatch_many(apredeq(check), [1, 0, 2]))
+    assert cancelled == [1, 2]
+
+    cancelled.clear()
+    with pytest.raises(LookupError):
+        run(amatch_all([(0, apredeq(check)), (3, apredeq(check))]))
+    assert cancelled == [3]
@@ -0,0 +1,194 @@
+import gc
+import pickle
+import weakref
+from collections import namedtuple
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import pytest
+
+from predeq import ANY, NOT_NONE, fields_of, has_attrs, instanceof, matches_re, predeq, template
+
+
+@dataclass
+class Row:
+    id: int
+    status: str
+    tags: list = field(default_factory=list)
+
+
+class Slotted:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y) -> None:
+        self.x = x
+        self.y = y
+
+
+class SubSlotted(Slotted):
+    __slots__ = 'z'
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+Pair = namedtuple('Pair', 'first second')
+
+
+class Failing:
+    @property
+    def value(self):
+        raise AttributeError('computed')
+
+
+@pytest.mark.parametrize('obj, expected', [
+    (SimpleNamespace(id=1, status='ok', tags=['a']), True),
+    (SimpleNamespace(id=1, status='ok', tags=['a'], extra=None), True),
+    (SimpleNamespace(id=True, status='ok', tags=['']), True),
+    (SimpleNamespace(id='1', status='ok', tags=['a']), False),
+    (SimpleNamespace(id=1, status='failed', tags=['a']), False),
+    (SimpleNamespace(id=1, status='ok', tags=('a',)), False),
+    (SimpleNamespace(id=1, status='ok', tags=['a', 'b']), False),
+    (SimpleNamespace(id=1, status='ok'), False),
+    (Row(1, 'ok', ['a']), True),
+    (None, False),
+])
+def test_has_attrs(obj, expected):
+    matcher = has_attrs(id=instanceof(int), status='ok', tags=[instanceof(str)])
+    assert (obj == matcher) is expected
+    assert (matcher.mismatch is None) is expected
+
+
+@pytest.mark.parametrize('matchers', [
+    {},
+    {'x': ANY},
+    {'x': NOT_NONE, 'y': predeq(lambda y: y in (2, 'b'))},
+    {'x': instanceof(int) & ~instanceof(bool), 'y': matches_re('a') | instanceof(int)},
+    {'x': template({'a': 1}), 'y': 2},
+])
+def test_same_as_comparing_attributes(matchers):
+    objects = [SimpleNamespace(x=x, y=y) for x in [None, 1, True, {'a': 1}, 'a'] for y in [-1, 2, 'a', 'b']]
+    matcher = has_attrs(**matchers)
+    for obj in objects:
+        assert (obj == matcher) is all(getattr(obj, name) == value for name, value in matchers.items())
+
+
+@pytest.mark.parametrize('cls, fields', [
+    (Row, ('id', 'status', 'tags')),
+    (Slotted, ('x', 'y')),
+    (SubSlotted, ('x', 'y', 'z')),
+    (Point, ('x', 'y')),
+    (Pair, ('first', 'second')),
+])
+def test_fields(cls, fields):
+    from predeq._attrs import _fields
+
+    assert _fields(cls) == fields
+
+
+def test_attrs_class():
+    attr = pytest.importorskip('attr')
+
+    @attr.s(slots=True)
+    class Item:
+        name = attr.ib()
+        count = attr.ib(default=0)
+
+    matcher = fields_of(Item, matches_re('[a-z]+$'), count=instanceof(int))
+    assert Item('apple', 2) == matcher
+    assert Item('Apple', 2) != matcher
+
+
+def test_fields_of():
+    assert Row(1, 'ok') == fields_of(Row, 1)
+    assert Row(1, 'ok') == fields_of(Row, instanceof(int), tags=[])
+    assert Row(1, 'ok', ['a']) != fields_of(Row, instanceof(int), tags=[])
+    # instances of the class only, unlike has_attrs()
+    assert SimpleNamespace(id=1) != fields_of(Row, 1)
+    assert Point(1, 2) == fields_of(Point, y=2)
+    assert Pair(1, 2) == fields_of(Pair, 1, 2)
+    assert (1, 2) != fields_of(Pair, 1, 2)
+    assert SubSlotted(1, 2) == fields_of(Slotted, 1, 2)
+
+
+def test_fields_of_errors():
+    with pytest.raises(TypeError, match="Row has no field 'name'"):
+        fields_of(Row, name='a')
+    with pytest.raises(TypeError, match="multiple matchers for field 'id'"):
+        fields_of(Row, 1, id=1)
+    with pytest.raises(TypeError, match='Row has 3 fields, got 4 matchers'):
+        fields_of(Row, 1, 2, 3, 4)
+    with pytest.raises(TypeError, match='cannot tell the fields of SimpleNamespace'):
+        fields_of(SimpleNamespace)
+    with pytest.raises(TypeError, match='expected a class'):
+        fields_of(Row(1, 'ok'))
+
+
+def test_unset_slot():
+    obj = SubSlotted(1, 2)
+    assert obj != fields_of(SubSlotted, z=None)
+    obj.z = None
+    assert obj == fields_of(SubSlotted, z=None)
+
+
+def test_mismatch():
+    matcher = fields_of(Row, predeq(lambda id: id > 0), status=matches_re('ok'))
+    assert Row(1, 'failed') != matcher
+    # the cheapest check is made first, and reported
+    assert Row(0, 'failed') != matcher
+    assert repr(matcher) == (
+        "fields_of(Row, id=<predeq to meet lambda id: id > 0>, status=matches_re('ok')) "
+        "(mismatch at attribute 'status': 'failed')"
+    )
+    assert Row(0, 'ok') != matcher
+    assert matcher.mismatch == "mismatch at attribute 'id': 0"
+    assert None != matcher
+    assert matcher.mismatch == 'not an instance of Row: None'
+    assert Row(1, 'ok') == matcher
+    assert matcher.mismatch is None
+    assert repr(matcher) == "fields_of(Row, id=<predeq to meet lambda id: id > 0>, status=matches_re('ok'))"
+
+
+def test_mismatching_object_not_kept():
+    matcher = has_attrs(status='ok')
+    row = Row(1, 'failed')
+    ref = weakref.ref(row)
+    assert row != matcher
+    # described when compared, not when the representation is asked for
+    row.status = 'changed'
+    del row
+    gc.collect()
+    assert ref() is None
+    assert matcher.mismatch == "mismatch at attribute 'status': 'failed'"
+
+
+def test_missing_attribute():
+    matcher = has_attrs(value=1, other=2)
+    assert Failing() != matcher
+    assert matcher.mismatch == "no attribute 'value'"
+
+
+def test_exceptions_propagate():
+    def check(value):
+        raise AttributeError('from the predicate')
+
+    with pytest.raises(AttributeError, match='from the predicate'):
+        SimpleNamespace(value=1) == has_attrs(value=predeq(check))
+
+
+def test_not_identifiers():
+    matcher = has_attrs(**{'class': 1, 'a-b': 2, 'c': 3})
+    assert SimpleNamespace(**{'class': 1, 'a-b': 2, 'c': 3}) == matcher
+    assert SimpleNamespace(**{'class': 1, 'a-b': 3, 'c': 3}) != matcher
+    assert repr(has_attrs(**{'class': 1, 'a-b': 2, 'c': 3})) == "has_attrs(c=3, **{'class': 1, 'a-b': 2})"
+
+
+def test_pickle():
+    matcher = fields_of(Point, x=instanceof(int))
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert repr(copy) == 'fields_of(Point, x=instanceof(int))'
+    assert Point(1, 2) == copy
+    assert Point('1', 2) != copy
@@ -12,3 +12,16 @@ def test_predeq_returns_bool():
 
     assert ('' == truthy) is False
     assert ('abc' == truthy) is True
+
+
+def test_predeq_has_no_dict():
+    assert not hasattr(predeq(lambda x: x), '__dict__')
+
+
+def test_predeq_doc():
+    documented = predeq(lambda x: x)
+    documented.__doc__ = 'Compares equal to truthy objects.'
+
+    assert documented.__doc__ == 'Compares equal to truthy objects.'
+    assert predeq(lambda x: x).__doc__ == predeq.__doc__
+    assert predeq.__doc__.startswith('predeq(predicate) -> predeq object')
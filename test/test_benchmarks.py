@@ -0,0 +1,18 @@
+"""Check that benchmarks work (without measuring anything), so that they don't rot between the runs."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_benchmarks_quick():
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks', '--quick'],
+        capture_output=True, check=True, cwd=ROOT, text=True,
+    )
+    results = json.loads(result.stdout)
+    assert results['benchmarks']
+    assert {'eq/predeq-right', 'repr/multi/cold'} <= {result['name'] for result in results['benchmarks']}
@@ -0,0 +1,171 @@
+"""Results cache of predeq objects (``predeq(predicate, cache=...)``)."""
+
+import gc
+import pickle
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from predeq import predeq
+
+
+class Counting:
+    """Predicate counting the objects it checks."""
+
+    def __init__(self, predicate=lambda obj: True) -> None:
+        self.predicate = predicate
+        self.checked = []
+
+    def __call__(self, obj) -> bool:
+        self.checked.append(obj)
+        return self.predicate(obj)
+
+
+class Record:
+    """Unhashable object supporting weak references."""
+
+    __hash__ = None
+
+
+def is_positive(obj):
+    return obj > 0
+
+
+def test_by_value():
+    predicate = Counting(lambda obj: obj > 0)
+    matcher = predeq(predicate, cache=10)
+    assert [1, -1, 1, 2, -1, 1].count(matcher) == 4
+    assert predicate.checked == [1, -1, 2]
+    assert matcher.cache_info() == {'hits': 3, 'misses': 3, 'maxsize': 10, 'currsize': 3, 'hit_rate': 0.5}
+
+
+def test_types_not_mixed():
+    matcher = predeq(Counting(lambda obj: isinstance(obj, int)), cache=10)
+    assert matcher.match_many([1, 1.0, True, 1]) == [True, False, True, True]
+    assert matcher.cache_info()['hits'] == 1
+
+
+@pytest.mark.parametrize('first, second', [
+    ((1,), (True,)),
+    (frozenset({1}), frozenset({True})),
+    (1.0, 1),
+])
+def test_equal_objects_told_apart(first, second):
+    matcher = predeq(lambda obj: all(type(item) is int for item in obj) if isinstance(obj, (tuple, frozenset))
+                     else type(obj) is float, cache=8)
+    assert first == matcher
+    assert second != matcher
+
+
+def from_bits(bits: int) -> float:
+    return struct.unpack('d', struct.pack('Q', bits))[0]
+
+
+@pytest.mark.parametrize('first, second', [
+    (0.0, -0.0),
+    (complex(1.0, 0.0), complex(1.0, -0.0)),
+    # NaNs with different payloads
+    (from_bits(0x7ff8000000000001), from_bits(0x7ff8000000000002)),
+])
+def test_float_bits(first, second):
+    def bits(obj):
+        return struct.pack('dd', obj.real, obj.imag)
+
+    predicate = Counting(lambda obj: bits(obj) == bits(first))
+    matcher = predeq(predicate, cache=8)
+    copy = pickle.loads(pickle.dumps(first))  # the same bits, another object
+    assert copy is not first
+    assert matcher.match_many([first, second, copy]) == [True, False, True]
+    assert len(predicate.checked) == 2
+
+
+def test_by_identity():
+    predicate = Counting()
+    matcher = predeq(predicate, cache=10)
+    items = [[1], {'a': 1}, (1,), Record()]
+    assert matcher.match_many(items * 3) == [True] * 12
+    assert predicate.checked == items
+    # equal objects do not share the result, since they might change
+    assert [1] == matcher
+    assert tuple([1]) == matcher
+    assert len(predicate.checked) == 6
+
+
+def test_weak_references():
+    matcher = predeq(lambda obj: True, cache=10)
+    records = [Record() for _ in range(5)]
+    matcher.match_many(records)
+    assert matcher.cache_info()['currsize'] == 5
+
+    del records
+    gc.collect()
+    assert matcher.cache_info()['currsize'] == 0
+
+    # the ids of collected objects are reused, but their results are not
+    assert matcher.match_many([Record() for _ in range(5)]) == [True] * 5
+    assert matcher.cache_info()['misses'] == 10
+
+
+def test_lru():
+    predicate = Counting()
+    matcher = predeq(predicate, cache=2)
+    for obj in [1, 2, 1, 3, 1, 2]:
+        assert obj == matcher
+    # 2 is the least recently used when 3 is added
+    assert predicate.checked == [1, 2, 3, 2]
+    assert matcher.cache_info()['currsize'] == 2
+
+
+def test_exceptions_not_cached():
+    predicate = Counting(lambda obj: 1 / obj > 0)
+    matcher = predeq(predicate, cache=10)
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            0 == matcher
+    assert predicate.checked == [0, 0]
+    assert matcher.cache_info()['currsize'] == 0
+
+
+def test_clear():
+    matcher = predeq(Counting(), cache=10)
+    1 == matcher
+    matcher.cache_clear()
+    assert matcher.cache_info() == {'hits': 0, 'misses': 0, 'maxsize': 10, 'currsize': 0, 'hit_rate': 0.0}
+
+
+def test_not_cached():
+    matcher = predeq(lambda obj: True)
+    assert matcher.cache_info() is None
+    matcher.cache_clear()
+
+
+@pytest.mark.parametrize('cache', [0, -1, True, 1.5])
+def test_invalid_size(cache):
+    with pytest.raises(ValueError, match='positive number'):
+        predeq(is_positive, cache=cache)
+
+
+def test_repr():
+    assert repr(predeq(is_positive, cache=10)) == '<predeq to meet is_positive>'
+    assert repr(predeq(lambda obj: obj > 0, cache=10)) == '<predeq to meet lambda obj: obj > 0>'
+
+
+def test_pickle():
+    matcher = predeq(is_positive, cache=10)
+    1 == matcher
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert copy.cache_info()['currsize'] == 0
+    assert copy.match_many([1, -1]) == [True, False]
+
+    with ProcessPoolExecutor(1) as executor:
+        assert matcher.match_many([1, -1, 2], executor=executor) == [True, False, True]
+
+
+def test_repeated_checks():
+    # e.g. the same rows are checked by each of the expected items
+    predicate = Counting(lambda obj: obj['id'] > 0)
+    matcher = predeq(predicate, cache=100)
+    rows = [{'id': i} for i in range(-10, 10)]
+    assert [rows.count(matcher) for _ in range(5)] == [9] * 5
+    assert len(predicate.checked) == 20
@@ -0,0 +1,139 @@
+import math
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from predeq import _close_to, close_to
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    """Compare sequences in Python or with numpy."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(_close_to, '_NUMPY_MIN_LEN', 0)
+    else:
+        monkeypatch.setattr(_close_to, '_numpy', lambda import_=True: None)
+    return request.param
+
+
+def test_number():
+    assert 1.0 == close_to(1)
+    assert 1 + 1e-10 == close_to(1)
+    assert 1 + 1e-8 != close_to(1)
+    assert 1.05 == close_to(1, rel=0.1)
+    assert 0.05 == close_to(0, abs=0.1)
+    assert Fraction(1, 3) == close_to(0.3333333333)
+    assert Decimal('0.1') == close_to(0.1)
+    assert math.inf == close_to(math.inf)
+    assert math.nan != close_to(math.nan)
+    assert True == close_to(1)
+
+    assert '1' != close_to(1)
+    assert None != close_to(1)
+    assert [1.0] != close_to(1)
+    assert 1j != close_to(0)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match='non-negative'):
+        close_to(1, rel=-1)
+    with pytest.raises(TypeError, match='real number'):
+        close_to('1')
+    with pytest.raises(TypeError, match='sequence of real numbers'):
+        close_to([1, '2'])
+    with pytest.raises(TypeError, match='sequence of real numbers'):
+        close_to([[1, 2]])
+
+
+@pytest.mark.parametrize('make', [
+    list,
+    tuple,
+    lambda items: array('d', items),
+    lambda items: memoryview(array('d', items)),
+])
+def test_sequence(backend, make):
+    matcher = close_to([1.0, 2.0, 3.0], rel=1e-3)
+    assert make([1.0001, 2.0, 2.9999]) == matcher
+    assert matcher.mismatch is None
+
+    assert make([1.0001, 2.01, 3.001]) != matcher
+    assert matcher.mismatch == 'worst deviation at index 1: 2.01 != 2.0'
+    assert repr(matcher) == 'close_to([1.0, 2.0, 3.0], rel=0.001) (worst deviation at index 1: 2.01 != 2.0)'
+
+    assert make([1.0, 2.0]) != matcher
+    assert matcher.mismatch == 'length 2, expected 3'
+
+
+def test_long_sequence_repr():
+    assert repr(close_to([float(i) for i in range(1000)])) == 'close_to([0.0, 1.0, 2.0, 3.0, 4.0, 5.0, ...])'
+    assert repr(close_to(array('d', range(1000)), abs=0.5)) == (
+        "close_to(array('d', [0.0, 1.0, 2.0, 3.0, 4.0, ...]), abs=0.5)"
+    )
+
+
+def test_sequence_special_values(backend):
+    assert [math.inf, 1.0] == close_to([math.inf, 1.0])
+    assert [math.nan, 1.0] != close_to([math.nan, 1.0])
+    matcher = close_to([1.0, 2.0, 3.0], abs=0.5)
+    assert [1.0, math.nan, 10.0] != matcher
+    assert matcher.mismatch == 'worst deviation at index 1: nan != 2.0'
+    assert [1e308, -1e308] != close_to([-1e308, 1e308], rel=0.5)
+
+
+def test_not_numbers(backend):
+    matcher = close_to([1, 2])
+    assert 1 != matcher
+    assert '12' != matcher
+    assert b'\x01\x02' != matcher
+    assert {1: 1, 2: 2} != matcher
+    assert [1, '2'] != matcher
+    if backend == 'python':
+        assert matcher.mismatch == "item at index 1 is not a real number: '2'"
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+    matcher = close_to(np.array([[1.0, 2.0], [3.0, 4.0]]), abs=0.1)
+    assert np.array([[1.05, 2.0], [3.0, 4.0]]) == matcher
+    assert [[1, 2], [3, 4]] == matcher
+    assert np.array([[1.05, 2.0], [3.0, 4.5]]) != matcher
+    assert matcher.mismatch == 'worst deviation at index (1, 1): 4.5 != 4.0'
+    assert np.array([1.0, 2.0, 3.0, 4.0]) != matcher
+    assert matcher.mismatch == 'shape (4,), expected (2, 2)'
+    assert np.array(['a', 'b']) != close_to([1, 2])
+
+    # numpy arrays and scalars compare with the matcher as a whole, rather than item by item
+    assert (np.arange(3) == close_to([0, 1, 2])) is True
+    assert (np.float32(0.5) == close_to(0.5)) is True
+    assert np.arange(3, dtype=np.int8) == close_to(np.arange(3.0))
+
+
+def test_numpy_not_copied():
+    np = pytest.importorskip('numpy')
+    values = np.zeros(10**6)
+    buffer = array('d', bytes(8 * 10**6))
+    assert values == close_to(values)
+    assert buffer == close_to(values)
+    assert _close_to._to_array(np, values) is values
+    assert np.shares_memory(_close_to._to_array(np, buffer), np.frombuffer(buffer))
+
+
+def test_match_many():
+    assert close_to(1.0).match_many([1, 1.0 + 1e-12, 1.1, 'a', None]) == [True, True, False, False, False]
+    assert close_to([1, 2]).match_many([[1, 2], (1, 2.1)]) == [True, False]
+
+
+@given(st.lists(st.floats(allow_nan=True, allow_infinity=True), min_size=1), st.data())
+def test_same_as_isclose(items, data):
+    expected = data.draw(st.lists(st.floats(), min_size=len(items), max_size=len(items)))
+    rel = data.draw(st.sampled_from([1e-9, 1e-3, 0.5]))
+    abs = data.draw(st.sampled_from([0.0, 1e-3, 1.0]))
+    result = all(math.isclose(item, value, rel_tol=rel, abs_tol=abs) for item, value in zip(items, expected))
+    assert (items == close_to(expected, rel=rel, abs=abs)) is result
+    np = pytest.importorskip('numpy')
+    assert (np.array(items) == close_to(np.array(expected), rel=rel, abs=abs)) is result
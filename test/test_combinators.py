@@ -0,0 +1,133 @@
+import re
+
+import pytest
+
+from predeq import ANY, NOT_NONE, all_of, any_of, compile_template, exception, instanceof, matches_re, predeq
+
+MATCHERS = [
+    ANY,
+    NOT_NONE,
+    instanceof(int),
+    instanceof(str, bytes),
+    matches_re(r'\d+$'),
+    matches_re('[a-z]+$'),
+    matches_re('(a)\\1'),
+    matches_re(re.compile('ab', re.IGNORECASE)),
+    exception(KeyError('key')),
+    predeq(lambda x: x == 0),
+]
+
+VALUES = [None, 0, 1, True, 'a', '1', 'AB', 'aa', b'1', KeyError('key'), 1.5, [0]]
+
+
+def unfused_all(matchers, value):
+    return all(value == matcher for matcher in matchers)
+
+
+def unfused_any(matchers, value):
+    return any(value == matcher for matcher in matchers)
+
+
+@pytest.mark.parametrize('first', MATCHERS)
+@pytest.mark.parametrize('second', MATCHERS)
+def test_same_result_as_unfused(first, second):
+    for value in VALUES:
+        assert (value == first & second) == unfused_all([first, second], value)
+        assert (value == first | second) == unfused_any([first, second], value)
+        assert (value == ~first) == (not unfused_all([first], value))
+        # the compiled template inlines the combinators
+        assert compile_template([first & ~second])([value]) == (value == first and value != second)
+
+
+def test_instanceof_merged():
+    assert repr(instanceof(int) | instanceof(str)) == 'instanceof(int, str)'
+    matcher = any_of(instanceof(int), matches_re('a'), instanceof(str, int))
+    assert repr(matcher) == "instanceof(int, str) | matches_re('a')"
+
+
+def test_matches_re_merged():
+    matcher = matches_re('a') | matches_re('b') | instanceof(int)
+    assert repr(matcher) == "matches_re('a') | matches_re('b') | instanceof(int)"
+    assert matcher.operands[0].pattern.pattern == '(?:a)|(?:b)'
+    short = predeq(lambda s: len(s) < 2, repr='short')
+    assert repr(matcher & short) == f'({matcher!r}) & short'
+    assert repr(matcher.operands[0] & short) == "(matches_re('a') | matches_re('b')) & short"
+
+    # merged again with more patterns
+    assert (matcher | matches_re('c')).operands[0].pattern.pattern == '(?:a)|(?:b)|(?:c)'
+
+
+@pytest.mark.parametrize('matchers', [
+    # backreferences would be renumbered
+    [matches_re('(a)\\1'), matches_re('b')],
+    # different flags
+    [matches_re('a'), matches_re(re.compile('b', re.IGNORECASE))],
+    # global flags not at the start of the alternation
+    [matches_re('(?i)a'), matches_re('(?i)b')],
+    # bytes patterns
+    [matches_re(b'a'), matches_re(b'b')],
+    # comments of verbose patterns would comment out the rest of the alternation
+    [matches_re(re.compile('a # comment', re.VERBOSE)), matches_re(re.compile('b\n', re.VERBOSE))],
+])
+def test_matches_re_not_merged(matchers):
+    assert any_of(*matchers).operands == tuple(matchers)
+
+
+def test_verbose_comments():
+    matcher = matches_re(re.compile('a # comment', re.VERBOSE)) | matches_re(re.compile('b\n', re.VERBOSE))
+    assert 'b' == matcher
+    assert 'a' == matcher
+    assert 'c' != matcher
+
+
+def test_simplified():
+    int_ = instanceof(int)
+    assert all_of() is ANY
+    assert any_of(int_) is int_
+    assert ANY & int_ is int_
+    assert int_ & int_ is int_
+    assert NOT_NONE & int_ is int_
+    assert int_ | ANY is ANY
+    assert NOT_NONE | instanceof(type(None)) is ANY
+    assert (NOT_NONE | int_) is NOT_NONE
+    assert ~~int_ is int_
+    assert repr(any_of()) == 'any_of()'
+    assert 1 != any_of()
+
+
+def test_repr():
+    even = predeq(lambda x: x % 2 == 0, repr='even')
+    positive = predeq(lambda x: x > 0, repr='positive')
+    assert repr(even & positive) == 'even & positive'
+    assert repr((even | positive) & ~even) == '(even | positive) & ~even'
+    assert repr(~(even & positive)) == '~(even & positive)'
+    assert repr(even & (positive & NOT_NONE)) == 'even & positive & <NOT_NONE>'
+
+
+def test_short_circuit():
+    calls = []
+
+    def recording(result):
+        return predeq(lambda x: calls.append(result) or result)
+
+    assert 1 != recording(False) & recording(True)
+    assert 1 == recording(True) | recording(False)
+    assert calls == [False, True]
+
+
+def test_overridden_eq():
+    class Reversed(predeq):
+        __slots__ = ()
+
+        def __eq__(self, other):
+            return not self.pred(other)
+
+    assert 1 == Reversed(lambda x: x == 0) & instanceof(int)
+    assert 0 != Reversed(lambda x: x == 0) | instanceof(str)
+
+
+def test_not_predeq():
+    with pytest.raises(TypeError):
+        instanceof(int) | 1
+    with pytest.raises(TypeError):
+        any_of(instanceof(int), 1)
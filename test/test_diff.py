@@ -0,0 +1,148 @@
+from predeq import _diff, _source, each, instanceof, matches_re, predeq, template
+from predeq._diff import explain
+from predeq.pytest_plugin import pytest_assertrepr_compare
+
+
+def test_paths():
+    expected = template({
+        'id': instanceof(int),
+        'name': matches_re(r'[a-z]+$'),
+        'tags': [instanceof(str)] * 3,
+        'meta': {'version': 1},
+    })
+    actual = {'id': '1', 'name': 'ok', 'tags': ['a', 2], 'meta': {'version': 2}, 'extra': None}
+    assert explain(actual, expected) == [
+        "{'extra': None, 'id': '1', 'meta': {'version': 2}, 'name': 'ok', ...} == "
+        "template({'id': ..., 'meta': {'version': 1}, 'name': ..., 'tags': [..., ..., ...]})",
+        'Mismatching paths (5):',
+        "  ['id']: '1' != instanceof(int)",
+        "  ['tags']: length 2 != 3",
+        "  ['tags'][1]: 2 != instanceof(str)",
+        "  ['meta']['version']: 2 != 1",
+        "  ['extra']: only on the left",
+    ]
+
+
+def test_swapped():
+    assert explain(instanceof(int), 'a') == ["instanceof(int) == 'a'"]
+    assert explain(template({'a': instanceof(int), 'b': 1}), {'a': 'x', 'c': 1}) == [
+        "template({'a': ..., 'b': 1}) == {'a': 'x', 'c': 1}",
+        'Mismatching paths (3):',
+        "  ['a']: instanceof(int) != 'x'",
+        "  ['b']: only on the left",
+        "  ['c']: only on the right",
+    ]
+
+
+def test_containers():
+    assert explain([1, (2, None)], [1, (2, instanceof(int))]) == [
+        '[1, (2, None)] == [1, (2, ...)]',
+        'Mismatching paths (1):',
+        '  [1][1]: None != instanceof(int)',
+    ]
+    # a container of another type does not compare equal
+    assert explain([[1]], [(instanceof(int),)]) == [
+        '[[1]] == [(...,)]',
+        'Mismatching paths (1):',
+        '  [0]: [1] != (...,)',
+    ]
+    assert explain({'a': {}}, {'a': {'b': instanceof(int)}})[1:] == [
+        'Mismatching paths (1):',
+        "  ['a']['b']: only on the right",
+    ]
+
+
+def test_without_predeq():
+    # explained by pytest as usual
+    assert explain({'a': 1}, {'a': 2}) is None
+    assert explain([1, 2], [1]) is None
+
+
+def test_without_predeq_not_compared():
+    class Loud:
+        def __eq__(self, other):
+            raise AssertionError('compared')
+
+    assert explain([Loud(), 1], [Loud(), 2]) is None
+
+
+def test_recursive():
+    left, right = [1], [2]
+    left.append(left)
+    right.append(right)
+    assert explain(left, right) is None
+
+    right = [instanceof(str)]
+    right.append(right)
+    assert explain(left, right) == [
+        '[1, [1, [1, [1, [1, [1, [...]]]]]]] == [..., [..., [..., [..., [..., [..., [...]]]]]]]',
+        'Mismatching paths (1):',
+        '  [0]: 1 != instanceof(str)',
+    ]
+
+
+def test_limit():
+    actual = list(range(20))
+    expected = [instanceof(str)] * 20
+    lines = explain(actual, expected)
+    assert lines[1] == f'Mismatching paths (first {_diff.MAX_MISMATCHES} of 20, use -vv to show all):'
+    assert len(lines) == 2 + _diff.MAX_MISMATCHES
+    assert len(explain(actual, expected, verbose=True)) == 2 + 20
+
+
+def test_mismatch_described_by_matcher():
+    lines = explain([[1, 2, 'x']], [each(instanceof(int))])
+    assert lines[-1] == "  [0]: [1, 2, 'x'] != each(instanceof(int)) (mismatch at index 2, recent items: [1, 2, 'x'])"
+
+
+def test_raising_predicate():
+    even = predeq(lambda x: x % 2 == 0)
+    assert explain([1, None], [even, even]) == [
+        '[1, None] == [..., ...]',
+        'Mismatching paths (2):',
+        '  [0]: 1 != <predeq to meet lambda x: x % 2 == 0>',
+        "  [1]: None == <predeq to meet lambda x: x % 2 == 0> raised TypeError(\"unsupported operand type(s) "
+        "for %: 'NoneType' and 'int'\")",
+    ]
+
+
+def test_only_failing_lambdas_resolved(monkeypatch):
+    resolved = []
+
+    def get_lambda_repr(lambda_func, get=_source._get_lambda_repr):
+        resolved.append(lambda_func)
+        return get(lambda_func)
+
+    monkeypatch.setattr(_source, '_get_lambda_repr', get_lambda_repr)
+    matchers = [predeq(lambda x, i=i: x == i) for i in range(1000)]
+    actual = list(range(1000))
+    actual[500] = None
+    assert explain(actual, matchers)[-1] == '  [500]: None != <predeq to meet lambda x, i=i: x == i>'
+    assert resolved == [matchers[500].pred]
+
+
+def test_explanation_failing(pytestconfig):
+    class Unprintable(predeq):
+        def __repr__(self):
+            raise RuntimeError('no repr')
+
+    # explained by pytest as usual
+    assert pytest_assertrepr_compare(pytestconfig, '==', [1], [Unprintable(lambda obj: False)]) is None
+
+
+def test_pytest_plugin(pytester):
+    pytester.makepyfile("""
+        from predeq import instanceof, predeq, template
+
+        def test_payload():
+            payload = {'items': [{'id': i, 'ok': True} for i in range(100)]}
+            payload['items'][42]['ok'] = 'yes'
+            assert payload == template({'items': [{'id': instanceof(int), 'ok': predeq(lambda x: x is True)}] * 100})
+    """)
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "E   *assert {'items': [{'id': 0, 'ok': True}, * == template({'items': [{'id': ..., 'ok': ...}, *",
+        'E         Mismatching paths (1):',
+        "E           ['items'][42]['ok']: 'yes' != <predeq to meet lambda x: x is True>",
+    ])
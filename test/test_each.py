@@ -0,0 +1,61 @@
+import itertools
+import tracemalloc
+
+import pytest
+
+from predeq import each, instanceof, predeq
+
+
+def numbers(count):
+    yield from range(count)
+
+
+@pytest.mark.parametrize('make', [numbers, lambda count: list(range(count)), lambda count: tuple(range(count))])
+@pytest.mark.parametrize(('matcher', 'count', 'equal', 'mismatch'), [
+    (each(instanceof(int)), 10, True, None),
+    (each(instanceof(int)), 0, True, None),
+    (each(predeq(lambda x: x < 5), window=2), 10, False, 'mismatch at index 5, recent items: [4, 5]'),
+    (each(predeq(lambda x: x < 5), window=0), 10, False, 'mismatch at index 5'),
+    (each(instanceof(int), min_len=3), 2, False, 'only 2 items, recent items: [0, 1]'),
+    (each(instanceof(int), max_len=3), 3, True, None),
+    (each(instanceof(int), max_len=3, window=2), 4, False, 'more than 3 items, recent items: [2, 3]'),
+    (each(0), 1, True, None),
+    (each(0), 2, False, 'mismatch at index 1, recent items: [0, 1]'),
+])
+def test_each(make, matcher, count, equal, mismatch):
+    assert (make(count) == matcher) is equal
+    assert matcher.mismatch == mismatch
+
+
+def test_stops_at_first_mismatch():
+    items = itertools.count()
+    assert items != each(predeq(lambda x: x < 3))
+    assert next(items) == 4
+
+
+def test_not_iterable():
+    assert 1 != each(instanceof(int))
+    assert 'abc' != each(instanceof(str))
+
+
+def test_repr():
+    matcher = each(instanceof(int), min_len=1, max_len=2)
+    assert repr(matcher) == 'each(instanceof(int), min_len=1, max_len=2)'
+    assert iter('abc') != matcher
+    assert repr(matcher) == "each(instanceof(int), min_len=1, max_len=2) (mismatch at index 0, recent items: ['a'])"
+    assert iter([1]) == matcher
+    assert repr(matcher) == 'each(instanceof(int), min_len=1, max_len=2)'
+
+
+def test_constant_memory():
+    def peak_memory(count):
+        # items are allocated, and released unless kept
+        items = (str(i) for i in range(count))
+        tracemalloc.start()
+        try:
+            assert items == each(instanceof(str))
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak_memory(100_000) < peak_memory(1_000) + 1000
@@ -0,0 +1,88 @@
+import re
+from dataclasses import dataclass
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from predeq import (
+    ANY, NOT_NONE, close_to, contains_all, each, exception, fields_of, has_attrs, instanceof, matches_any_re,
+    matches_re, predeq, template, unordered,
+)
+from predeq.hypothesis import anything, from_matcher
+
+
+@dataclass
+class Row:
+    id: int
+    status: str
+
+
+MATCHERS = [
+    ANY,
+    NOT_NONE,
+    instanceof(int),
+    instanceof(bytes, (float, str)),
+    matches_re(r'[a-z]+\d{2,}$'),
+    matches_re(re.compile(r'ab+c', re.IGNORECASE)),
+    matches_re(r'(?i)x'),
+    matches_re('a') | matches_re('b+$') | instanceof(int),
+    matches_any_re(r'\d+$', r'(x)y'),
+    exception(KeyError('key')),
+    exception(OSError(2, 'No such file')),
+    instanceof(int) & predeq(lambda x: x > 0),
+    predeq(lambda x: x != 0) & matches_re(r'\d+'),
+    ~instanceof(int),
+    each(instanceof(str), min_len=2, max_len=5),
+    unordered([1, instanceof(str), instanceof(int)]),
+    contains_all([instanceof(bytes)]),
+    close_to(0.1, rel=1e-3),
+    close_to(1e6, abs=1e-6),
+    close_to([1.0, -2.0, 0.0], abs=0.5),
+    template({'id': instanceof(int), 'tags': [matches_re(r'\w+$')] * 3, 'meta': (1, NOT_NONE)}),
+    {'nested': [template({'ok': instanceof(bool)}), 'plain']},
+    has_attrs(name=matches_re(r'\w+$'), items=[1, instanceof(int)]),
+    fields_of(Row, status=matches_re('ok|failed$')),
+]
+
+
+@pytest.mark.parametrize('matcher', MATCHERS, ids=repr)
+def test_from_matcher(matcher):
+    @settings(max_examples=50)
+    @given(from_matcher(matcher))
+    def check(obj):
+        assert obj == matcher
+
+    check()
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+    matcher = close_to(np.arange(6.0).reshape(2, 3), rel=1e-6)
+
+    @settings(max_examples=20)
+    @given(from_matcher(matcher))
+    def check(obj):
+        assert obj.shape == (2, 3)
+        assert obj == matcher
+
+    check()
+
+
+@settings(max_examples=50)
+@given(anything(none=False))
+def test_anything(obj):
+    assert obj is not None
+
+
+def test_unsatisfiable():
+    assert from_matcher(close_to(float('nan'))).is_empty
+    assert from_matcher(matches_re(b'a')).is_empty
+
+
+@settings(max_examples=50)
+@given(st.data())
+def test_opaque_predicate_filtered(data):
+    # objects are generated and filtered by arbitrary predicates, which should accept most of them
+    obj = data.draw(from_matcher(predeq(lambda x: not isinstance(x, str))))
+    assert not isinstance(obj, str)
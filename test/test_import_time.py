@@ -0,0 +1,53 @@
+"""Import-time regression check.
+
+The modules needed to find sources of lambdas are heavy to import, and are only needed to show a representation
+of predeq object (typically when a test fails), so `import predeq` must not import them.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+DEFERRED_MODULES = {
+    'ast',
+    'asyncio',
+    'dis',
+    'hashlib',
+    'inspect',
+    'json',
+    'linecache',
+    're',
+    'tempfile',
+    'predeq._repr_cache',
+    'predeq._source',
+}
+
+
+def import_times(statement) -> 'dict[str, int]':
+    """Return cumulative import times (in microseconds) of modules imported by `statement`, as reported by
+    ``python -X importtime``. Modules imported by the interpreter at startup are not included.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, check=True, text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, module = line.split('|')
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_lazy():
+    assert not import_times('import predeq').keys() & DEFERRED_MODULES
+
+
+@pytest.mark.parametrize('statement', [
+    "import predeq; repr(predeq.predeq(lambda x: x))",
+    "import predeq; predeq.matches_re('abc')",
+])
+def test_deferred_imports_are_loaded_when_needed(statement):
+    # verify that the check above is meaningful, i.e. the modules would be reported if imported
+    assert import_times(statement).keys() & DEFERRED_MODULES
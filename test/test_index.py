@@ -0,0 +1,102 @@
+import operator
+import re
+from collections.abc import Sized
+from unittest.mock import Mock
+
+import pytest
+
+from predeq import ANY, NOT_NONE, PredicateIndex, exception, instanceof, matches_re, predeq
+from predeq._index import _literal_prefix
+
+
+class Base:
+    pass
+
+
+class Derived(Base):
+    pass
+
+
+MATCHERS = [
+    ANY,
+    NOT_NONE,
+    instanceof(int),
+    instanceof(bool),
+    instanceof(Base),
+    instanceof(Derived, str),
+    instanceof(Sized),
+    exception(KeyError('key')),
+    exception(LookupError('key')),
+    matches_re('abc'),
+    matches_re('ab?c'),
+    matches_re('^ab+'),
+    matches_re(r'\d+'),
+    matches_re('x|abc'),
+    matches_re(re.compile('ABC', re.IGNORECASE)),
+    instanceof(int) & predeq(lambda x: x > 0),
+    instanceof(int) | instanceof(str),
+    predeq(lambda x: x == 0),
+]
+
+VALUES = [
+    None, 0, 1, -1, True, 'abc', 'ac', 'abbb', 'x', '12', 'ABC', '', [], Base(), Derived(),
+    KeyError('key'), IndexError('key'), Mock(spec=Derived), Mock(spec=KeyError),
+]
+
+
+@pytest.mark.parametrize('value', VALUES, ids=repr)
+def test_same_as_linear_scan(value):
+    index = PredicateIndex((matcher, position) for position, matcher in enumerate(MATCHERS))
+    expected = [position for position, matcher in enumerate(MATCHERS) if matcher == value]
+    assert index.find_all(value) == expected
+    assert index.find(value, default='none') == (expected[0] if expected else 'none')
+
+
+def test_only_candidates_compared():
+    index = PredicateIndex()
+    for matcher in MATCHERS[2:15]:
+        index.add(matcher)
+
+    candidates = [repr(index._matchers[position]) for position in index._candidates('xyz')]
+    # not the patterns starting with "a"
+    assert candidates == [
+        'instanceof(Derived, str)',
+        'instanceof(Sized)',
+        r"matches_re('\\d+')",
+        "matches_re('x|abc')",
+        "matches_re('ABC')",
+    ]
+    assert all(map(operator.is_, index, MATCHERS[2:15]))
+
+
+def test_default_value():
+    int_ = instanceof(int)
+    index = PredicateIndex()
+    index.add(int_)
+    index.add(instanceof(float), value=None)
+    assert index.find(1) is int_
+    assert index.find(1.0, default=False) is None
+    assert index.find('a', default=False) is False
+    assert len(index) == 2
+
+    with pytest.raises(TypeError):
+        index.add(int)
+
+
+@pytest.mark.parametrize(('pattern', 'prefix'), [
+    ('abc', 'abc'),
+    ('abc$', 'abc'),
+    ('^abc', 'abc'),
+    ('ab*', 'a'),
+    ('ab?', 'a'),
+    ('ab{2}', 'a'),
+    ('ab+', 'ab'),
+    (r'a\.b', 'a'),
+    ('a|b', ''),
+    ('(?i)abc', ''),
+    (re.compile('abc', re.IGNORECASE), ''),
+    (re.compile('a b', re.VERBOSE), ''),
+    (b'abc', ''),
+])
+def test_literal_prefix(pattern, prefix):
+    assert _literal_prefix(re.compile(pattern)) == prefix
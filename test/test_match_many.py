@@ -0,0 +1,94 @@
+from array import array
+from collections.abc import Sequence
+from unittest.mock import Mock
+
+import pytest
+
+from predeq import ANY, NOT_NONE, exception, instanceof, matches_re, predeq
+
+
+class EvenMeta(type):
+    def __instancecheck__(cls, obj):
+        return type(obj) is int and obj % 2 == 0
+
+
+class Even(metaclass=EvenMeta):
+    """A class with isinstance() checking the object itself rather than its type."""
+
+
+ITEMS = [1, 2, 'abc', None, 2.5, True, 'ABC', b'abc', [1], (1,), KeyError('key'), 'abc', 3, Mock(spec=int)]
+
+
+@pytest.mark.parametrize('matcher', [
+    ANY,
+    NOT_NONE,
+    predeq(lambda obj: obj == 1),
+    instanceof(int),
+    instanceof(str, float),
+    instanceof(Sequence),
+    instanceof(object),
+    instanceof(Even),
+    matches_re(r'[a-z]+$'),
+    exception(LookupError('key')),
+])
+@pytest.mark.parametrize('items', [ITEMS, ['abc', 'ABC', 'abc', 'a1'], []], ids=('mixed', 'str', 'empty'))
+def test_same_as_eq(matcher, items):
+    expected = [item == matcher for item in items]
+    assert matcher.match_many(items) == expected
+    assert matcher.match_many(iter(items)) == expected
+    assert matcher.first_mismatch(items) == (expected.index(False) if False in expected else None)
+
+
+def test_mock_with_spec():
+    # isinstance() checks __class__, which is int for the mock
+    assert instanceof(int).match_many([Mock(spec=int), Mock()]) == [True, False]
+
+
+@pytest.mark.parametrize('items, item_type', [
+    (array('i', [1, 2]), int),
+    (array('d', [1, 2]), float),
+    (b'ab', int),
+    (bytearray(b'ab'), int),
+    (memoryview(b'ab'), int),
+    (memoryview(array('d', [1, 2])), float),
+])
+def test_arrays(items, item_type):
+    assert instanceof(item_type).match_many(items) == [True, True]
+    assert instanceof(str).match_many(items) == [False, False]
+    assert instanceof(str).first_mismatch(items) == 0
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+
+    assert instanceof(np.integer).match_many(np.arange(3)) == [True] * 3
+    assert instanceof(float).match_many(np.arange(3, dtype=float)) == [True] * 3  # np.float64 subclasses float
+    assert instanceof(int).match_many(np.arange(3)) == [False] * 3
+    # not of the same type, so they are checked one by one
+    assert instanceof(int).match_many(np.array([1, 'a', None], dtype=object)) == [True, False, False]
+    assert instanceof(np.ndarray).match_many(np.zeros((2, 2))) == [True, True]
+    masked = np.ma.masked_array([1.0, 2.0], mask=[False, True])
+    assert instanceof(float).match_many(masked) == [isinstance(item, float) for item in masked] == [True, False]
+
+
+class Series:
+    """Like pandas Series, which has a numpy dtype, but yields Python objects."""
+
+    ndim = 1
+
+    def __init__(self, values) -> None:
+        import numpy
+
+        self.values = values
+        self.dtype = numpy.dtype(int)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+def test_array_like():
+    pytest.importorskip('numpy')
+    assert instanceof(int).match_many(Series([1, 2])) == [True, True]
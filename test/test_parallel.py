@@ -0,0 +1,153 @@
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from predeq import (
+    ANY,
+    NOT_NONE,
+    all_of,
+    any_of,
+    exception,
+    instanceof,
+    matches_re,
+    predeq,
+    template,
+)
+
+
+def is_even(x):
+    return x % 2 == 0
+
+
+def fails_on_negative(x):
+    if x < 0:
+        raise ValueError(x)
+    return True
+
+
+even = predeq(is_even)
+
+
+@pytest.fixture(scope='module')
+def processes():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture(scope='module')
+def threads():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('chunksize', [None, 1, 3, 100])
+def test_match_many(processes, chunksize):
+    items = list(range(20))
+    assert even.match_many(items, executor=processes, chunksize=chunksize) == even.match_many(items)
+
+
+@pytest.mark.parametrize('chunksize', [None, 1, 3, 100])
+def test_first_mismatch(processes, chunksize):
+    assert even.first_mismatch([0, 2, 4, 5, 6, 7], executor=processes, chunksize=chunksize) == 3
+    assert even.first_mismatch([1] * 10, executor=processes, chunksize=chunksize) == 0
+    assert even.first_mismatch([0, 2, 4], executor=processes, chunksize=chunksize) is None
+    assert even.first_mismatch([], executor=processes, chunksize=chunksize) is None
+
+
+def test_recipes(processes):
+    items = [1, 'a', 'b1', None, 2.0]
+    for matcher in [instanceof(int, str), matches_re(r'[a-z]\d'), any_of(instanceof(int), matches_re('a')), ANY]:
+        assert matcher.match_many(items, executor=processes, chunksize=2) == matcher.match_many(items)
+
+
+def test_lambda_falls_back_to_current_process(processes):
+    main_thread = threading.get_ident()
+    matcher = predeq(lambda x: threading.get_ident() == main_thread)
+    assert matcher.match_many(range(10), executor=processes) == [True] * 10
+    assert matcher.first_mismatch(range(10), executor=processes) is None
+
+
+def test_threads(threads):
+    # lambdas need not be pickled for threads
+    matcher = predeq(lambda x: x < 5)
+    assert matcher.match_many(range(10), executor=threads, chunksize=3) == [True] * 5 + [False] * 5
+    assert matcher.first_mismatch(range(10), executor=threads, chunksize=3) == 5
+
+
+def test_chunks_after_mismatch_are_cancelled(threads):
+    started = []
+    release = threading.Event()
+
+    def check(x):
+        started.append(x)
+        if x == 0:
+            return False
+        release.wait(5)
+        return True
+
+    try:
+        # the other chunks started are blocked until released, they are not waited for
+        assert predeq(check).first_mismatch(range(100), executor=threads, chunksize=10) == 0
+    finally:
+        release.set()
+    # the remaining chunks were cancelled, each worker started at most one more
+    assert max(started) <= 20
+
+
+def test_exception(processes):
+    matcher = predeq(fails_on_negative)
+    with pytest.raises(ValueError):
+        matcher.match_many([1, 2, -1, 3], executor=processes, chunksize=1)
+    with pytest.raises(ValueError):
+        matcher.first_mismatch([1, 2, -1, 3], executor=processes, chunksize=1)
+
+
+
+def test_exception_after_mismatch(threads):
+    raised = threading.Event()
+
+    def check(x):
+        if x == 0:
+            # rejected after a later chunk raises
+            raised.wait(5)
+            return False
+        if x == 10:
+            raised.set()
+            raise ValueError(x)
+        return True
+
+    # like checking the items one by one, which stops at the mismatch
+    assert predeq(check).first_mismatch(range(20), executor=threads, chunksize=10) == 0
+    with pytest.raises(ValueError):
+        predeq(check).first_mismatch(range(1, 20), executor=threads, chunksize=9)
+
+
+def test_invalid_chunksize(threads):
+    with pytest.raises(ValueError):
+        even.match_many([1], executor=threads, chunksize=0)
+
+
+@pytest.mark.parametrize('matcher', [
+    ANY,
+    NOT_NONE,
+    instanceof(int, str),
+    matches_re(r'\d+'),
+    exception(ValueError('a')),
+    all_of(instanceof(int), even),
+    any_of(matches_re('a'), matches_re('b')),
+    ~instanceof(int),
+    template({'id': instanceof(int), 'name': matches_re('[a-z]+$')}),
+])
+def test_pickle(matcher):
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert repr(copy) == repr(matcher)
+    assert type(copy) is type(matcher)
+    for obj in [1, 'a', '12', None, ValueError('a'), {'id': 1, 'name': 'x'}]:
+        assert (obj == copy) is (obj == matcher)
+
+
+def test_pickle_constants_by_reference():
+    assert pickle.loads(pickle.dumps(ANY)) is ANY
+    assert pickle.loads(pickle.dumps(NOT_NONE)) is NOT_NONE
@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from predeq import apredeq, instanceof, predeq
+from predeq import profiling
+from predeq.profiling import profile
+
+
+def test_profile():
+    even = predeq(lambda x: x % 2 == 0)
+    with profile() as results:
+        assert [1, 2, 4] != [even] * 3
+        assert 'a' != instanceof(int)
+        with pytest.raises(TypeError):
+            assert None == even
+
+    assert predeq.__eq__ is profiling._ORIGINAL_EQ
+    assert 1 == instanceof(int)  # not recorded
+
+    stats = {entry['matcher']: entry for entry in results.stats()}
+    assert stats.keys() == {repr(even), 'instanceof(int)'}
+    assert stats[repr(even)]['site'] == f'{__file__}:{even.pred.__code__.co_firstlineno}'
+    assert stats[repr(even)]['calls'] == 2
+    assert stats[repr(even)]['true'] == 0
+    assert stats[repr(even)]['false'] == 1
+    assert stats[repr(even)]['errors'] == 1
+    assert stats['instanceof(int)'] == {
+        'matcher': 'instanceof(int)',
+        'site': None,
+        'calls': 1,
+        'true': 0,
+        'false': 1,
+        'errors': 0,
+        'total_ns': stats['instanceof(int)']['total_ns'],
+        'max_ns': stats['instanceof(int)']['total_ns'],
+    }
+    assert json.loads(results.to_json()) == {'matchers': results.stats()}
+
+
+class Negated(predeq):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return not self.pred(other)
+
+
+def test_overriding_subclasses():
+    async def check(obj):
+        return True
+
+    negated = Negated(lambda x: x > 0, repr='negated')
+    asynchronous = apredeq(check, repr='asynchronous')
+    with profile() as results:
+        assert [-1, 1] == [negated, ~negated]
+        with pytest.raises(TypeError):
+            1 == asynchronous
+
+    assert Negated.__eq__ is vars(Negated)['__eq__'] and Negated.__eq__.__name__ == '__eq__'
+    assert 1 != negated  # not recorded
+    stats = {entry['matcher']: entry for entry in results.stats()}
+    assert (stats['negated']['calls'], stats['negated']['true']) == (2, 1)
+    assert (stats['asynchronous']['calls'], stats['asynchronous']['errors']) == (1, 1)
+
+
+def test_subclasses_defined_later():
+    with profile() as results:
+        class Inverted(predeq):
+            __slots__ = ()
+
+            def __eq__(self, other):
+                return not self.pred(other)
+
+        inverted = Inverted(lambda x: x > 0, repr='inverted')
+        assert -1 == inverted
+
+    assert 'inverted' in [entry['matcher'] for entry in results.stats()]
+    assert Inverted.__eq__ is vars(Inverted)['__eq__'] and Inverted.__eq__.__qualname__.endswith('Inverted.__eq__')
+    assert '__init_subclass__' not in vars(predeq)
+
+
+def test_environment_variable_subclasses(tmp_path):
+    path = tmp_path / 'profile.json'
+    subprocess.run(
+        [sys.executable, '-c', 'from predeq import apredeq; 1 == apredeq(print, repr="later")'],
+        env={**os.environ, 'PREDEQ_PROFILE': str(path)},
+    )
+    [entry] = json.loads(path.read_text())['matchers']
+    assert (entry['matcher'], entry['errors']) == ('later', 1)
+
+
+def test_cached_site():
+    even = predeq(lambda x: x % 2 == 0, cache=8)
+    with profile() as results:
+        assert [x == even for x in (1, 2, 2)] == [False, True, True]
+    [stats] = results.stats()
+    assert stats['site'] == f'{__file__}:{even._predicate().__code__.co_firstlineno}'
+    assert stats['calls'] == 3
+
+
+def test_nested():
+    with profile() as outer:
+        1 == instanceof(int)
+        with profile() as inner:
+            1 == instanceof(str)
+        1 == instanceof(bytes)
+        assert profiling.is_enabled()
+    assert not profiling.is_enabled()
+
+    assert [entry['matcher'] for entry in inner.stats()] == ['instanceof(str)']
+    assert sorted(entry['matcher'] for entry in outer.stats()) == ['instanceof(bytes)', 'instanceof(int)']
+
+
+def test_summary():
+    with profile() as results:
+        for cls in (int, str, bytes):
+            1 == instanceof(cls)
+    lines = results.summary(limit=2).splitlines()
+    assert lines[0].split() == ['calls', 'true', 'false', 'total', 'ms', 'max', 'us', 'matcher']
+    assert len(lines) == 4
+    assert lines[-1] == '... and 1 more'
+
+
+def test_environment_variable(tmp_path):
+    path = tmp_path / 'profile.json'
+    subprocess.run(
+        [sys.executable, '-c', 'from predeq import instanceof; 1 == instanceof(int)'],
+        env={**os.environ, 'PREDEQ_PROFILE': str(path)}, check=True,
+    )
+    assert [entry['matcher'] for entry in json.loads(path.read_text())['matchers']] == ['instanceof(int)']
+
+
+def test_pytest_option(pytester):
+    pytester.makepyfile("""
+        from predeq import instanceof
+
+        def test_instanceof():
+            assert 1 == instanceof(int)
+    """)
+    result = pytester.runpytest_subprocess('--predeq-profile=profile.json')
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(['*predeq profile*', '*1*1*0*instanceof(int)'])
+    assert json.loads((pytester.path / 'profile.json').read_text())['matchers'][0]['matcher'] == 'instanceof(int)'
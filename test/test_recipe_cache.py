@@ -0,0 +1,87 @@
+import gc
+import re
+
+import pytest
+
+from predeq import exception, instanceof, matches_re, recipe_cache
+
+
+@pytest.fixture(autouse=True)
+def default_cache():
+    recipe_cache.configure()
+    yield
+    recipe_cache.configure()
+
+
+def test_shared():
+    assert instanceof(int, str) is instanceof(int, str)
+    assert matches_re('a+') is matches_re('a+')
+    assert matches_re(re.compile('a+', re.I)) is matches_re(re.compile('a+', re.I))
+    assert exception(KeyError('key')) is exception(KeyError('key'))
+
+    assert instanceof(int, str) is not instanceof(str, int)
+    assert matches_re('a+') is not matches_re(b'a+')
+    assert matches_re(re.compile('a+')) is not matches_re(re.compile('a+', re.I))
+    assert exception(KeyError('key')) is not exception(LookupError('key'))
+    # equal args, but different representations
+    assert repr(exception(ValueError(1))) == 'exception(ValueError(1))'
+    assert repr(exception(ValueError(True))) == 'exception(ValueError(True))'
+    assert repr(exception(ValueError((1,)))) == 'exception(ValueError((1,)))'
+    assert repr(exception(ValueError((1.0,)))) == 'exception(ValueError((1.0,)))'
+
+
+def test_immutable():
+    matcher = instanceof(int)
+    with pytest.raises(AttributeError):
+        matcher.repr = 'integer'
+    with pytest.raises(AttributeError):
+        del matcher.pred
+    assert repr(instanceof(int)) == 'instanceof(int)'
+
+
+def test_info_and_clear():
+    recipe_cache.clear()
+    first = instanceof(int)
+    assert instanceof(int) is first
+    matches_re('a')
+    assert recipe_cache.info() == {'hits': 1, 'misses': 2, 'maxsize': 4096, 'currsize': 2, 'weak': False}
+
+    recipe_cache.clear()
+    assert recipe_cache.info() == {'hits': 0, 'misses': 0, 'maxsize': 4096, 'currsize': 0, 'weak': False}
+    assert instanceof(int) is not first
+
+
+def test_least_recently_used_evicted():
+    recipe_cache.configure(maxsize=2)
+    int_, str_ = instanceof(int), instanceof(str)
+    assert instanceof(int) is int_
+    instanceof(bytes)
+    assert recipe_cache.info()['currsize'] == 2
+    assert instanceof(int) is int_
+    assert instanceof(str) is not str_
+
+
+def test_disabled():
+    recipe_cache.configure(maxsize=0)
+    assert instanceof(int) is not instanceof(int)
+    assert recipe_cache.info()['currsize'] == 0
+
+    with pytest.raises(ValueError):
+        recipe_cache.configure(maxsize=-1)
+
+
+def test_weak():
+    recipe_cache.configure(weak=True)
+    matcher = instanceof(int)
+    assert instanceof(int) is matcher
+    assert recipe_cache.info()['currsize'] == 1
+
+    del matcher
+    gc.collect()
+    assert recipe_cache.info()['currsize'] == 0
+
+
+def test_unhashable_arguments():
+    exc = KeyError(['key'])
+    assert exception(exc) is not exception(exc)
+    assert KeyError(['key']) == exception(exc)
@@ -1,4 +1,9 @@
-from predeq import ANY, NOT_NONE, exception, instanceof, matches_re
+import gc
+import pickle
+import re
+import weakref
+
+from predeq import ANY, NOT_NONE, exception, instanceof, matches_any_re, matches_re
 
 
 def test_any():
@@ -22,6 +27,34 @@ def test_exception():
     assert ValueError(msg) != exception(exc)
 
 
+def test_exception_traceback_not_kept():
+    class Resource:
+        pass
+
+    class Error(Exception):
+        def __init__(self, code):
+            super().__init__(f'failed with code {code}')
+
+    resources = []
+
+    def fail(exc):
+        resource = Resource()
+        resources.append(weakref.ref(resource))
+        raise exc
+
+    matchers = []
+    for exc in (ValueError('traceback kept'), Error(1)):
+        try:
+            fail(exc)
+        except Exception as raised:
+            matchers.append(exception(raised))
+    del exc
+    gc.collect()
+    assert [ref() for ref in resources] == [None, None]
+    assert [ValueError('traceback kept'), Error(1)] == matchers
+    assert repr(matchers[1]) == "exception(Error('failed with code 1'))"
+
+
 def test_instanceof():
     assert {} == instanceof(dict)
     assert 123 == instanceof(int)
@@ -37,3 +70,50 @@ def test_matches_re():
 
     assert None != pred
     assert 12.34 != pred
+
+
+def test_matches_any_re():
+    pred = matches_any_re(r'\d{3}$', r'[a-z]+', 'ab')
+    assert '123' == pred
+    assert 'abc' == pred
+    assert '1234' != pred
+    assert None != pred
+    assert 12.34 != pred
+
+    assert pred.which('123') == 0
+    assert pred.which('ab') == 1  # the first matching pattern
+    assert pred.which('1234') is None
+    assert pred.which(123) is None
+    assert 'x' != matches_any_re()
+
+
+def test_matches_any_re_not_combined():
+    patterns = [
+        re.compile('a+'),
+        re.compile('b(c)'),  # groups
+        re.compile('B', re.IGNORECASE),  # other flags
+        re.compile('(?i)d'),  # global flags, which must be at the start
+        re.compile('c # comment', re.VERBOSE),
+        re.compile('e'),
+        re.compile('f'),
+    ]
+    pred = matches_any_re(*patterns)
+    for index, string in enumerate(['aa', 'bc', 'b', 'D', 'c', 'e', 'f']):
+        assert pred.which(string) == index
+        assert string == pred
+    assert 'x' != pred
+    assert [pattern for pattern, _, combined in pred._segments if combined] == [re.compile('(e)|(f)')]
+
+
+def test_matches_any_re_many_patterns():
+    pred = matches_any_re(*(f'id{i}-' for i in range(500)))
+    assert len(pred._segments) == 1
+    assert pred.which('id499-x') == 499
+    assert pred.match_many(['id1-', 'id500-', 'id7-', 1]) == [True, False, True, False]
+
+
+def test_matches_any_re_pickle():
+    pred = matches_any_re(r'\d+', 'a(b)')
+    copy = pickle.loads(pickle.dumps(pred))
+    assert repr(copy) == repr(pred)
+    assert copy.which('ab') == 1
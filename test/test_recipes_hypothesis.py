@@ -5,9 +5,9 @@ Unlike regular tests in test_recipes.py, these tests are not mandatory, but rath
 """
 
 from hypothesis import assume, given
-from hypothesis.strategies import composite, from_regex, from_type
+from hypothesis.strategies import composite, from_regex, from_type, text
 
-from predeq import ANY, NOT_NONE, instanceof, matches_re
+from predeq import ANY, NOT_NONE, instanceof, matches_any_re, matches_re
 
 anything = from_type(type).flatmap(from_type)
 """A strategy producing objects of any type"""
@@ -55,3 +55,14 @@ def test_matches_re_ne_string(string):
 @given(anything.filter(lambda obj: not isinstance(obj, str)))
 def test_matches_re_ne_non_string(obj):
     assert obj != matches_re(r'[0-9a-f]+')
+
+
+PATTERNS = [r'[0-9]+', r'[a-f]', r'a+b', r'(x)y', r'[a-z]{2}$', r'.']
+
+
+@given(text(alphabet='0123abxyz-', max_size=5))
+def test_matches_any_re_first_matching(string):
+    pred = matches_any_re(*PATTERNS)
+    first = next((index for index, pattern in enumerate(PATTERNS) if matches_re(pattern) == string), None)
+    assert pred.which(string) == first
+    assert (string == pred) is (first is not None)
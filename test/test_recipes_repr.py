@@ -1,6 +1,6 @@
 import pytest
 
-from predeq import ANY, NOT_NONE, exception, instanceof, matches_re
+from predeq import ANY, NOT_NONE, exception, instanceof, matches_any_re, matches_re
 
 
 @pytest.mark.parametrize('value, expected_repr', [
@@ -17,6 +17,7 @@ from predeq import ANY, NOT_NONE, exception, instanceof, matches_re
     (instanceof(compile), 'instanceof(<built-in function compile>)'),
 
     (matches_re('\\d+'), r"matches_re('\\d+')"),
+    (matches_any_re('\\d+', 'a'), r"matches_any_re('\\d+', 'a')"),
 ])
 def test_repr(value, expected_repr):
     assert repr(value) == expected_repr
@@ -3,6 +3,7 @@ Hint: `PYTEST _DONT _REWRITE` in docstring (spelled with no spaces) disables ass
 and causes co_positions to be correct and inspect.getsource() returning less context
 """
 
+import gc
 import sys
 
 import pytest
@@ -20,7 +21,9 @@ requires_3_11 = pytest.mark.xfail(sys.version_info <= (3, 11), reason='requires
 
 @pytest.fixture(autouse=True)
 def enable_one_node_short_path(monkeypatch, request):
-    monkeypatch.setattr('predeq._predeq._ENABLE_ONE_NODE_SHORT_PATH', request.param)
+    monkeypatch.setattr('predeq._source._ENABLE_ONE_NODE_SHORT_PATH', request.param)
+    # resolved sources are remembered for the code objects, which are the same for both paths
+    monkeypatch.setattr('predeq._source._LAMBDA_REPRS', {})
 
 
 def test_lambda_single_line():
@@ -98,3 +101,19 @@ def test_multiline_lambda_in_dict_utf8():
         'message': predeq(lambda wiadomość: isinstance(wiadomość, str)),
     }
     assert repr(dummy_dict['message']) == '<predeq to meet lambda wiadomość: isinstance(wiadomość, str)>'
+
+
+def test_forgotten_with_lambdas(make_module):
+    from predeq import _source
+
+    path, ns = make_module('LAMBDAS = [lambda x: x + 1, lambda x: x + 2]\n')
+    assert [repr(predeq(func)) for func in ns['LAMBDAS']] == [
+        '<predeq to meet lambda x: x + 1>',
+        '<predeq to meet lambda x: x + 2>',
+    ]
+    assert len(_source._LAMBDA_REPRS[path]) == 2
+    assert path not in _source._FILE_LOCKS
+
+    del ns['LAMBDAS']
+    gc.collect()
+    assert len(_source._LAMBDA_REPRS[path]) == 0
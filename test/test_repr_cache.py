@@ -0,0 +1,121 @@
+import json
+import os
+
+import pytest
+
+from predeq import _repr_cache, _source
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(_repr_cache, '_directory', None)
+    _repr_cache.enable(tmp_path / 'cache')
+    yield tmp_path / 'cache'
+    _repr_cache.disable()
+
+
+def forget_loaded():
+    """Simulate another process, which has not loaded the cache yet (after this one has exited)."""
+    _repr_cache.flush()
+    _repr_cache._files.clear()
+    _source._LAMBDA_REPRS.clear()
+
+
+def test_stored_and_reused(cache_dir, make_module, monkeypatch):
+    _, ns = make_module('f, g = lambda: 1, lambda: 1.0\nh = lambda x: x in {"a", "b"}\n')
+    assert list(map(_source._get_lambda_repr, (ns['f'], ns['g'], ns['h']))) == [
+        'lambda: 1',
+        'lambda: 1.0',
+        'lambda x: x in {"a", "b"}',
+    ]
+    # written in batches
+    assert not cache_dir.exists()
+    _repr_cache.flush()
+    [cache_file] = cache_dir.iterdir()
+    assert sorted(json.loads(cache_file.read_text())['lambdas'].values()) == [
+        'lambda x: x in {"a", "b"}',
+        'lambda: 1',
+        'lambda: 1.0',
+    ]
+
+    forget_loaded()
+    monkeypatch.setattr(_source, '_get_source_index', None)  # would raise if called
+    assert _source._get_lambda_repr(ns['g']) == 'lambda: 1.0'
+    assert _source._get_lambda_repr(ns['h']) == 'lambda x: x in {"a", "b"}'
+
+
+def test_outdated(cache_dir, make_module):
+    path, ns = make_module('f = lambda: 1\n')
+    assert _source._get_lambda_repr(ns['f']) == 'lambda: 1'
+
+    # same code at the same position, but the file has changed
+    with open(path, 'w') as file:
+        file.write('f = lambda: 1  # changed\n')
+    forget_loaded()
+    assert _repr_cache.lookup(ns['f'].__code__) is _repr_cache.MISSING
+
+
+def test_concurrent_writers_merged(cache_dir, make_module):
+    _, ns = make_module('f = lambda: 1\ng = lambda: 2\n')
+    assert _source._get_lambda_repr(ns['f']) == 'lambda: 1'
+
+    # another process, which has loaded the cache before `f` was stored, stores `g`
+    forget_loaded()
+    file = _repr_cache._get_file(ns['g'].__code__.co_filename)
+    file.lambdas.clear()
+    _repr_cache.store(ns['g'].__code__, 'lambda: 2')
+
+    forget_loaded()
+    assert _repr_cache.lookup(ns['f'].__code__) == 'lambda: 1'
+    assert _repr_cache.lookup(ns['g'].__code__) == 'lambda: 2'
+
+
+def test_written_in_batches(cache_dir, make_module, monkeypatch):
+    monkeypatch.setattr(_repr_cache, '_BATCH', 10)
+    _, ns = make_module(''.join(f'f{i} = lambda: {i}\n' for i in range(25)))
+    writes = []
+    monkeypatch.setattr(_repr_cache.os, 'replace', lambda src, dst: writes.append(dst) or os.rename(src, dst))
+    for i in range(25):
+        _source._get_lambda_repr(ns[f'f{i}'])
+    assert len(writes) == 2
+
+    _repr_cache.disable()
+    assert len(writes) == 3
+    forget_loaded()
+    _repr_cache.enable(cache_dir)
+    assert [_repr_cache.lookup(ns[f'f{i}'].__code__) for i in range(25)] == [f'lambda: {i}' for i in range(25)]
+
+
+def test_source_file_checked_once(cache_dir, make_module, monkeypatch):
+    path, ns = make_module('f = lambda: 1\ng = lambda: 2\n')
+    stats = []
+    stat = os.stat
+    monkeypatch.setattr(os, 'stat', lambda filename, **kwargs: stats.append(filename) or stat(filename, **kwargs))
+    # missing from the cache, found in the source (also checked by linecache.checkcache()) and stored
+    assert _source._get_lambda_repr(ns['f']) == 'lambda: 1'
+    assert stats == [path, path]
+
+    forget_loaded()
+    stats.clear()
+    # found in the cache
+    assert _source._get_lambda_repr(ns['g']) == 'lambda: 2'
+    assert _source._get_lambda_repr(ns['f']) == 'lambda: 1'
+    assert stats == [path, path]
+
+
+def test_disabled(make_module, monkeypatch):
+    monkeypatch.setattr(_repr_cache, '_directory', None)
+    _, ns = make_module('f = lambda: 1\n')
+    assert _repr_cache.lookup(ns['f'].__code__) is _repr_cache.MISSING
+    assert _source._get_lambda_repr(ns['f']) == 'lambda: 1'
+
+
+def test_pytest_option(pytester):
+    pytester.makepyfile("""
+        from predeq import predeq
+
+        def test_repr():
+            assert repr(predeq(lambda x: x)) == '<predeq to meet lambda x: x>'
+    """)
+    pytester.runpytest_subprocess('--predeq-repr-cache').assert_outcomes(passed=1)
+    assert len(list((pytester.path / '.pytest_cache' / 'd' / 'predeq-repr').iterdir())) == 1
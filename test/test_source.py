@@ -0,0 +1,80 @@
+import os
+
+from predeq._source import SourceIndex, _get_lambda_repr, _get_source_index
+
+
+def test_index_spans():
+    index = SourceIndex([
+        'a = lambda x: x\n',
+        'b, c = (lambda y: y + 1), (lambda z: lambda w: z * w)\n',
+    ])
+
+    assert list(map(index.segment, index.on_line(1))) == ['lambda x: x']
+    assert list(map(index.segment, index.on_line(2))) == [
+        'lambda y: y + 1',
+        'lambda z: lambda w: z * w',
+        'lambda w: z * w',
+    ]
+    assert index.on_line(3) == range(0)
+
+
+def test_several_lambdas_on_line(make_module):
+    _, ns = make_module('first, second = (lambda a: a, lambda b: b)\n')
+    assert _get_lambda_repr(ns['first']) == 'lambda a: a'
+    assert _get_lambda_repr(ns['second']) == 'lambda b: b'
+
+
+def test_nested_lambda(make_module):
+    _, ns = make_module('outer = lambda a: lambda b: a + b\n')
+    assert _get_lambda_repr(ns['outer']) == 'lambda a: lambda b: a + b'
+    assert _get_lambda_repr(ns['outer'](1)) == 'lambda b: a + b'
+
+
+def test_index_is_reused(make_module):
+    path, ns = make_module('f = lambda: 1\ng = lambda: 2\n')
+    assert _get_lambda_repr(ns['f']) == 'lambda: 1'
+    index = _get_source_index(path)
+    assert _get_lambda_repr(ns['g']) == 'lambda: 2'
+    assert _get_source_index(path) is index
+
+
+def test_index_dropped_on_change(make_module):
+    path, ns = make_module('f = lambda: 1\n')
+    index = _get_source_index(path)
+
+    with open(path, 'a') as file:
+        file.write('g = lambda: 2\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert _get_source_index(path) is not index
+
+
+def test_no_source():
+    namespace = {}
+    exec('f = lambda: 1', namespace)
+    assert _get_lambda_repr(namespace['f']) is None
+
+
+def test_find_by_code(make_module, monkeypatch):
+    monkeypatch.setattr('predeq._source._ENABLE_ONE_NODE_SHORT_PATH', False)
+    path, ns = make_module(
+        'def make(c):\n'
+        '    return (lambda x: x.a + c, lambda x: x.b + c)\n'
+        'same = (lambda: 1, lambda: 1.0)\n'
+    )
+    index = _get_source_index(path)
+
+    def find(func_or_code):
+        return index.segment(index._find_by_code(getattr(func_or_code, '__code__', func_or_code)))
+
+    # captured variables and names that differ only in co_names
+    first, second = ns['make'](0)
+    assert find(first) == 'lambda x: x.a + c'
+    assert find(second) == 'lambda x: x.b + c'
+
+    # constants that are equal, but of different types
+    assert list(map(find, ns['same'])) == ['lambda: 1', 'lambda: 1.0']
+
+    # co_firstlineno pointing to another line (e.g. the first line of rewritten assert), but the code is unique
+    assert find(second.__code__.replace(co_firstlineno=1)) == 'lambda x: x.b + c'
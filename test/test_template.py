@@ -0,0 +1,99 @@
+import math
+
+import pytest
+
+from predeq import ANY, NOT_NONE, compile_template, exception, instanceof, matches_re, predeq, template
+
+EXPECTED = {
+    'id': instanceof(int),
+    'name': matches_re(r'[a-z]+$'),
+    'error': exception(KeyError('key')),
+    'tags': [ANY, NOT_NONE],
+    'score': predeq(lambda score: score >= 0),
+    'parent': {'id': 1, 'kind': 'group'},
+    'point': (1.0, 2.0),
+}
+
+VALID = {
+    'id': 1,
+    'name': 'abc',
+    'error': KeyError('key'),
+    'tags': ['x', 0],
+    'score': 0.5,
+    'parent': {'id': 1, 'kind': 'group'},
+    'point': (1.0, 2.0),
+}
+
+
+@pytest.mark.parametrize('value', [
+    VALID,
+    {**VALID, 'id': 'abc'},
+    {**VALID, 'name': 'ABC'},
+    {**VALID, 'name': None},
+    {**VALID, 'error': ValueError('key')},
+    {**VALID, 'error': KeyError('other')},
+    {**VALID, 'tags': ['x', None]},
+    {**VALID, 'tags': ['x']},
+    {**VALID, 'tags': ('x', 0)},
+    {**VALID, 'score': -1},
+    {**VALID, 'parent': {'id': 1}},
+    {**VALID, 'parent': {'id': 1, 'kind': 'group', 'extra': None}},
+    {**VALID, 'parent': {'id': 2, 'kind': 'group'}},
+    {**VALID, 'parent': None},
+    {**VALID, 'point': (1, 2)},
+    {**VALID, 'point': [1.0, 2.0]},
+    {key: value for key, value in VALID.items() if key != 'tags'},
+    {**VALID, 'extra': 1},
+    None,
+    [VALID],
+])
+def test_same_as_eq(value):
+    assert compile_template(EXPECTED)(value) == (value == EXPECTED)
+    assert (value == template(EXPECTED)) == (value == EXPECTED)
+
+
+@pytest.mark.parametrize('expected', [
+    [instanceof(int)] * 20,
+    [instanceof(int)] * 10 + [instanceof(str)] * 10,
+    [{'id': instanceof(int)}] * 20,
+])
+def test_long_sequences(expected):
+    values = [{'id': i} for i in range(20)] if isinstance(expected[0], dict) else list(range(20))
+    assert compile_template(expected)(values) == (values == expected)
+
+    values[-1] = None
+    assert not compile_template(expected)(values)
+    assert not compile_template(expected)(values[:-1])
+
+
+@pytest.mark.parametrize('expected, valid, invalid', [
+    ([ANY] * 10, [None] * 10, [None] * 9),
+    ([[ANY] * 10] * 10, [[None] * 10] * 10, [[None] * 10] * 9 + [(None,) * 10]),
+])
+def test_long_sequences_without_checks(expected, valid, invalid):
+    assert compile_template(expected)(valid)
+    assert not compile_template(expected)(invalid)
+    assert not compile_template(expected)(tuple(valid))
+
+
+def test_nested_template():
+    inner = template({'id': instanceof(int)})
+    assert compile_template([inner, inner])([{'id': 1}, {'id': 2}])
+    assert not compile_template([inner, inner])([{'id': 1}, {'id': '2'}])
+
+
+def test_identity_implies_equality():
+    nan = math.nan
+    assert compile_template([nan])([nan]) == ([nan] == [nan])
+
+
+def test_cheap_checks_first():
+    calls = []
+    expected = {'value': predeq(calls.append), 'id': instanceof(int)}
+    assert not compile_template(expected)({'value': 1, 'id': None})
+    assert calls == []
+
+
+def test_repr():
+    expected = {'id': instanceof(int), 'tags': [ANY]}
+    assert repr(template(expected)) == "template({'id': instanceof(int), 'tags': [<ANY>]})"
@@ -0,0 +1,109 @@
+"""Stress tests of shared state (caches, profiling) used by many threads at once."""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from predeq import _source, instanceof, matches_re, predeq, recipe_cache
+from predeq.profiling import profile
+
+THREADS = 8
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # switch threads as often as possible, to interleave them (with GIL)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_at_once(func, *args_list):
+    """Call *func* with each of *args_list* in a thread, all starting at once, and return the results."""
+    barrier = threading.Barrier(len(args_list))
+
+    def call(args):
+        barrier.wait()
+        return func(*args)
+
+    with ThreadPoolExecutor(len(args_list)) as executor:
+        return list(executor.map(call, args_list))
+
+
+def test_lambda_resolved_once(make_module, monkeypatch):
+    _, ns = make_module('LAMBDAS = [\n' + ''.join(f'    lambda x: x + {i},\n' for i in range(20)) + ']\n')
+    resolved = []
+    indexed = []
+
+    find = _source._find_lambda_repr
+
+    def find_lambda_repr(lambda_func, *args):
+        resolved.append(lambda_func.__code__)
+        time.sleep(0.001)  # let the other threads ask for it meanwhile
+        return find(lambda_func, *args)
+
+    class SourceIndex(_source.SourceIndex):
+        def __init__(self, *args, **kwargs):
+            indexed.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(_source, '_find_lambda_repr', find_lambda_repr)
+    monkeypatch.setattr(_source, 'SourceIndex', SourceIndex)
+
+    def reprs():
+        return [repr(predeq(func)) for func in ns['LAMBDAS']]
+
+    results = run_at_once(reprs, *[()] * THREADS)
+    assert results == [[f'<predeq to meet lambda x: x + {i}>' for i in range(20)]] * THREADS
+    assert len(resolved) == 20
+    assert len(indexed) == 1
+
+
+def test_recipe_cache():
+    recipe_cache.clear()
+    classes = [type(f'Class{i}', (), {}) for i in range(50)]
+
+    def create(offset):
+        # each thread in a different order
+        order = classes[offset:] + classes[:offset]
+        return {cls: instanceof(cls) for cls in order for _ in range(10)}, matches_re(r'\d+')
+
+    results = run_at_once(create, *[(offset,) for offset in range(THREADS)])
+    for cls in classes:
+        assert len({id(objects[cls]) for objects, _ in results}) == 1
+    assert len({id(pattern) for _, pattern in results}) == 1
+
+    info = recipe_cache.info()
+    assert info['hits'] + info['misses'] == THREADS * (len(classes) * 10 + 1)
+    assert info['currsize'] == len(classes) + 1
+
+
+def test_recipe_cache_eviction():
+    recipe_cache.configure(maxsize=10)
+    try:
+        def create(offset):
+            return [instanceof(int, offset * 100 + i) for i in range(100)]
+
+        run_at_once(create, *[(offset,) for offset in range(THREADS)])
+        assert recipe_cache.info()['currsize'] == 10
+    finally:
+        recipe_cache.configure()
+
+
+def test_profiling():
+    matchers = [predeq(lambda x: x > 0), instanceof(int)]
+
+    def compare():
+        for i in range(500):
+            for matcher in matchers:
+                i == matcher
+
+    with profile() as results:
+        run_at_once(compare, *[()] * THREADS)
+
+    assert sorted(entry['calls'] for entry in results.stats()) == [500 * THREADS] * 2
+    assert sum(entry['true'] for entry in results.stats()) == (499 + 500) * THREADS
@@ -0,0 +1,94 @@
+import itertools
+import math
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from predeq import ANY, contains_all, instanceof, matches_re, predeq, unordered
+from predeq._unordered import _maximum_matching
+
+
+ROWS = [{'id': 2, 'name': 'b'}, {'id': 1, 'name': 'a'}]
+
+
+@pytest.mark.parametrize(('value', 'expected', 'equal'), [
+    ([1, 2, 3], [3, 1, 2], True),
+    ((1, 'a'), ['a', instanceof(int)], True),
+    ({1, 2}, [instanceof(int), 2], True),
+    # greedy assignment of 3 to instanceof(int) would fail
+    ([3, 1], [instanceof(int), 1], True),
+    ([1, 1, 2], [1, 2, 2], False),
+    ([1, 2], [1, 2, 3], False),
+    ([1, 2, 3], [1, 2], False),
+    ([], [], True),
+    (ROWS, [{'id': 1, 'name': matches_re('a')}, {'id': 2, 'name': ANY}], True),
+    (ROWS, [{'id': 1, 'name': 'b'}, {'id': 2, 'name': ANY}], False),
+    # equal, but of other types
+    ([1.0, True], [1, 1], True),
+    ([{'id': 1.0}], [{'id': True}], True),
+    ([[1], (1,)], [(1,), [1]], True),
+    # identical NaN is equal, like in other containers
+    ([math.nan], [math.nan], True),
+    # not collections
+    ('ab', ['a', 'b'], False),
+    (iter([1]), [1], False),
+    (1, [1], False),
+])
+def test_unordered(value, expected, equal):
+    assert (value == unordered(expected)) is equal
+
+
+@pytest.mark.parametrize(('value', 'expected', 'equal'), [
+    ([1, 2, 3], [3, 1], True),
+    ([3, 'a', 1], [instanceof(int), 1], True),
+    ([1, 2], [1, 1], False),
+    ([1], [1, 2], False),
+    ({'a': 1, 'b': 2}, ['b'], True),
+])
+def test_contains_all(value, expected, equal):
+    assert (value == contains_all(expected)) is equal
+
+
+def test_repr():
+    assert repr(unordered([1, instanceof(int)])) == 'unordered([1, instanceof(int)])'
+    assert repr(contains_all(iter('ab'))) == "contains_all(['a', 'b'])"
+
+
+def test_pairs_compared_once():
+    compared = []
+
+    def recording(obj):
+        compared.append(obj)
+        return obj % 2 == 0
+
+    even = predeq(recording)
+    assert list(range(10)) == unordered([even] * 5 + [predeq(lambda x: x % 2 == 1)] * 5)
+    assert sorted(compared) == list(range(10))
+
+
+def test_long_augmenting_path():
+    # greedy matching assigns each left vertex to the next right vertex, leaving one unmatched, with the only
+    # augmenting path going through all of them
+    size = 5000
+    adjacency = [[left + 1, left] for left in range(size - 1)] + [[size - 1]]
+    assert _maximum_matching(adjacency, size) == size
+
+
+def test_large():
+    rows = [{'id': i, 'name': f'user{i}'} for i in range(5000)]
+    expected = [{'id': i, 'name': instanceof(str)} for i in reversed(range(5000))]
+    assert rows == unordered(expected)
+    rows[0]['name'] = None
+    assert rows != unordered(expected)
+
+
+@given(st.lists(st.integers(0, 3), max_size=6), st.lists(st.integers(0, 3), max_size=6))
+def test_same_as_permutations(values, keys):
+    # item of expected matches if it divides the value
+    expected = [predeq(lambda value, key=key: value % (key + 1) == 0) for key in keys]
+    equal = len(values) == len(expected) and any(
+        all(value == matcher for value, matcher in zip(values, permutation))
+        for permutation in itertools.permutations(expected)
+    )
+    assert (values == unordered(expected)) is equal
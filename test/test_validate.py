@@ -0,0 +1,138 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from predeq.validate import _MATCHERS, validate_file
+
+CHECKS = '''\
+from predeq import instanceof, matches_re, predeq, template
+
+RECORD = template({'id': instanceof(int), 'name': matches_re(r'[a-z]+$')})
+ROW = template({'id': matches_re(r'\\d+$'), 'name': matches_re(r'[a-z]+$')})
+PLAIN = {'id': 1}
+POSITIVE = template({'id': predeq(lambda id: id > 0), 'name': matches_re(r'[a-z]+$')})
+'''
+
+
+@pytest.fixture
+def checks(tmp_path):
+    path = tmp_path / 'checks.py'
+    path.write_text(CHECKS, encoding='utf-8')
+    yield str(path)
+    _MATCHERS.clear()
+
+
+@pytest.fixture
+def jsonl(tmp_path):
+    lines = [json.dumps({'id': i, 'name': 'abc'}) for i in range(100)]
+    lines[10] = json.dumps({'id': '10', 'name': 'abc'})
+    lines[20] = '{"id": 20,'
+    lines[30] = ''
+    lines[40] = json.dumps({'id': 40, 'name': 'abc'}) + '  \r'
+    lines[50] = ' ' + json.dumps({'id': 50, 'name': 'ABC'})
+    lines[60] = json.dumps({'id': 60, 'name': 'abc'}) + ' x'
+    path = tmp_path / 'records.jsonl'
+    path.write_text('\n'.join(lines), encoding='utf-8')  # no newline at the end
+    return str(path)
+
+
+@pytest.mark.parametrize('shard_size', [1, 100, 10_000])
+def test_jsonl(checks, jsonl, shard_size):
+    result = validate_file(jsonl, f'{checks}:RECORD', workers=1, shard_size=shard_size)
+    assert result.records == 97
+    assert result.failed == 4
+    assert [line for line, _ in result.failures] == [11, 21, 51, 61]
+    assert result.failures[0][1] == 'not equal to the matcher'
+    assert result.failures[1][1].startswith('invalid JSON: ')
+    assert result.failures[3][1] == 'invalid JSON: Extra data: line 1 column 27 (char 26)'
+
+
+def test_max_failures(checks, jsonl):
+    result = validate_file(jsonl, f'{checks}:RECORD', workers=1, shard_size=100, max_failures=2)
+    assert result.failed == 4
+    assert [line for line, _ in result.failures] == [11, 21]
+
+    result = validate_file(jsonl, f'{checks}:RECORD', workers=1, max_failures=None)
+    assert len(result.failures) == 4
+
+
+def test_processes(checks, jsonl):
+    result = validate_file(jsonl, f'{checks}:RECORD', workers=2, shard_size=500)
+    assert [line for line, _ in result.failures] == [11, 21, 51, 61]
+    assert result.records_per_second > 0
+
+
+def test_plain_matcher(checks, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    path.write_text('{"id": 1}\n{"id": 2}\n', encoding='utf-8')
+    result = validate_file(path, f'{checks}:PLAIN', workers=1)
+    assert (result.records, result.failures) == (2, [(2, 'not equal to the matcher')])
+
+
+def test_csv(checks, tmp_path):
+    path = tmp_path / 'records.csv'
+    path.write_text('id,name\r\n1,abc\r\n2,"a,b"\r\n\r\n3,"de"\r\n4,"x y"\r\n', encoding='utf-8')
+    for shard_size in (1, 1000):
+        result = validate_file(path, f'{checks}:ROW', workers=1, shard_size=shard_size)
+        assert result.records == 4
+        assert result.failures == [(3, 'not equal to the matcher'), (6, 'not equal to the matcher')]
+
+
+def test_empty_file(checks, tmp_path):
+    path = tmp_path / 'empty.jsonl'
+    path.write_bytes(b'')
+    result = validate_file(path, f'{checks}:RECORD')
+    assert (result.records, result.failed) == (0, 0)
+
+
+def test_errors(checks, jsonl):
+    with pytest.raises(ValueError, match='expected module:attribute'):
+        validate_file(jsonl, checks)
+    with pytest.raises(AttributeError):
+        validate_file(jsonl, f'{checks}:MISSING')
+    with pytest.raises(ValueError, match='unknown format'):
+        validate_file(jsonl, f'{checks}:RECORD', format='xml')
+
+
+def test_importable_matcher(jsonl):
+    # any importable module works, such as this package
+    result = validate_file(jsonl, 'predeq:ANY', workers=1)
+    assert (result.records, result.failed) == (97, 2)
+
+
+def test_raising_predicate(checks, jsonl):
+    process = subprocess.run(
+        [sys.executable, '-m', 'predeq', 'validate', f'{checks}:POSITIVE', jsonl], capture_output=True, text=True,
+    )
+    assert process.returncode == 1
+    assert process.stdout.splitlines() == [
+        f'{jsonl}:1: not equal to the matcher',
+        f"{jsonl}:11: raised TypeError(\"'>' not supported between instances of 'str' and 'int'\")",
+        f'{jsonl}:21: invalid JSON: Expecting property name enclosed in double quotes: line 1 column 11 (char 10)',
+        f'{jsonl}:51: not equal to the matcher',
+        f'{jsonl}:61: invalid JSON: Extra data: line 1 column 27 (char 26)',
+    ]
+    assert process.stderr.startswith(f'{jsonl}: 97 records, 5 failed, in ')
+
+
+def test_command_line(checks, jsonl):
+    process = subprocess.run(
+        [sys.executable, '-m', 'predeq', 'validate', f'{checks}:RECORD', jsonl, '--max-failures', '1'],
+        capture_output=True, text=True,
+    )
+    assert process.returncode == 1
+    assert process.stdout.splitlines() == [
+        f'{jsonl}:11: not equal to the matcher',
+        f'{jsonl}: ... and 3 more failed records',
+    ]
+    assert process.stderr.startswith(f'{jsonl}: 97 records, 4 failed, in ')
+    assert 'records/s' in process.stderr
+
+    process = subprocess.run(
+        [sys.executable, '-m', 'predeq', 'validate', f'{checks}:MISSING', jsonl], capture_output=True, text=True,
+    )
+    assert process.returncode == 2
+    assert 'MISSING' in process.stderr
+